@@ -0,0 +1,102 @@
+"""
+Where the game's sound goes.
+
+MusicManager and SoundEffects play through a backend:
+
+    MixerBackend       pygame.mixer on the machine's audio device
+    RecordingBackend   no audio device; keeps a log of what would have
+                       played, e.g. to assert on a headless run
+
+open_backend() picks RecordingBackend for headless games, and whenever
+no audio device can be opened, so a session never fails for want of one.
+"""
+
+import io
+from collections import deque
+import pygame
+from startup_profile import phase
+
+RECORD_LIMIT = 1000  # Events a RecordingBackend keeps, so endless batch runs stay bounded
+
+
+def open_backend(headless=False):
+    if headless:
+        return RecordingBackend()
+    try:
+        with phase('pygame.mixer.init'):
+            return MixerBackend()
+    except pygame.error as e:
+        print(f"Warning: Could not open an audio device, playing without sound: {e}")
+        return RecordingBackend()
+
+
+class MixerBackend:
+    plays_audio = True
+
+    def __init__(self):
+        pygame.mixer.init()  # Already done if pygame.init() found a device
+
+    def load_music(self, track, data=None):
+        """Load a track from its path, or from `data` (the file's bytes) if read ahead."""
+        if data is not None:
+            pygame.mixer.music.load(io.BytesIO(data), 'mp3')
+        else:
+            pygame.mixer.music.load(track)
+
+    def play_music(self, fade_ms=0):
+        pygame.mixer.music.play(-1, fade_ms=fade_ms)
+
+    def fadeout_music(self, fade_ms):
+        pygame.mixer.music.fadeout(fade_ms)
+
+    def stop_music(self):
+        pygame.mixer.music.stop()
+
+    def music_busy(self):
+        return pygame.mixer.music.get_busy()
+
+    def channels(self, count):
+        """`count` mixer channels for sound effects."""
+        pygame.mixer.set_num_channels(count)
+        return [pygame.mixer.Channel(i) for i in range(count)]
+
+
+class RecordingBackend:
+    """Plays nothing. `log` holds the latest events as tuples:
+
+        ('music', track, fade_ms)   a track started
+        ('fadeout', fade_ms)        the music faded out
+        ('stop',)                   the music stopped
+        ('sfx', name)               a sound effect was played
+    """
+
+    plays_audio = False
+
+    def __init__(self, limit=RECORD_LIMIT):
+        self.log = deque(maxlen=limit)
+        self.track = None  # Last track loaded
+
+    def load_music(self, track, data=None):
+        self.track = track
+
+    def play_music(self, fade_ms=0):
+        self.record('music', self.track, fade_ms)
+
+    def fadeout_music(self, fade_ms):
+        self.record('fadeout', fade_ms)
+
+    def stop_music(self):
+        self.record('stop')
+
+    def music_busy(self):
+        return False  # Nothing plays, so track changes never wait on a fade
+
+    def channels(self, count):
+        return []
+
+    def record(self, *event):
+        self.log.append(event)
+
+    def played_tracks(self):
+        """The tracks started, oldest first."""
+        return [event[1] for event in self.log if event[0] == 'music']
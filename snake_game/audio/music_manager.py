@@ -1,14 +1,40 @@
 import pygame
 import os
+import queue
 import random
+import threading
+from startup_profile import phase
+from scheduler import PRIORITY_HIGH, WAIT
+
+FADE_MS = 400  # Length of each half of a crossfade, and of the fade when music stops
+MAX_PRELOADED = 4  # Tracks kept in memory
 
 class MusicManager:
-    def __init__(self):
+    """Plays the menu and biome tracks.
+
+    Playback goes through `backend` (see audio.backend). Tracks are read
+    into memory ahead of time by a prefetch thread (prefetch(),
+    preload_game_music()), so starting one never waits on the disk.
+    pygame.mixer.music plays a single stream, so changing tracks crossfades
+    by fading the old one out and the new one in; with a JobScheduler in
+    `jobs` that runs between frames, otherwise the switch is immediate.
+    """
+
+    def __init__(self, backend, jobs=None):
+        self.backend = backend
+        self.jobs = jobs
         self.current_track = None
+        self.next_menu_track = None  # Picked in advance so it can be prefetched
         self.music_directory = "assets/music"
         self.tracks = {}  # All tracks stored in one dict
-        self.load_music()
-    
+        self.preloaded = {}  # track path -> file bytes, read ahead of playing
+        self.random = random.Random()  # Track choice stays off the simulation's RNG
+        self._lock = threading.Lock()  # Guards preloaded and the prefetch queue
+        self._requests = None  # Tracks waiting for the prefetch thread
+        self._switch = None  # Job of a track change in progress
+        with phase('MusicManager.load_music'):
+            self.load_music()
+
     def load_music(self):
         """Load all music tracks from the assets/music directory"""
         try:
@@ -19,42 +45,112 @@ class MusicManager:
                     self.tracks[track_name] = os.path.join(self.music_directory, filename)
         except Exception as e:
             print(f"Warning: Could not load music files: {e}")
-    
+
+    def game_track(self, biome, is_night):
+        """The track for a biome and time of day, or None if there isn't one."""
+        return self.tracks.get(f"{biome}_{'night' if is_night else 'day'}")
+
     def play_menu_music(self):
         """Play a random track from all available tracks"""
         try:
-            if self.tracks:
-                # Get a random track that's different from the current one
-                available_tracks = [track for track in self.tracks.values() 
-                                 if track != self.current_track]
-                if available_tracks:
-                    track = random.choice(available_tracks)
-                    pygame.mixer.music.load(track)
-                    pygame.mixer.music.play(-1)
-                    self.current_track = track
+            # Get a random track that's different from the current one
+            available_tracks = [track for track in self.tracks.values()
+                                if track != self.current_track]
+            if available_tracks:
+                track = self.next_menu_track
+                if track not in available_tracks:
+                    track = self.random.choice(available_tracks)
+                self._play(track)
+                # Choose the next menu track now, so it is in memory by then
+                others = [t for t in self.tracks.values() if t != track]
+                self.next_menu_track = self.random.choice(others) if others else None
+                self.prefetch(self.next_menu_track)
         except Exception as e:
             print(f"Warning: Could not play menu music: {e}")
-    
+
     def play_game_music(self, biome, is_night):
         """Play appropriate music for the biome and time of day"""
         try:
-            # Determine which track to play
-            time = "night" if is_night else "day"
-            track_name = f"{biome}_{time}"
-            
-            if track_name in self.tracks:
-                track = self.tracks[track_name]
-                if self.current_track != track:
-                    pygame.mixer.music.load(track)
-                    pygame.mixer.music.play(-1)
-                    self.current_track = track
+            track = self.game_track(biome, is_night)
+            if track is not None and self.current_track != track:
+                self._play(track)
         except Exception as e:
             print(f"Warning: Could not play game track: {e}")
-    
-    def stop_music(self):
-        """Stop the currently playing music"""
+
+    def preload_game_music(self, biome, is_night):
+        """Read a biome's track into memory in the background (returns at once)."""
+        self.prefetch(self.game_track(biome, is_night))
+
+    def prefetch(self, track):
+        """Queue `track` to be read into memory by the prefetch thread.
+
+        Safe to call from any thread. The MAX_PRELOADED most recently read
+        tracks are kept.
+        """
+        if not self.backend.plays_audio or track is None:
+            return  # Nothing to read ahead for a backend that plays nothing
+        with self._lock:
+            if track in self.preloaded:
+                return
+            if self._requests is None:
+                self._requests = queue.Queue()
+                threading.Thread(target=self._prefetch_worker, daemon=True).start()
+            self._requests.put(track)
+
+    def _prefetch_worker(self):
+        while True:
+            track = self._requests.get()
+            with self._lock:
+                if track in self.preloaded:
+                    continue
+            try:
+                with open(track, 'rb') as f:
+                    data = f.read()
+            except OSError as e:
+                print(f"Warning: Could not preload music: {e}")
+                continue
+            with self._lock:
+                self.preloaded[track] = data
+                while len(self.preloaded) > MAX_PRELOADED:
+                    del self.preloaded[next(iter(self.preloaded))]
+
+    def _play(self, track):
+        self.current_track = track
+        if self._switch is not None:
+            self._switch.cancel()
+            self._switch = None
+        with self._lock:
+            data = self.preloaded.get(track)
+        if self.jobs is not None and self.backend.music_busy():
+            self._switch = self.jobs.add(self._crossfade(track, data), PRIORITY_HIGH, tag='music')
+        else:
+            self._start(track, data)
+
+    def _crossfade(self, track, data):
+        """Fade the playing track out, then `track` in (a scheduler job)."""
+        self.backend.fadeout_music(FADE_MS)
+        while self.backend.music_busy():
+            yield WAIT
+        self._switch = None
+        self._start(track, data, FADE_MS)
+
+    def _start(self, track, data, fade_ms=0):
+        try:
+            self.backend.load_music(track, data)
+            self.backend.play_music(fade_ms)
+        except pygame.error as e:
+            print(f"Warning: Could not play music: {e}")
+
+    def stop_music(self, fade_ms=FADE_MS):
+        """Fade out (or with fade_ms=0, stop) the currently playing music"""
         try:
-            pygame.mixer.music.stop()
+            if self._switch is not None:
+                self._switch.cancel()
+                self._switch = None
+            if fade_ms:
+                self.backend.fadeout_music(fade_ms)
+            else:
+                self.backend.stop_music()
             self.current_track = None
         except:
-            pass 
\ No newline at end of file
+            pass
@@ -0,0 +1,173 @@
+import pygame
+import os
+import random
+import contextlib
+from array import array
+from startup_profile import phase
+
+SFX_CHANNELS = 8  # Voices shared by all sound effects
+
+# name -> (priority, min_interval_ms, max_voices, volume)
+# A new sound may take over a voice playing one of equal or lower priority;
+# min_interval_ms drops repeats that come faster than that, and max_voices
+# caps how many voices one effect may hold at once.
+EFFECTS = {
+    'eat':       (3, 40, 2, 0.6),
+    'destroy':   (2, 60, 3, 0.5),
+    'spit':      (2, 80, 2, 0.4),
+    'asteroids': (1, 150, 1, 0.5),
+    'boss_fire': (1, 120, 2, 0.35),
+}
+
+
+class SoundEffects:
+    """Short gameplay sounds, decoded up front and mixed over a fixed voice pool.
+
+    load() reads assets/sfx/<name>.wav for each effect in EFFECTS, or
+    synthesizes a stand-in, into a pygame.mixer.Sound, so play() never
+    touches the disk. It is slow enough to belong on a worker thread; until
+    it has run, play() stays silent. With a backend that plays nothing (see
+    audio.backend) nothing is decoded and play() only records the effect.
+
+    The simulation plays effects as it runs, so code that runs ticks over
+    again (rollback, replay seeking) does so inside muted().
+    """
+
+    def __init__(self, backend, width=800):
+        self.backend = backend
+        self.width = width  # Screen width, for panning
+        self.sfx_directory = "assets/sfx"
+        self.sounds = {}  # effect name -> Sound
+        self.channels = backend.channels(SFX_CHANNELS)
+        self.voices = [None] * len(self.channels)  # Per channel: (effect name, priority, start ms) of its last sound
+        self.last_played = {}  # effect name -> ms it last started
+        self.dropped = 0  # Sounds skipped by rate limiting or a full pool, to check the limits
+        self.mute_depth = 0  # Nesting of muted() blocks
+
+    def load(self):
+        """Decode or synthesize every effect (call once, from any thread)"""
+        if not self.backend.plays_audio:
+            return
+        with phase('SoundEffects.load'):
+            sounds = {}
+            for name in EFFECTS:
+                path = os.path.join(self.sfx_directory, name + '.wav')
+                try:
+                    if os.path.exists(path):
+                        sounds[name] = pygame.mixer.Sound(path)
+                    else:
+                        sounds[name] = _synthesize(name)
+                except (pygame.error, ValueError) as e:
+                    print(f"Warning: Could not load sound effect {name}: {e}")
+            self.sounds = sounds  # Swapped in whole, so play() never sees half of them
+
+    @contextlib.contextmanager
+    def muted(self):
+        """Drop every effect played inside the block, without recording it."""
+        self.mute_depth += 1
+        try:
+            yield
+        finally:
+            self.mute_depth -= 1
+
+    def play(self, name, x=None):
+        """Play an effect, panned to screen position `x` if given.
+
+        Returns the channel used, or None if the sound was dropped.
+        """
+        if self.mute_depth:
+            return None
+        if not self.backend.plays_audio:
+            self.backend.record('sfx', name)
+            return None
+        sound = self.sounds.get(name)
+        if sound is None:
+            return None
+        priority, min_interval, max_voices, volume = EFFECTS[name]
+        now = pygame.time.get_ticks()
+        last = self.last_played.get(name)
+        if last is not None and now - last < min_interval:
+            self.dropped += 1
+            return None
+
+        index = self._pick_voice(name, priority, max_voices)
+        if index is None:
+            self.dropped += 1
+            return None
+        channel = self.channels[index]
+        channel.play(sound)
+        # play() resets the channel volume, so set it afterwards
+        if x is None:
+            channel.set_volume(volume)
+        else:
+            pan = min(1.0, max(0.0, x / self.width))
+            channel.set_volume(volume * min(1.0, 2 * (1 - pan)), volume * min(1.0, 2 * pan))
+        self.voices[index] = (name, priority, now)
+        self.last_played[name] = now
+        return channel
+
+    def _pick_voice(self, name, priority, max_voices):
+        # Channel for a new sound: the oldest of the effect's own voices once
+        # it holds max_voices, else a free one, else the oldest of the lowest
+        # priority no higher than `priority`
+        own = []
+        free = None
+        stealable = []
+        for i, channel in enumerate(self.channels):
+            voice = self.voices[i]
+            if voice is None or not channel.get_busy():
+                if free is None:
+                    free = i
+                continue
+            if voice[0] == name:
+                own.append(i)
+            if voice[1] <= priority:
+                stealable.append(i)
+        if len(own) >= max_voices:
+            return min(own, key=lambda i: self.voices[i][2])
+        if free is not None:
+            return free
+        if stealable:
+            return min(stealable, key=lambda i: (self.voices[i][1], self.voices[i][2]))
+        return None
+
+    def stop(self):
+        """Silence every effect that is playing"""
+        for channel in self.channels:
+            channel.stop()
+
+
+def _synthesize(name):
+    """A stand-in Sound for an effect that has no .wav (16-bit mixer formats only)."""
+    frequency, size, channels = pygame.mixer.get_init()
+    if size != -16:
+        raise ValueError(f"can't synthesize for mixer sample size {size}")
+    rng = random.Random(name)  # Own RNG, so noise is the same every run
+    if name == 'eat':       # Rising blip
+        samples = _tone(frequency, 0.08, 600, 950, 0.0, rng)
+    elif name == 'destroy':  # Low rumble
+        samples = _tone(frequency, 0.25, 140, 60, 0.7, rng)
+    elif name == 'spit':     # Falling hiss
+        samples = _tone(frequency, 0.12, 900, 300, 0.4, rng)
+    elif name == 'asteroids':  # Crackling burst
+        samples = _tone(frequency, 0.4, 90, 40, 0.9, rng)
+    else:                    # boss_fire: low thud
+        samples = _tone(frequency, 0.15, 180, 110, 0.2, rng)
+    if channels > 1:
+        samples = array('h', (s for s in samples for _ in range(channels)))
+    return pygame.mixer.Sound(buffer=samples)
+
+
+def _tone(frequency, seconds, start_hz, end_hz, noise, rng):
+    """A decaying square-wave sweep from start_hz to end_hz, mixed with `noise` of white noise."""
+    count = int(frequency * seconds)
+    samples = array('h', bytes(2 * count))
+    cycle = 0.0
+    for i in range(count):
+        t = i / count
+        cycle += (start_hz + (end_hz - start_hz) * t) / frequency
+        square = 1.0 if cycle % 1.0 < 0.5 else -1.0
+        value = square * (1 - noise) + rng.uniform(-1.0, 1.0) * noise
+        envelope = (1 - t) ** 2 * min(1.0, i / 64)  # Short attack, no click
+        samples[i] = int(value * envelope * 12000)
+    return samples
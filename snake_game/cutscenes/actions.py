@@ -0,0 +1,142 @@
+"""
+Cutscene actions and compiled sequence steps.
+
+Each action name in a cutscene's YAML maps to a handler in ACTION_HANDLERS.
+A handler is called as handler(cutscene, args, progress), where args are
+the values after the name and progress is the timed step's 0..1 progress
+(None for dialogue and untimed steps). New actions register themselves
+with @register_action('name').
+
+CutsceneStep looks the handlers up once when a cutscene starts, so running
+a step each frame is a plain loop over bound calls.
+"""
+
+ACTION_HANDLERS = {}  # action name -> handler
+UNTIL_CHECKS = {}     # action name -> check(cutscene) ending an untimed step
+
+
+def register_action(name, until=None):
+    """Decorator adding a cutscene action.
+
+    `until`, if given, ends an untimed step containing the action once it
+    returns True; untimed steps without one never end by themselves.
+    """
+    def decorator(handler):
+        ACTION_HANDLERS[name] = handler
+        if until is not None:
+            UNTIL_CHECKS[name] = until
+        return handler
+    return decorator
+
+
+class CutsceneStep:
+    """One entry of a compiled cutscene sequence with its handlers bound."""
+
+    def __init__(self, spec):
+        self.spec = spec  # The compiled step dict (see cutscenes.compiler)
+        self.is_dialogue = spec['type'] == 'dialogue'
+        self.text = spec.get('text')
+        self.has_focus = 'focus' in spec
+        self.focus = spec.get('focus')
+        self.duration = spec.get('duration')
+        self.actions = []
+        self.until = None
+        for action in spec.get('actions', ()):
+            handler = ACTION_HANDLERS.get(action[0])
+            if handler is not None:  # Unknown actions do nothing, as before
+                self.actions.append((handler, tuple(action[1:])))
+            if self.until is None:
+                self.until = UNTIL_CHECKS.get(action[0])
+
+    def __reduce__(self):
+        # Snapshots keep the spec and bind handlers again when loaded
+        return (CutsceneStep, (self.spec,))
+
+    def run(self, cutscene, progress=None):
+        for handler, args in self.actions:
+            handler(cutscene, args, progress)
+
+
+@register_action('snake_emote')
+def snake_emote(cutscene, args, progress):
+    cutscene.game.snake.show_emote(args[0])
+
+
+@register_action('snake_look_at')
+def snake_look_at(cutscene, args, progress):
+    target = cutscene.sprites[args[0]]
+    cutscene.game.snake.look_at((target.x + 15, target.y - 5))
+
+
+@register_action('snake_sleep')
+def snake_sleep(cutscene, args, progress):
+    cutscene.game.snake.is_sleeping = args[0]
+
+
+@register_action('snake_angry')
+def snake_angry(cutscene, args, progress):
+    cutscene.game.snake.is_angry = args[0]
+
+
+@register_action('fade_heart')
+def fade_heart(cutscene, args, progress):
+    if progress and progress >= args[0]:
+        cutscene.game.snake.emote = None
+
+
+@register_action('stop_looking')
+def stop_looking(cutscene, args, progress):
+    if progress and progress >= args[0]:
+        cutscene.game.snake.look_at(None)
+
+
+@register_action('eagle_swoop')
+def eagle_swoop(cutscene, args, progress):
+    eagle = cutscene.sprites['eagle']
+    nest = cutscene.sprites['nest']
+    if progress:
+        # Define key points for the swooping motion
+        start_x = cutscene.game.width + 50
+        nest_x = nest.x
+        end_x = -200  # Fly further left
+
+        start_y = 150
+        nest_y = nest.y - 20
+        end_y = 150
+
+        if progress < 0.5:  # First half: approach the nest
+            p = progress * 2
+            eagle.x = start_x + (nest_x - start_x) * p
+            eagle.y = start_y + (nest_y - start_y) * p
+        else:  # Second half: escape with eggs
+            p = (progress - 0.5) * 2
+            eagle.x = nest_x + (end_x - nest_x) * p
+            eagle.y = nest_y + (end_y - nest_y) * p
+
+        # Take eggs when reaching the nest
+        if progress >= 0.4 and progress <= 0.6:
+            eagle.carrying_eggs = True
+            nest.has_eggs = False
+
+
+@register_action('snake_god_appear')
+def snake_god_appear(cutscene, args, progress):
+    _god_appear(cutscene, 'snake_god', args[0])
+
+
+@register_action('bird_god_appear')
+def bird_god_appear(cutscene, args, progress):
+    _god_appear(cutscene, 'bird_god', args[0])
+
+
+def _god_appear(cutscene, name, appear):
+    if appear:
+        cutscene.sprites[name].fade_in(255 / cutscene.fade_duration)
+    else:
+        cutscene.sprites[name].fade_out(255 / cutscene.fade_duration)
+
+
+@register_action('snake_ascend', until=lambda cutscene: cutscene.game.snake.y < -100)  # End sooner
+def snake_ascend(cutscene, args, progress):
+    if not cutscene.game.snake.is_ascending:  # Only start if not already ascending
+        cutscene.game.snake.start_ascension()
@@ -1,9 +1,20 @@
-import pygame
-import time
-import yaml
-import os
+from array import array
+import surface_pool
+from .actions import CutsceneStep
+from .compiler import load_compiled, resolve_value
 from .sprite_registry import CutsceneSprites
 
+_compiled_cutscenes = {}  # cutscene id -> compiled cutscene, never modified
+
+
+def preload_cutscene(cutscene_id):
+    """Compile a cutscene once (see cutscenes.compiler); later calls return the cached data."""
+    data = _compiled_cutscenes.get(cutscene_id)
+    if data is None:
+        data = load_compiled(cutscene_id)
+        _compiled_cutscenes[cutscene_id] = data
+    return data
+
 class BaseCutscene:
     def __init__(self, game, cutscene_id):
         self.game = game
@@ -20,34 +31,31 @@ class BaseCutscene:
         self.current_focus = None
         self.fade_duration = 120  # 2 seconds at 60fps
         self.transition_speed = 128 / 120  # Speed to reach target_alpha in fade_duration frames
-        self.sprite_focus_states = {}  # Start with empty focus states
+        self.snake_in_scene = False  # Whether the cutscene draws the snake itself
         
         self.load_cutscene(cutscene_id)
         self.setup_sprites()
         self.load_sequence()
+        self.setup_focus()
         
     def load_cutscene(self, cutscene_id):
-        # Get the directory containing this file
-        base_dir = os.path.dirname(__file__)
-        yaml_path = os.path.join(base_dir, 'data', f'{cutscene_id}.yaml')
-        
-        with open(yaml_path, 'r') as f:
-            self.data = yaml.safe_load(f)
+        # Shared between instances; anything changed per cutscene is copied first
+        self.data = preload_cutscene(cutscene_id)
             
     def setup_sprites(self):
-        # Create sprites based on YAML config
-        for name, config in self.data['sprites'].items():
-            x, y = self.resolve_position(config['position'])
+        # Create sprites based on the compiled sprite specs
+        for spec in self.data['sprites']:
+            x, y = self.resolve_position(spec['position'])
+            config = dict(spec['config'])
             # Pass game instance if requested in config
-            if config.get('game', False):
+            if spec['game']:
                 config['game'] = self.game
-            sprite = CutsceneSprites.create(config['type'], x, y, **config)
-            self.add_sprite(name, sprite)
-            self.sprite_focus_states[name] = 0  # Initialize focus state
+            sprite = CutsceneSprites.create(spec['type'], x, y, **config)
+            self.add_sprite(spec['name'], sprite)
         
-        # Initialize snake focus state only if snake is in the cutscene
-        if 'snake' in self.data:
-            self.sprite_focus_states['snake'] = 0
+        # The snake joins the scene only if the cutscene places it
+        if self.data['snake'] is not None:
+            self.snake_in_scene = True
             snake = self.game.snake
             pos = self.data['snake']['position']
             snake.x, snake.y = self.resolve_position(pos)
@@ -57,12 +65,33 @@ class BaseCutscene:
                 setattr(snake, key, value)
         
     def load_sequence(self):
-        """Load sequence data from YAML file. Override in subclasses."""
+        """Load the compiled sequence and bind its actions. Override in subclasses."""
         self.sequence = self.data['sequence']
+        self.steps = [CutsceneStep(step) for step in self.sequence]
         
     def add_sprite(self, name, sprite):
         self.sprites[name] = sprite
     
+    def setup_focus(self, levels=None):
+        """Index the sprites (and the snake, last) for focus transitions.
+
+        Focus levels live in an array in that order; `levels` maps names to
+        starting levels.
+        """
+        self.focus_names = list(self.sprites) + ['snake']
+        self.focus_index = {name: i for i, name in enumerate(self.focus_names)}
+        self.focus_levels = array('d', [(levels or {}).get(name, 0) for name in self.focus_names])
+        self.focus_target = self.focus_index.get(self.current_focus, -1)
+        self.focus_settled = False
+        # Sprites with per-frame work, looked up once instead of every frame
+        self.updating_sprites = [s for s in self.sprites.values() if hasattr(s, 'update')]
+        self.fading_sprites = [s for s in self.sprites.values() if hasattr(s, 'alpha')]
+    
+    def set_focus(self, name):
+        self.current_focus = name
+        self.focus_target = self.focus_index.get(name, -1)
+        self.focus_settled = False
+    
     def handle_input(self):
         """Handle player input during cutscene"""
         if self.waiting_for_input:
@@ -74,36 +103,28 @@ class BaseCutscene:
             return
         
         # Update all sprites that have an update method
-        for sprite in self.sprites.values():
-            if hasattr(sprite, 'update'):
-                sprite.update()
+        for sprite in self.updating_sprites:
+            sprite.update()
         
         # Update snake if it's ascending
         if self.game.snake.is_ascending:
             self.game.snake.update()
         
         # Smoothly adjust scene darkening when any god is present
-        if any(hasattr(sprite, 'alpha') and sprite.alpha > 0 for sprite in self.sprites.values()):
+        if any(sprite.alpha > 0 for sprite in self.fading_sprites):
             self.overlay_alpha = min(self.target_alpha, self.overlay_alpha + self.transition_speed)
         else:
             self.overlay_alpha = max(0, self.overlay_alpha - self.transition_speed)
         
-        # Update focus transitions for each sprite and snake
-        for name in list(self.sprites.keys()) + ['snake']:
-            target = 1.0 if name == self.current_focus else 0.0
-            current = self.sprite_focus_states.get(name, 0)
-            
-            if current < target:
-                self.sprite_focus_states[name] = min(target, current + 0.05)
-            elif current > target:
-                self.sprite_focus_states[name] = max(target, current - 0.05)
+        # Move each focus level towards the focused entry, until all have arrived
+        if not self.focus_settled:
+            self.update_focus()
         
-        if self.sequence_index >= len(self.sequence):
+        if self.sequence_index >= len(self.steps):
             self.end_sequence()
             return
             
-        current = self.sequence[self.sequence_index]
-        complete = self.handle_sequence(current)
+        complete = self.handle_sequence(self.steps[self.sequence_index])
         
         if complete:
             self.sequence_index += 1
@@ -113,11 +134,26 @@ class BaseCutscene:
         
         self.sequence_time += 1
     
+    def update_focus(self):
+        levels = self.focus_levels
+        settled = True
+        for i, current in enumerate(levels):
+            target = 1.0 if i == self.focus_target else 0.0
+            if current < target:
+                levels[i] = min(target, current + 0.05)
+            elif current > target:
+                levels[i] = max(target, current - 0.05)
+            else:
+                continue
+            settled = False
+            if i == len(levels) - 1:
+                self.snake_in_scene = True  # Focusing the snake brings it into the scene
+        self.focus_settled = settled
+    
     def draw(self, surface):
         # Draw darkening overlay first
         if self.overlay_alpha > 0:
-            overlay = pygame.Surface(surface.get_rect().size, pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, self.overlay_alpha))
+            overlay = surface_pool.filled(surface.get_size(), (0, 0, 0), self.overlay_alpha)
             surface.blit(overlay, (0, 0))
         
         # Add "ESC = Skip" text - position based on whether it's a boss level
@@ -127,12 +163,12 @@ class BaseCutscene:
         surface.blit(skip_text, skip_rect)
         
         # Draw all sprites with appropriate alpha
-        for name, sprite in self.sprites.items():
+        for i, sprite in enumerate(self.sprites.values()):
             # Store original alpha
             original_alpha = sprite.alpha if hasattr(sprite, 'alpha') else 255
             
             # Calculate focus-adjusted alpha
-            focus_factor = self.sprite_focus_states.get(name, 0)
+            focus_factor = self.focus_levels[i]
             darkening = self.overlay_alpha * (1 - focus_factor)
             
             # Apply adjusted alpha and focus state
@@ -149,13 +185,13 @@ class BaseCutscene:
                 sprite.alpha = original_alpha
         
         # Handle snake drawing with focus only if snake is in cutscene
-        if 'snake' in self.sprite_focus_states:
+        if self.snake_in_scene:
             # Store snake's original alpha
             original_snake_alpha = self.game.snake.alpha if hasattr(self.game.snake, 'alpha') else 255
             
             # Calculate focus-adjusted alpha exactly like sprites
             if self.overlay_alpha > 0:
-                focus_factor = self.sprite_focus_states.get('snake', 0)
+                focus_factor = self.focus_levels[-1]
                 darkening = self.overlay_alpha * (1 - focus_factor)
                 snake_alpha = int(original_snake_alpha * (1 - darkening / 255))
             else:
@@ -211,136 +247,64 @@ class BaseCutscene:
         text_height = line_height * len(lines)
         box_height = max(min_height, text_height + (padding * 2))
         
-        # Create and draw box with more transparency
-        box_surface = pygame.Surface((max_width, box_height), pygame.SRCALPHA)
-        pygame.draw.rect(box_surface, (0, 0, 0, 128), # Changed alpha from 180 to 128
-                        box_surface.get_rect(), border_radius=10)
+        # Position box at bottom of screen
+        x = margin
+        y = self.game.height - box_height - 20
+        
+        # Draw box with more transparency
+        box_surface = surface_pool.panel((max_width, box_height), (0, 0, 0), 128, # Changed alpha from 180 to 128
+                                         border_radius=10)
+        surface.blit(box_surface, (x, y))
         
         # Draw text lines
         for i, line in enumerate(lines):
             text_surface = self.game.font.render(line, True, (255, 255, 255))
             text_rect = text_surface.get_rect(
-                topleft=(padding, padding + (i * line_height)))
-            box_surface.blit(text_surface, text_rect)
+                topleft=(x + padding, y + padding + (i * line_height)))
+            surface.blit(text_surface, text_rect)
         
         # Draw continue indicator if waiting for input
         if self.waiting_for_input:
             continue_text = self.game.font.render("▼", True, (255, 255, 255))
             continue_rect = continue_text.get_rect(
-                bottomright=(max_width - 10, box_height - 10))
-            box_surface.blit(continue_text, continue_rect)
-        
-        # Position box at bottom of screen
-        x = margin
-        y = self.game.height - box_height - 20
-        surface.blit(box_surface, (x, y))
+                bottomright=(x + max_width - 10, y + box_height - 10))
+            surface.blit(continue_text, continue_rect)
     
-    def handle_sequence(self, sequence):
-        """Handle a single sequence step"""
-        if sequence['type'] == 'dialogue':
+    def handle_sequence(self, step):
+        """Run a single compiled step (a CutsceneStep); returns True once it is done"""
+        if step.is_dialogue:
             if not self.dialogue_text and not self.current_dialogue_shown:
-                self.show_dialogue(sequence['text'])
+                self.show_dialogue(step.text)
                 self.current_dialogue_shown = True
                 # Update focus if specified, otherwise maintain current focus
-                if 'focus' in sequence:
-                    self.current_focus = sequence['focus']
-                if 'actions' in sequence:
-                    self.perform_actions(sequence['actions'])
+                if step.has_focus:
+                    self.set_focus(step.focus)
+                step.run(self)
             return not self.waiting_for_input
-            
-        elif sequence['type'] == 'action':
-            if 'duration' in sequence:
-                # Normal timed actions
-                progress = min(1.0, self.sequence_time / sequence['duration'])
-                if 'actions' in sequence:
-                    self.perform_actions(sequence['actions'], progress)
-                if 'focus' in sequence:
-                    self.current_focus = sequence['focus']
-                return progress >= 1.0
-            else:
-                # Special actions that run until complete
-                if 'actions' in sequence:
-                    self.perform_actions(sequence['actions'])
-                    # Check if special action is complete
-                    if any(action[0] == 'snake_ascend' for action in sequence['actions']):
-                        return self.game.snake.y < -100  # End sooner
-                return False
+        
+        if step.duration:
+            # Normal timed actions
+            progress = min(1.0, self.sequence_time / step.duration)
+            step.run(self, progress)
+            if step.has_focus:
+                self.set_focus(step.focus)
+            return progress >= 1.0
+        
+        # Special actions that run until complete
+        step.run(self)
+        if step.until is not None:
+            return step.until(self)
+        return False
     
     def perform_actions(self, actions, progress=None):
-        for action in actions:
-            if action[0] == 'snake_emote':
-                self.game.snake.show_emote(action[1])
-            elif action[0] == 'snake_look_at':
-                target = self.sprites[action[1]]
-                self.game.snake.look_at((target.x + 15, target.y - 5))
-            elif action[0] == 'snake_sleep':
-                self.game.snake.is_sleeping = action[1]
-            elif action[0] == 'snake_angry':
-                self.game.snake.is_angry = action[1]
-            elif action[0] == 'fade_heart':
-                if progress and progress >= action[1]:
-                    self.game.snake.emote = None
-            elif action[0] == 'stop_looking':
-                if progress and progress >= action[1]:
-                    self.game.snake.look_at(None)
-            elif action[0] == 'eagle_swoop':
-                eagle = self.sprites['eagle']
-                nest = self.sprites['nest']
-                if progress:
-                    # Define key points for the swooping motion
-                    start_x = self.game.width + 50
-                    nest_x = nest.x
-                    end_x = -200  # Fly further left
-                    
-                    start_y = 150
-                    nest_y = nest.y - 20
-                    end_y = 150
-                    
-                    if progress < 0.5:  # First half: approach the nest
-                        p = progress * 2
-                        eagle.x = start_x + (nest_x - start_x) * p
-                        eagle.y = start_y + (nest_y - start_y) * p
-                    else:  # Second half: escape with eggs
-                        p = (progress - 0.5) * 2
-                        eagle.x = nest_x + (end_x - nest_x) * p
-                        eagle.y = nest_y + (end_y - nest_y) * p
-                    
-                    # Take eggs when reaching the nest
-                    if progress >= 0.4 and progress <= 0.6:
-                        eagle.carrying_eggs = True
-                        nest.has_eggs = False
-            elif action[0] == 'snake_god_appear':
-                if action[1]:
-                    # Fade in
-                    self.sprites['snake_god'].fade_in(255 / self.fade_duration)
-                else:
-                    # Fade out
-                    self.sprites['snake_god'].fade_out(255 / self.fade_duration)
-            elif action[0] == 'bird_god_appear':
-                if action[1]:
-                    # Fade in
-                    self.sprites['bird_god'].fade_in(255 / self.fade_duration)
-                else:
-                    # Fade out
-                    self.sprites['bird_god'].fade_out(255 / self.fade_duration)
-            elif action[0] == 'snake_ascend':
-                if not self.game.snake.is_ascending:  # Only start if not already ascending
-                    self.game.snake.start_ascension()
+        """Run raw [name, args...] actions through the registry (see cutscenes.actions)"""
+        CutsceneStep({'type': 'action', 'actions': actions}).run(self, progress)
     
     def resolve_position(self, position):
         """Convert position with variables into actual coordinates"""
-        x, y = position
-        
-        # Convert string expressions to actual values
-        if isinstance(x, str):
-            x = x.replace('center_x', str(self.game.width // 2))
-            x = x.replace('width', str(self.game.width))
-            x = eval(x)
-        
-        if isinstance(y, str):
-            y = y.replace('center_y', str(self.game.height // 2))
-            y = y.replace('height', str(self.game.height))
-            y = eval(y)
+        # Expressions are compiled once (see cutscenes.compiler), so resolving
+        # again for another screen size is cheap
+        x, y = (resolve_value(value, self.game.width, self.game.height) for value in position)
         
         # Snap the resolved positions to the nearest grid using the snake's block_size
         block_size = self.game.snake.block_size
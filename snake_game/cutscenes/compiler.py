@@ -0,0 +1,220 @@
+"""
+Cutscene compiler and on-disk cache.
+
+A cutscene's YAML is validated and compiled once into plain data:
+
+    {'id': cutscene id,
+     'sprites': [{'name', 'type', 'position', 'config', 'game'}, ...],
+     'snake': {'position', 'state'} or None,
+     'sequence': [step dicts, with each action as a tuple]}
+
+The compiled form is stored with marshal in CACHE_DIR, keyed on the YAML
+file's mtime and size, so later runs skip PyYAML (and its import)
+entirely. A read-only install simply compiles in memory every run.
+
+Positions are numbers or arithmetic over the screen size, e.g.
+"center_x - 200" or "height - 200". compile_expression() turns such a
+string into a function of (width, height) once; there is no eval, so a
+YAML file can only ever produce a number.
+"""
+
+import ast
+import marshal
+import operator
+import os
+import struct
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+CACHE_DIR = os.path.join(DATA_DIR, '.compiled')
+CACHE_MAGIC = b'SNKC'
+COMPILER_VERSION = 1  # Bump when the compiled layout changes
+
+STEP_TYPES = ('dialogue', 'action')
+
+_HEADER = struct.Struct('<4sBqq')
+
+# Names a position expression may use, as functions of (width, height)
+VARIABLES = {
+    'width': lambda width, height: width,
+    'height': lambda width, height: height,
+    'center_x': lambda width, height: width // 2,
+    'center_y': lambda width, height: height // 2,
+}
+_BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+}
+_UNARY_OPS = {ast.USub: operator.neg, ast.UAdd: operator.pos}
+
+MAX_EXPRESSION_LENGTH = 200
+
+_compiled_expressions = {}  # expression text -> function or constant
+
+
+class CutsceneError(ValueError):
+    pass
+
+
+def yaml_path(cutscene_id):
+    return os.path.join(DATA_DIR, f'{cutscene_id}.yaml')
+
+
+def load_compiled(cutscene_id):
+    """The compiled cutscene, from the cache when it matches the YAML."""
+    path = yaml_path(cutscene_id)
+    stat = os.stat(path)
+    cache_path = os.path.join(CACHE_DIR, f'{cutscene_id}.bin')
+    compiled = _read_cache(cache_path, stat)
+    if compiled is None:
+        import yaml  # Only needed when the cache is cold
+        with open(path, 'r') as f:
+            compiled = compile_cutscene(yaml.safe_load(f), cutscene_id)
+        _write_cache(cache_path, stat, compiled)
+    return compiled
+
+
+def compile_cutscene(data, cutscene_id):
+    """Validate parsed cutscene YAML and return its compiled form.
+
+    Raises CutsceneError describing the first problem found.
+    """
+    def fail(msg):
+        raise CutsceneError(f"Cutscene '{cutscene_id}': {msg}")
+
+    if not isinstance(data, dict):
+        fail("expected a mapping at the top level")
+
+    sprites = []
+    for name, config in (data.get('sprites') or {}).items():
+        if not isinstance(config, dict) or 'type' not in config:
+            fail(f"sprite '{name}' needs a type")
+        sprites.append({
+            'name': name,
+            'type': config['type'],
+            'position': _position(config.get('position'), f"sprite '{name}'", fail),
+            'config': dict(config),
+            'game': bool(config.get('game', False)),
+        })
+
+    snake = None
+    if 'snake' in data:
+        snake_data = data['snake'] or {}
+        snake = {
+            'position': _position(snake_data.get('position'), "snake", fail),
+            'state': dict(snake_data.get('state') or {}),
+        }
+
+    sequence = []
+    for i, step in enumerate(data.get('sequence') or []):
+        if not isinstance(step, dict) or step.get('type') not in STEP_TYPES:
+            fail(f"step {i} must have a type of {' or '.join(STEP_TYPES)}")
+        step = dict(step)
+        if step['type'] == 'dialogue' and not isinstance(step.get('text'), str):
+            fail(f"dialogue step {i} has no text")
+        if 'duration' in step and not (isinstance(step['duration'], (int, float)) and step['duration'] > 0):
+            fail(f"step {i} has a bad duration")
+        if 'actions' in step:
+            actions = []
+            for action in step['actions'] or []:
+                if not isinstance(action, (list, tuple)) or not action or not isinstance(action[0], str):
+                    fail(f"step {i} has a malformed action: {action!r}")
+                actions.append(tuple(action))
+            step['actions'] = actions
+        sequence.append(step)
+    if not sequence:
+        fail("the sequence is empty")
+
+    return {'id': cutscene_id, 'sprites': sprites, 'snake': snake, 'sequence': sequence}
+
+
+def _position(position, what, fail):
+    if (not isinstance(position, (list, tuple)) or len(position) != 2 or
+            not all(isinstance(v, (int, float, str)) for v in position)):
+        fail(f"{what} needs a position of two numbers or expressions")
+    for value in position:
+        if isinstance(value, str):
+            try:
+                compile_expression(value)
+            except CutsceneError as e:
+                fail(f"{what}: {e}")
+    return tuple(position)
+
+
+def compile_expression(text):
+    """Compile a position expression to a constant or a function of (width, height).
+
+    Results are cached per expression text. Raises CutsceneError for
+    anything but numbers, VARIABLES, parentheses, unary +/- and + - * / //.
+    """
+    compiled = _compiled_expressions.get(text)
+    if compiled is None:
+        if len(text) > MAX_EXPRESSION_LENGTH:
+            raise CutsceneError(f"position expression is too long: {text[:40]!r}...")
+        try:
+            compiled = _compile_node(ast.parse(text.strip(), mode='eval').body, text)
+        except (SyntaxError, ValueError, RecursionError):
+            raise CutsceneError(f"bad position expression {text!r}")
+        _compiled_expressions[text] = compiled
+    return compiled
+
+
+def resolve_value(value, width, height):
+    """A position coordinate (number or expression) for a width x height screen."""
+    if isinstance(value, str):
+        value = compile_expression(value)
+    return value(width, height) if callable(value) else value
+
+
+def _compile_node(node, text):
+    # Constant subexpressions are folded, so "100 + 50" compiles to 150
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return node.value
+    if isinstance(node, ast.Name) and node.id in VARIABLES:
+        return VARIABLES[node.id]
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        op = _UNARY_OPS[type(node.op)]
+        operand = _compile_node(node.operand, text)
+        if not callable(operand):
+            return op(operand)
+        return lambda width, height: op(operand(width, height))
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+        op = _BINARY_OPS[type(node.op)]
+        left = _compile_node(node.left, text)
+        right = _compile_node(node.right, text)
+        if not callable(left) and not callable(right):
+            try:
+                return op(left, right)
+            except ZeroDivisionError:
+                raise CutsceneError(f"division by zero in {text!r}")
+        left_fn = left if callable(left) else (lambda width, height: left)
+        right_fn = right if callable(right) else (lambda width, height: right)
+        return lambda width, height: op(left_fn(width, height), right_fn(width, height))
+    raise CutsceneError(f"unsupported position expression {text!r}")
+
+
+def _read_cache(cache_path, stat):
+    try:
+        with open(cache_path, 'rb') as f:
+            buf = f.read()
+        magic, version, mtime_ns, size = _HEADER.unpack_from(buf, 0)
+        if (magic, version, mtime_ns, size) != (CACHE_MAGIC, COMPILER_VERSION,
+                                                stat.st_mtime_ns, stat.st_size):
+            return None
+        return marshal.loads(buf[_HEADER.size:])
+    except (OSError, ValueError, EOFError, TypeError, struct.error):
+        return None
+
+
+def _write_cache(cache_path, stat, compiled):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        header = _HEADER.pack(CACHE_MAGIC, COMPILER_VERSION, stat.st_mtime_ns, stat.st_size)
+        tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(header + marshal.dumps(compiled))
+        os.replace(tmp_path, cache_path)
+    except (OSError, ValueError):
+        pass  # Not writable (e.g. a read-only install); compiling again next run is fine
@@ -1,10 +1,12 @@
 import pygame
 import time
+import surface_pool
 
 class DialogueBox:
-    def __init__(self, game, position='bottom'):
+    def __init__(self, game, position='bottom', clock=time.time):
         self.game = game
         self.position = position
+        self.clock = clock  # Seconds; a CutsceneTimeline's seconds() for headless runs
         self.text = ""
         self.displayed_text = ""
         self.char_index = 0
@@ -29,11 +31,11 @@ class DialogueBox:
         self.char_index = 0
         self.is_typing = True
         self.is_complete = False
-        self.last_char_time = time.time()
+        self.last_char_time = self.clock()
     
     def update(self):
         if self.is_typing and not self.is_complete:
-            current_time = time.time()
+            current_time = self.clock()
             if current_time - self.last_char_time >= self.char_delay:
                 if self.char_index < len(self.text):
                     self.displayed_text += self.text[self.char_index]
@@ -46,29 +48,25 @@ class DialogueBox:
         if not self.text:
             return
             
-        # Create dialogue box surface
-        box_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        pygame.draw.rect(box_surface, (0, 0, 0, 180), 
-                        box_surface.get_rect(), border_radius=10)
+        # Dialogue box background (shared, so the text goes straight onto the screen)
+        box_surface = surface_pool.panel((self.width, self.height), (0, 0, 0), 180, border_radius=10)
+        surface.blit(box_surface, (self.x, self.y))
         
         # Render text
         wrapped_text = self._wrap_text(self.displayed_text)
-        y_offset = self.padding
+        y_offset = self.y + self.padding
         for line in wrapped_text:
             text_surface = self.game.font.render(line, True, (255, 255, 255))
-            text_rect = text_surface.get_rect(topleft=(self.padding, y_offset))
-            box_surface.blit(text_surface, text_rect)
+            text_rect = text_surface.get_rect(topleft=(self.x + self.padding, y_offset))
+            surface.blit(text_surface, text_rect)
             y_offset += 30
         
         # Draw continue indicator if dialogue is complete
         if self.is_complete:
             continue_text = self.game.font.render("▼", True, (255, 255, 255))
             continue_rect = continue_text.get_rect(
-                bottomright=(self.width - 10, self.height - 10))
-            box_surface.blit(continue_text, continue_rect)
-        
-        # Blit dialogue box to screen
-        surface.blit(box_surface, (self.x, self.y))
+                bottomright=(self.x + self.width - 10, self.y + self.height - 10))
+            surface.blit(continue_text, continue_rect)
     
     def _wrap_text(self, text):
         """Wrap text to fit within dialogue box"""
@@ -0,0 +1,167 @@
+"""
+Seekable, headless cutscene playback on an explicit tick clock.
+
+CutsceneTimeline drives a level's running cutscene through
+Game.simulate_tick, so a timeline run is exactly what play would do, but
+as fast as the simulation goes. Dialogue can advance by itself after
+`auto_advance` ticks; otherwise advance() stands in for the player's
+ENTER. Keyframes (dump_state snapshots) are taken every
+KEYFRAME_INTERVAL ticks, so seek() can go back to any tick by restoring
+the one before it and simulating the rest.
+
+    python -m cutscenes.timeline
+
+plays every level's cutscenes to the end headless and reports how long
+each took and the state it ended in; it exits non-zero if one gets stuck.
+"""
+
+import argparse
+import contextlib
+import sys
+import time
+from replay.actions import ACTION_ADVANCE_CUTSCENE
+from replay.state import RandomStream, dump_state, load_state
+
+AUTO_ADVANCE_TICKS = 28   # Ticks a dialogue stays up before auto-advance (2 s at 14 ticks/s)
+KEYFRAME_INTERVAL = 60
+MAX_TICKS = 20000         # A cutscene still running after this long is stuck
+
+
+class CutsceneTimeline:
+    """Create it once the cutscene has been triggered.
+
+    With `rng` (a RandomStream) every tick runs inside that stream;
+    otherwise the timeline uses whatever global RNG state the caller has.
+    """
+
+    def __init__(self, game, auto_advance=AUTO_ADVANCE_TICKS, keyframe_interval=KEYFRAME_INTERVAL,
+                 rng=None):
+        self.game = game
+        self.auto_advance = auto_advance  # None: dialogue waits for advance()
+        self.keyframe_interval = keyframe_interval
+        self.rng = rng
+        self.tick = 0
+        self.waited = 0  # Ticks the current dialogue has been waiting
+        self.inputs = {}  # tick -> advance requested by advance()
+        with self._random():
+            self.keyframes = {0: dump_state(game, extra=0)}
+
+    def _random(self):
+        return self.rng if self.rng is not None else contextlib.nullcontext()
+
+    @property
+    def cutscene(self):
+        return self.game.current_level.current_cutscene
+
+    @property
+    def done(self):
+        cutscene = self.cutscene
+        return cutscene is None or cutscene.is_complete
+
+    def seconds(self):
+        """The timeline clock in seconds, usable where a wall clock was (e.g. DialogueBox)."""
+        return self.tick / self.game.snake_speed
+
+    def advance(self):
+        """Advance the dialogue on the next tick, as the player pressing ENTER would.
+
+        Anything recorded after this point no longer applies and is dropped.
+        """
+        self._truncate(self.tick)
+        self.inputs[self.tick] = True
+
+    def step(self, ticks=1):
+        """Simulate up to `ticks` ticks, stopping early when the cutscene ends."""
+        with self._random():
+            self._step(ticks)
+
+    def _step(self, ticks):
+        for _ in range(ticks):
+            if self.done:
+                break
+            actions = []
+            if self.inputs.get(self.tick):
+                actions.append(ACTION_ADVANCE_CUTSCENE)
+            elif self.cutscene.waiting_for_input:
+                self.waited += 1
+                if self.auto_advance is not None and self.waited >= self.auto_advance:
+                    actions.append(ACTION_ADVANCE_CUTSCENE)
+            if actions or not self.cutscene.waiting_for_input:
+                self.waited = 0
+            self.game.simulate_tick(actions)
+            self.tick += 1
+            if self.tick % self.keyframe_interval == 0 and self.tick not in self.keyframes:
+                self.keyframes[self.tick] = dump_state(self.game, extra=self.waited)
+
+    def seek(self, tick):
+        """Jump to the start of `tick` (or the end, if the cutscene finishes first)."""
+        tick = max(0, tick)
+        with self._random():
+            if tick < self.tick:
+                keyframe_tick = max(t for t in self.keyframes if t <= tick)
+                self.waited = load_state(self.game, self.keyframes[keyframe_tick])
+                self.tick = keyframe_tick
+            self._step(tick - self.tick)
+
+    def run_to_end(self, max_ticks=MAX_TICKS):
+        """Fast-forward to the end of the cutscene. Returns True if it ended."""
+        self.step(max_ticks - self.tick)
+        return self.done
+
+    def _truncate(self, tick):
+        self.inputs = {t: v for t, v in self.inputs.items() if t < tick}
+        self.keyframes = {t: v for t, v in self.keyframes.items() if t <= tick}
+
+
+def cutscene_end_state(game):
+    """The parts of the game a cutscene sets up for gameplay, for checking."""
+    snake = game.snake
+    level = game.current_level
+    return {
+        'snake': (snake.x, snake.y),
+        'frozen': snake.frozen,
+        'sleeping': snake.is_sleeping,
+        'emote': snake.emote,
+        'enemy_snakes': len(level.enemy_snakes),
+        'boss': level.boss is not None,
+    }
+
+
+def start_level_cutscene(level_idx, trigger, seed=0, auto_advance=AUTO_ADVANCE_TICKS):
+    """A timeline for one of a level's cutscenes, started in a fresh headless game.
+
+    The game runs on its own RandomStream seeded with `seed`, so the run
+    doesn't depend on (or disturb) the caller's RNG.
+    """
+    from game import Game
+    rng = RandomStream(seed)
+    with rng:
+        game = Game(headless=True)
+        game.load_level(level_idx)
+        game.current_level.trigger_cutscene(trigger)
+    return CutsceneTimeline(game, auto_advance, rng=rng)
+
+
+def main():
+    from levels.config import LEVELS
+    parser = argparse.ArgumentParser(description="Play every cutscene headless and report its end state")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--auto-advance', type=int, default=AUTO_ADVANCE_TICKS,
+                        help="ticks each dialogue stays up")
+    args = parser.parse_args()
+
+    stuck = 0
+    for level_idx, level_data in enumerate(LEVELS):
+        for trigger in level_data.get('cutscenes', {}):
+            timeline = start_level_cutscene(level_idx, trigger, args.seed, args.auto_advance)
+            start = time.perf_counter()
+            ended = timeline.run_to_end()
+            elapsed = (time.perf_counter() - start) * 1000
+            stuck += not ended
+            state = cutscene_end_state(timeline.game) if ended else "STUCK"
+            print(f"{level_data['name']} {trigger}: {timeline.tick} ticks in {elapsed:.0f} ms -> {state}")
+    sys.exit(1 if stuck else 0)
+
+
+if __name__ == '__main__':
+    main()
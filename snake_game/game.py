@@ -1,12 +1,28 @@
+import os
+import copy
+import threading
 import pygame
 import random
 import math
-from levels.base_level import BaseLevel
 from levels.config import LEVELS
-from importlib import import_module
 from sprites.snake import Snake
-from menu import MainMenu, LevelSelectMenu
+from menu import MainMenu, LevelSelectMenu, MenuPacer
 from audio.music_manager import MusicManager
+from audio.sound_effects import SoundEffects
+from audio.backend import open_backend
+from replay.actions import (
+    KEY_TO_ACTION, SNAKE_KEYS, ACTION_SKIP_CUTSCENE, ACTION_ADVANCE_CUTSCENE,
+    ACTION_RETRY, ACTION_DEV_POWER_UP, ACTION_DEV_KILL_BOSS,
+)
+from replay.state import RandomStream, dump_state, load_state
+from replay.recorder import ReplayRecorder
+from replay.player import ReplayPlayer
+from startup_profile import profiler, phase, import_module
+from scheduler import JobScheduler, PRIORITY_HIGH, PRIORITY_LOW, WAIT, in_stream
+import surface_pool
+from replay.savegame import (
+    AUTOSAVE_INTERVAL, encode_save, write_save_file, read_save_info, load_save, delete_save,
+)
 
 ################################################################################
 # Developer/Debug toggle
@@ -14,34 +30,66 @@ DEV_MODE = True  # Set to False to disable dev features
 ################################################################################
 
 class Game:
-    def __init__(self):
-        pygame.init()
-        pygame.mixer.init()  # Initialize the mixer
+    def __init__(self, record_dir=None, headless=False, save_path=None):
+        # Headless games (bots, batch runs) draw into an offscreen surface
+        # and never open a window or an audio device
+        self.headless = headless
+        if headless:
+            os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+            # pygame.init() would open the mixer as well, which is slow and
+            # needs an audio device; start only what a headless game uses
+            with phase('pygame.init'):
+                pygame.display.init()
+                pygame.font.init()
+                pygame.time.wait(0)  # Starts SDL's timer, as pygame.init() does
+        else:
+            with phase('pygame.init'):
+                pygame.init()
+        self.audio = open_backend(headless)  # Records instead of playing when headless
         
         self.width = 800
         self.height = 600
-        self.window = pygame.display.set_mode((self.width, self.height))
-        pygame.display.set_caption("Snake Game")
+        if headless:
+            self.window = pygame.Surface((self.width, self.height))
+        else:
+            with phase('pygame.display.set_mode'):
+                self.window = pygame.display.set_mode((self.width, self.height))
+                pygame.display.set_caption("Snake Game")
         
         self.clock = pygame.time.Clock()
         self.snake_speed = 14
+        self.sim_ticks = 0  # Simulation clock in ms, advanced once per game tick
+        self.game_close = False  # True while the "GAME OVER!" screen is up
+        self.render_random = RandomStream()  # Drawing's own RNG stream
+        self.record_dir = record_dir  # Record a replay of every run_game when set
+        self.save_path = save_path  # Autosave the running level here when set
+        self.autosave_ticks = 0
+        self.autosave_thread = None
+        self.pregen = None  # (level index, worker thread, job) while pre-generating
+        self.jobs = JobScheduler()  # Background work run between frames
         self.current_level_idx = 0
         self.current_level = None
+        self.level_seed = None  # Seed the current level was generated from
+        self.retry_state = None  # (level index, state) of the current level as built, for retries
         self.snake = Snake(self.width // 2, self.height // 2, self)
-        self.music_manager = MusicManager()  # Initialize music manager
+        self.music_manager = MusicManager(self.audio, jobs=self.jobs)  # Initialize music manager
+        self.sfx = SoundEffects(self.audio, width=self.width)  # Loaded by warm_up
         
         # Initialize font
-        try:
-            self.font = pygame.font.Font("assets/PressStart2P-Regular.ttf", 16)
-        except:
-            print("Could not load custom font, falling back to system font")
-            self.font = pygame.font.SysFont(None, 32)
+        with phase('Game font'):
+            try:
+                self.font = pygame.font.Font("assets/PressStart2P-Regular.ttf", 16)
+            except:
+                print("Could not load custom font, falling back to system font")
+                self.font = pygame.font.SysFont(None, 32)
         
         self.current_time_of_day = None  # Track current time of day
-        self.load_level(0)
+        # No level is built until one is chosen (see run) or loaded by the caller
         self.levels = LEVELS  # Store levels for menu access
-        self.main_menu = MainMenu(self)
-        self.level_select_menu = LevelSelectMenu(self)
+        with phase('MainMenu'):
+            self.main_menu = MainMenu(self)
+        with phase('LevelSelectMenu'):
+            self.level_select_menu = LevelSelectMenu(self)
         self.current_menu = self.main_menu
         self.in_menu = True
         self.dev_show_overlay = False
@@ -57,18 +105,24 @@ class Game:
         
         self.level_name_alpha = 255  # Add this for fade effect
     
-    def load_level(self, level_idx, keep_time=False):
-        """Load a level"""
-        if self.current_level:
-            self.current_level.cleanup(stop_music=not keep_time)
-        
-        # Reset level name fade
-        self.level_name_alpha = 255
-        
-        # Only stop music if we're changing levels (not on retry)
-        if not keep_time:  # keep_time=True means it's a retry
-            self.music_manager.stop_music()
-        
+    def load_level(self, level_idx, keep_time=False, seed=None):
+        """Load a level, generated from `seed` (by default one drawn from the global RNG).
+
+        The global RNG is seeded with it first, so the same seed (and time of
+        day) gives the same level; replays record it as level_seed.
+        """
+        if seed is None:
+            seed = random.getrandbits(32)  # From the running stream, so seeded sessions stay reproducible
+        random.seed(seed)
+        level = self.build_level(level_idx, self.current_time_of_day if keep_time else None)
+        self.install_level(level_idx, level, keep_time)
+        self.level_seed = seed
+    
+    def build_level(self, level_idx, time_of_day=None):
+        """Reset the snake and generate a level without making it current.
+
+        Only the snake and the global RNG are touched.
+        """
         # Reset snake state completely
         self.snake.reset(self.width // 2, self.height // 2)
         self.snake.is_sleeping = False
@@ -89,18 +143,27 @@ class Game:
             self.snake.dy = 0
         
         level_data = LEVELS[level_idx]
-        # Support optional per-level class override
-        level_cls = BaseLevel
-        level_class_path = level_data.get('level_class')
-        if level_class_path:
-            try:
-                module_path, class_name = level_class_path.rsplit('.', 1)
-                module = import_module(module_path)
-                level_cls = getattr(module, class_name, BaseLevel)
-            except Exception:
-                level_cls = BaseLevel
-        self.current_level = level_cls(self, level_data, self.current_time_of_day if keep_time else None)
+        level_cls = self.level_class(level_data)
+        return level_cls(self, level_data, time_of_day)
+    
+    def install_level(self, level_idx, level, keep_time=False):
+        """Make a level from build_level the current one."""
+        if self.current_level:
+            self.current_level.cleanup(stop_music=not keep_time)
+        
+        # Reset level name fade
+        self.level_name_alpha = 255
+        
+        # Only stop music if we're changing levels (not on retry)
+        if not keep_time:  # keep_time=True means it's a retry
+            self.music_manager.stop_music()
+        
+        self.current_level = level
         self.current_level_idx = level_idx
+        self.schedule_level_jobs(level)
+        # Retrying restores this instead of building the level again. It lives
+        # on the Game, so snapshots and saves of the level don't carry it
+        self.retry_state = (level_idx, dump_state(self, compress=False))
         
         if not keep_time:
             self.current_time_of_day = self.current_level.current_time
@@ -113,15 +176,195 @@ class Game:
             # ADDED: Force the level to start gameplay again for sky level enemies to spawn
             self.current_level.start_gameplay()
     
+    def pregenerate_level(self, level_idx):
+        """Start building `level_idx` in the background.
+
+        A worker thread imports the level's code and parses its cutscenes.
+        A scheduler job then builds the level on the main thread and bakes
+        its ground. The build uses a copy of the snake and a private stream
+        seeded like load_level's, so the running level's snake and the
+        global RNG are left alone until take_pregenerated_level() swaps the
+        new ones in.
+        """
+        self.discard_pregenerated_level()
+        seed = random.getrandbits(32)  # Drawn now, as load_level would, so seeded sessions stay reproducible
+        level_data = LEVELS[level_idx]
+        
+        def work():
+            try:
+                from cutscenes.base_cutscene import preload_cutscene
+                self.level_class(level_data)  # Imports the level's module
+                for cutscene_id in level_data.get('cutscenes', {}).values():
+                    preload_cutscene(cutscene_id)
+            except Exception as e:
+                print(f"Warning: could not preload level {level_idx}: {e}")
+        
+        def finish():
+            while thread.is_alive():
+                yield WAIT
+            snake = copy.copy(self.snake)
+            snake.projectiles = []
+            current_snake, self.snake = self.snake, snake  # Levels are built around game.snake
+            try:
+                with RandomStream(seed):
+                    level = self.build_level(level_idx)
+                    rng_state = random.getstate()
+            except Exception as e:
+                print(f"Warning: could not pre-generate level {level_idx}: {e}")
+                return None
+            finally:
+                self.snake = current_snake
+            self.music_manager.preload_game_music(level_data['biome'], level.night_music)
+            yield from in_stream(self.warm_level_assets(level), self.render_random)
+            return level, snake, rng_state, seed
+        
+        thread = threading.Thread(target=work, daemon=True)
+        thread.start()
+        self.pregen = (level_idx, thread, self.jobs.add(finish(), PRIORITY_HIGH))
+    
+    def take_pregenerated_level(self, level_idx):
+        """Make the pre-generated level current, finishing its build first.
+
+        Afterwards the game is as load_level(level_idx) would have left it.
+        Returns False if there is no pre-generated level for `level_idx`.
+        """
+        if self.pregen is None:
+            return False
+        pregen_idx, thread, job = self.pregen
+        self.pregen = None
+        thread.join()
+        if pregen_idx != level_idx:
+            job.cancel()
+            return False
+        result = self.jobs.finish(job)
+        if result is None:
+            return False
+        level, self.snake, rng_state, seed = result
+        random.setstate(rng_state)
+        self.install_level(level_idx, level)
+        self.level_seed = seed
+        return True
+    
+    def discard_pregenerated_level(self):
+        self.take_pregenerated_level(None)
+    
+    def schedule_level_jobs(self, level):
+        """Replace the previous level's background jobs with the new level's.
+
+        Its surfaces are all drawn by the first frame anyway, so what idle
+        frames can do ahead of time is compile the cutscenes it starts later.
+        """
+        self.jobs.cancel('level')
+        self.jobs.add(self.preload_level_cutscenes(level), PRIORITY_LOW, tag='level')
+    
+    def preload_level_cutscenes(self, level):
+        """Compile a level's cutscenes, one per step (a scheduler job)."""
+        from cutscenes.base_cutscene import preload_cutscene
+        for cutscene_id in level.cutscenes.values():
+            preload_cutscene(cutscene_id)
+            yield
+    
+    def warm_level_assets(self, level):
+        """Draw a level's surfaces ahead of first use, a slice per step (a scheduler job).
+
+        Only worth it for a level built before it is shown (see pregenerate_level).
+        """
+        if level.level_data['biome'] != 'sky' and not level.level_data.get('is_space', False):
+            yield from level.bake_ground(self.width, self.height)
+    
+    def level_class(self, level_data):
+        """The level's class; configs may name their own with 'level_class'.
+
+        Level modules are imported on first use so startup doesn't wait for them.
+        """
+        from levels.base_level import BaseLevel
+        level_class_path = level_data.get('level_class')
+        if level_class_path:
+            try:
+                module_path, class_name = level_class_path.rsplit('.', 1)
+                module = import_module(module_path)
+                return getattr(module, class_name, BaseLevel)
+            except Exception:
+                return BaseLevel
+        return BaseLevel
+    
+    def restore_level(self, level_idx, level_vars):
+        """Install a level from captured variables (see replay.state) without generating one."""
+        if self.current_level:
+            self.current_level.cleanup(stop_music=False)
+        level_cls = self.level_class(LEVELS[level_idx])
+        level = level_cls.__new__(level_cls)
+        vars(level).update(level_vars)
+        level.game = self
+        level.ground_cache = None
+        level.sky_manager = level.create_sky_manager()
+        self.current_level = level
+        self.current_level_idx = level_idx
+        self.schedule_level_jobs(level)
+        self.current_time_of_day = level.current_time
+        self.level_name_alpha = 255
+    
+    def retry_level(self):
+        """Restart the current level with the layout it was loaded with."""
+        # A level restored from a save has no snapshot; build it again from its seed
+        if self.retry_state is None or self.retry_state[0] != self.current_level_idx:
+            if self.level_seed is None:
+                self.load_level(self.current_level_idx, keep_time=True)
+                return
+            # Not passing the time of day: the level draws it from the seed as
+            # it did the first time, and forcing it would shift every draw after
+            random.seed(self.level_seed)
+            level = self.build_level(self.current_level_idx)
+            self.install_level(self.current_level_idx, level, keep_time=True)
+            return
+        self.current_level.cleanup(stop_music=False)
+        sim_ticks = self.sim_ticks  # The simulation clock keeps running
+        load_state(self, self.retry_state[1], compressed=False)
+        self.sim_ticks = sim_ticks
+        self.level_name_alpha = 255
+        self.current_level.start_gameplay()
+    
     def next_level(self):
         if self.current_level_idx + 1 < len(LEVELS):
             self.load_level(self.current_level_idx + 1)
             return True
         return False
     
+    def warm_up(self, background=True):
+        """Import the level code and parse cutscenes on a worker thread.
+
+        Started when the menu comes up, so the level the player picks loads
+        without waiting on the disk. Touches neither surfaces nor the RNG.
+        The first level's music is read ahead too, and the sound effects are
+        decoded. With background=False it runs right away on this thread
+        instead and returns None.
+        """
+        def work():
+            try:
+                self.sfx.load()
+                from cutscenes.base_cutscene import preload_cutscene
+                for is_night in (False, True):
+                    self.music_manager.preload_game_music(LEVELS[0]['biome'], is_night)
+                for level_data in LEVELS:
+                    self.level_class(level_data)
+                    for cutscene_id in level_data.get('cutscenes', {}).values():
+                        preload_cutscene(cutscene_id)
+            except Exception as e:
+                print(f"Warning: warm-up failed: {e}")
+        
+        if not background:
+            work()
+            return None
+        thread = threading.Thread(target=work, daemon=True)
+        thread.start()
+        return thread
+    
     def run(self):
         running = True
+        resumed = False
         self.music_manager.play_menu_music()
+        if not profiler.enabled:  # A profiling run times it on its own, see finish_startup_profile
+            self.warm_up()
         
         while running:
             if self.in_menu:
@@ -135,15 +378,21 @@ class Game:
                     self.current_menu = self.level_select_menu
                 elif action == "main_menu":
                     self.current_menu = self.main_menu
+                elif action == "continue":
+                    resumed = self.resume_saved_game()
+                    self.in_menu = not resumed
                 elif isinstance(action, tuple) and action[0] == "start_level":
                     self.in_menu = False
                     self.load_level(action[1])
             else:
-                result = self.run_game()
+                result = self.run_game(resumed=resumed)
+                resumed = False
                 if result == "quit":
                     running = False
                 elif result == "menu":
                     self.in_menu = True
+                    if self.save_path:
+                        self.main_menu = MainMenu(self)  # Offer to continue the run just left
                     self.current_menu = self.main_menu
                     self.music_manager.play_menu_music()
                 elif result == "restart_game":  # Handle the new return value
@@ -151,149 +400,131 @@ class Game:
                     pass
     
     def run_menu(self):
+        # Redraws only while animating or after a change, and sleeps on the
+        # event queue otherwise (see MenuPacer)
+        pacer = MenuPacer()
+        waited = []  # Event that ended the last wait, handled first
         while True:
-            for event in pygame.event.get():
+            for event in waited + pygame.event.get():
                 if event.type == pygame.QUIT:
                     return "quit"
                 
+                pacer.handle_event(event)
                 result = self.current_menu.handle_input(event)
                 if result is not None:
                     return result
+            waited = []
             
-            self.current_menu.draw(self.window)
-            pygame.display.update()
-            self.clock.tick(60)
+            now = pygame.time.get_ticks()
+            if pacer.should_draw(now):
+                self.current_menu.draw(self.window)
+                pygame.display.update()
+                pacer.drew()
+                if profiler.enabled:
+                    return self.finish_startup_profile()
+            self.jobs.run()
+            
+            fps = pacer.fps(now) if pacer.visible else None
+            if fps is not None:
+                self.clock.tick(fps)
+            else:
+                event = pygame.event.wait(pacer.sleep_ms(now, len(self.jobs)))
+                if event.type != pygame.NOEVENT:
+                    waited = [event]
+                self.clock.tick()  # Don't count the wait against the next frame
     
-    def run_game(self):
-        game_over = False
-        game_close = False
-        
-        # Start intro cutscene if the level has one and we're not returning from menu
-        if self.current_level.show_intro and not self.current_level.current_cutscene:
-            self.current_level.start_intro_cutscene()
-        else:
-            # No cutscene, start gameplay
+    def finish_startup_profile(self):
+        """Called at the first menu frame of a --profile-startup run; ends the run."""
+        profiler.mark_first_menu_frame()
+        # Normally overlapped with the menu; run in line so the report doesn't
+        # depend on how a worker thread was scheduled
+        with phase('warm_up'):
+            self.warm_up(background=False)
+        with phase('load_level'):
+            self.load_level(0)
+        profiler.stop()
+        profiler.write()
+        print(f"Startup profile written to {profiler.path}")
+        return "quit"
+    
+    def run_game(self, resumed=False):
+        if resumed:
+            # A resumed level carries on exactly where it was saved
             if not self.current_level.current_cutscene:
-                self.current_level.start_gameplay()
+                self.music_manager.play_game_music(
+                    self.current_level.level_data['biome'], self.current_level.night_music)
+        else:
+            self.game_close = False
+            
+            # Start intro cutscene if the level has one and we're not returning from menu
+            if self.current_level.show_intro and not self.current_level.current_cutscene:
+                self.current_level.start_intro_cutscene()
+            else:
+                # No cutscene, start gameplay
+                if not self.current_level.current_cutscene:
+                    self.current_level.start_gameplay()
 
-        while not game_over:
+        recorder = None
+        if self.record_dir:
+            recorder = ReplayRecorder.for_directory(self, self.record_dir)
+        result = None
+        try:
+            result = self._game_loop(recorder)
+        finally:
+            if recorder:
+                recorder.close(recorder.outcome or ("dead" if self.game_close else result))
+        return result
+
+    def _game_loop(self, recorder):
+        while True:
+            if recorder:
+                recorder.start_tick()
+            
             # Process all events
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
+                    self.autosave(force=True)
                     return "quit"
                 
                 if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        if self.current_level.current_cutscene:
-                            # NEW: Skip the current cutscene
-                            self.current_level.current_cutscene = None
-                            self.current_level.start_gameplay()
-                        else:
-                            # existing logic for returning to menu
-                            self.current_level.current_cutscene = None
-                            game_close = False
-                            game_over = False
-                            return "menu"
+                    if event.key == pygame.K_ESCAPE and not self.current_level.current_cutscene:
+                        # Return to menu (ESC during a cutscene skips it instead)
+                        self.current_level.current_cutscene = None
+                        self.game_close = False
+                        return "menu"
                     
-                    # Developer features
-                    if DEV_MODE and (event.mod & pygame.KMOD_SHIFT):
-                        if event.key == pygame.K_p:  # Existing power-up toggle
-                            self.snake.is_powered_up = not self.snake.is_powered_up
-                            self.snake.power_up_timer = 0  # Reset its timer
-                        elif event.key == pygame.K_k:  # New boss kill shortcut
-                            if (self.current_level.boss and 
-                                not self.current_level.boss.is_dying):
-                                self.current_level.boss_health = 0
-                                self.current_level.boss.start_death_animation()
-                        elif event.key == pygame.K_v:  # Toggle dev overlay
-                            self.dev_show_overlay = not self.dev_show_overlay
+                    if DEV_MODE and (event.mod & pygame.KMOD_SHIFT) and event.key == pygame.K_v:
+                        self.dev_show_overlay = not self.dev_show_overlay  # Toggle dev overlay
                     
-                    # Handle other input based on game state
-                    if self.current_level.current_cutscene:
-                        if event.key == pygame.K_RETURN:
-                            self.current_level.current_cutscene.handle_input()
-                    elif game_close:  # Only handle ENTER during game over
-                        if event.key == pygame.K_RETURN:
-                            self.load_level(self.current_level_idx, keep_time=True)
-                            game_close = False
-                    else:  # Normal gameplay input
-                        self.snake.handle_input(event)
+                    action = self.action_for_event(event)
+                    if action is not None:
+                        if recorder:
+                            recorder.record_action(action)
+                        self.apply_action(action)
 
             # Update and draw game state
-            if self.current_level.current_cutscene:
-                self.current_level.current_cutscene.update()
-            self.current_level.update()
-            self.snake.update_power_up()
-            
-            # Draw game state in new order
-            self.current_level.draw(self.window)
-            if not self.current_level.current_cutscene:  # Only draw health when not in cutscene
-                self.draw_boss_health()  # Draw health bar before cutscene
-            if self.current_level.current_cutscene:
-                self.current_level.current_cutscene.draw(self.window)  # Draw cutscene last
-            self.draw_ui()
+            self.update_game_state()
+            self.draw_game()
             
             # Check collisions and game state
-            if not game_close:  # Only check if game isn't already over
-                if self.current_level.check_collision(self.snake):
-                    game_close = True
+            if not self.game_close:  # Only check if game isn't already over
+                died, complete = self.resolve_game_state()
+                if died:
                     # Wait for death animation to complete
                     for _ in range(self.snake.death_frames):
-                        self.current_level.draw(self.window)
+                        with self.render_random:
+                            self.current_level.draw(self.window)
                         pygame.display.update()
                         self.clock.tick(60)
                 
-                if self.current_level.check_food_collision(self.snake):
-                    self.snake.grow()
-                
-                if self.current_level.is_complete():
-                    # Set food/building counts to maximum BEFORE drawing final frame
-                    if self.current_level.level_data['biome'] == 'city':
-                        self.current_level.buildings_destroyed = self.current_level.required_buildings
-                    else:
-                        self.current_level.food_count = self.current_level.required_food
-                    
-                    # Draw one more frame with the updated count
-                    self.current_level.draw(self.window)
-                    self.draw_ui()
-                    pygame.display.update()
-                    
-                    # Handle level completion
-                    next_level_idx = self.current_level_idx + 1
-                    if next_level_idx >= len(self.levels):
-                        self.show_message("You Won!", (0, 255, 0))
-                        pygame.display.update()
-                        pygame.time.wait(2000)
-                        return None
-                    else:
-                        # Show victory message and wait for input
-                        waiting_for_input = True
-                        while waiting_for_input:
-                            self.show_message(
-                                "Level Complete!\n"
-                                "[ENTER] Continue",
-                                (0, 255, 0)
-                            )
-                            pygame.display.update()
-                            
-                            for event in pygame.event.get():
-                                if event.type == pygame.QUIT:
-                                    return "quit"
-                                if event.type == pygame.KEYDOWN:
-                                    if event.key == pygame.K_RETURN:
-                                        waiting_for_input = False
-                                    elif event.key == pygame.K_ESCAPE:
-                                        return "menu"
-                            
-                            self.clock.tick(60)
-                        
-                        # After player presses ENTER, load next level
-                        self.music_manager.stop_music()
-                        self.load_level(next_level_idx)
-                        return "restart_game"  # Add this return value to force a fresh game state
+                if complete:
+                    if recorder:
+                        recorder.end_tick()
+                        recorder.outcome = "complete"
+                    return self.complete_level()
             
             # Show game over message if needed
-            if game_close:
+            if self.game_close:
                 self.show_message(
                     "GAME OVER!\n"
                     "[ESC] Main Menu\n"
@@ -301,7 +532,254 @@ class Game:
                     (255, 0, 0)
                 )
             
+            if recorder:
+                recorder.end_tick()
+            self.autosave()
+            pygame.display.update()
+            self.jobs.run()
+            self.clock.tick(self.snake_speed)
+
+    def autosave(self, force=False):
+        """Save the running level every AUTOSAVE_INTERVAL ticks (now if `force`).
+
+        The state is captured on this thread; writing and syncing the file
+        happens on a background thread so a slow disk doesn't stall a frame.
+        """
+        if not self.save_path:
+            return
+        self.autosave_ticks += 1
+        if not force and self.autosave_ticks % AUTOSAVE_INTERVAL:
+            return
+        if self.autosave_thread and self.autosave_thread.is_alive():
+            if not force:
+                return  # The previous save is still being written
+            self.autosave_thread.join()
+        data = encode_save(self)
+        if force:
+            self._write_save(data)
+        else:
+            self.autosave_thread = threading.Thread(target=self._write_save, args=(data,), daemon=True)
+            self.autosave_thread.start()
+
+    def _write_save(self, data):
+        try:
+            write_save_file(self.save_path, data)
+        except OSError as e:
+            print(f"Warning: could not write save file: {e}")
+
+    def has_saved_game(self):
+        return bool(self.save_path) and read_save_info(self.save_path) is not None
+
+    def resume_saved_game(self):
+        """Load the autosave into the game; returns True on success."""
+        try:
+            load_save(self, self.save_path)
+        except (OSError, ValueError) as e:
+            print(f"Warning: could not resume saved game: {e}")
+            return False
+        self.level_name_alpha = 255
+        return True
+
+    def action_for_event(self, event):
+        """Translate a KEYDOWN event into a gameplay action (or None)."""
+        if event.key == pygame.K_ESCAPE:
+            return ACTION_SKIP_CUTSCENE if self.current_level.current_cutscene else None
+        
+        # Developer features
+        if DEV_MODE and (event.mod & pygame.KMOD_SHIFT):
+            if event.key == pygame.K_p:  # Existing power-up toggle
+                return ACTION_DEV_POWER_UP
+            elif event.key == pygame.K_k:  # New boss kill shortcut
+                return ACTION_DEV_KILL_BOSS
+        
+        # Handle other input based on game state
+        if self.current_level.current_cutscene:
+            if event.key == pygame.K_RETURN:
+                return ACTION_ADVANCE_CUTSCENE
+        elif self.game_close:  # Only handle ENTER during game over
+            if event.key == pygame.K_RETURN:
+                return ACTION_RETRY
+        else:  # Normal gameplay input
+            return KEY_TO_ACTION.get(event.key)
+        return None
+
+    def apply_action(self, action):
+        """Apply a gameplay action; shared by live play and replays."""
+        level = self.current_level
+        if action == ACTION_SKIP_CUTSCENE:
+            if level.current_cutscene:
+                level.current_cutscene = None
+                level.start_gameplay()
+        elif action == ACTION_DEV_POWER_UP:
+            self.snake.is_powered_up = not self.snake.is_powered_up
+            self.snake.power_up_timer = 0  # Reset its timer
+        elif action == ACTION_DEV_KILL_BOSS:
+            if level.boss and not level.boss.is_dying:
+                level.boss_health = 0
+                level.boss.start_death_animation()
+        elif action == ACTION_ADVANCE_CUTSCENE:
+            if level.current_cutscene:
+                level.current_cutscene.handle_input()
+        elif action == ACTION_RETRY:
+            self.retry_level()
+            self.game_close = False
+        elif action in SNAKE_KEYS:
+            self.snake.handle_key(SNAKE_KEYS[action])
+
+    def update_game_state(self):
+        """Advance cutscene, level and power-up timers by one tick."""
+        self.sim_ticks += 1000 // self.snake_speed
+        if self.current_level.current_cutscene:
+            self.current_level.current_cutscene.update()
+        self.current_level.update()
+        self.snake.update_power_up()
+
+    def resolve_game_state(self):
+        """Move the snake and check death, food and completion.
+
+        Returns (died, complete) for this tick.
+        """
+        died = self.current_level.check_collision(self.snake)
+        if died:
+            self.game_close = True
+        
+        if self.current_level.check_food_collision(self.snake):
+            self.snake.grow()
+        
+        return died, self.current_level.is_complete()
+
+    def simulate_tick(self, actions=()):
+        """Run one game tick without drawing.
+
+        Returns "dead", "complete" or None.
+        """
+        for action in actions:
+            self.apply_action(action)
+        self.update_game_state()
+        if self.game_close:
+            return None
+        died, complete = self.resolve_game_state()
+        if complete:
+            return "complete"
+        return "dead" if died else None
+
+    def draw_game(self):
+        """Draw the level, boss health, cutscene and UI for the current tick."""
+        with self.render_random:
+            # Draw game state in new order
+            self.current_level.draw(self.window)
+            if not self.current_level.current_cutscene:  # Only draw health when not in cutscene
+                self.draw_boss_health()  # Draw health bar before cutscene
+            if self.current_level.current_cutscene:
+                self.current_level.current_cutscene.draw(self.window)  # Draw cutscene last
+            self.draw_ui()
+
+    def complete_level(self):
+        """Show the level-complete flow; returns run_game's result."""
+        # Set food/building counts to maximum BEFORE drawing final frame
+        if self.current_level.level_data['biome'] == 'city':
+            self.current_level.buildings_destroyed = self.current_level.required_buildings
+        else:
+            self.current_level.food_count = self.current_level.required_food
+        
+        # Draw one more frame with the updated count
+        with self.render_random:
+            self.current_level.draw(self.window)
+            self.draw_ui()
+        pygame.display.update()
+        
+        # Handle level completion
+        next_level_idx = self.current_level_idx + 1
+        if next_level_idx >= len(self.levels):
+            if self.save_path:
+                delete_save(self.save_path)  # Nothing left to resume
+            self.show_message("You Won!", (0, 255, 0))
+            pygame.display.update()
+            pygame.time.wait(2000)
+            return None
+        
+        # Build the next level while the player reads the message
+        self.pregenerate_level(next_level_idx)
+        
+        # Show victory message and wait for input
+        waiting_for_input = True
+        while waiting_for_input:
+            self.show_message(
+                "Level Complete!\n"
+                "[ENTER] Continue",
+                (0, 255, 0)
+            )
+            pygame.display.update()
+            
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.discard_pregenerated_level()
+                    return "quit"
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_RETURN:
+                        waiting_for_input = False
+                    elif event.key == pygame.K_ESCAPE:
+                        self.discard_pregenerated_level()
+                        return "menu"
+            
+            self.jobs.run()
+            self.clock.tick(60)
+        
+        # After player presses ENTER, swap in the next level
+        self.music_manager.stop_music()
+        if not self.take_pregenerated_level(next_level_idx):
+            self.load_level(next_level_idx)
+        return "restart_game"  # Add this return value to force a fresh game state
+
+    def run_replay(self, path):
+        """Play back a recorded replay.
+
+        SPACE pauses, LEFT/RIGHT seek one keyframe interval, UP/DOWN change
+        the fast-forward speed, HOME restarts and ESC quits. Fast-forward
+        simulates the skipped ticks headless and only draws the last one.
+        """
+        player = ReplayPlayer(self, path)
+        interval = player.replay.keyframe_interval
+        speed = 1
+        paused = False
+        self.in_menu = False
+        
+        while True:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return "quit"
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        return "menu"
+                    elif event.key == pygame.K_SPACE:
+                        paused = not paused
+                    elif event.key == pygame.K_RIGHT:
+                        player.seek(player.tick + interval)
+                    elif event.key == pygame.K_LEFT:
+                        player.seek(player.tick - interval)
+                    elif event.key == pygame.K_HOME:
+                        player.seek(0)
+                    elif event.key == pygame.K_UP:
+                        speed = min(speed * 2, 64)
+                    elif event.key == pygame.K_DOWN:
+                        speed = max(speed // 2, 1)
+            
+            if not paused:
+                for _ in range(speed):
+                    if player.at_end:
+                        break
+                    player.step()
+            
+            self.draw_game()
+            if self.game_close:
+                self.show_message("GAME OVER!", (255, 0, 0))
+            status = "END" if player.at_end else ("PAUSED" if paused else f"x{speed}")
+            replay_text = self.font.render(
+                f"REPLAY {player.tick}/{player.tick_count} {status}", True, (255, 255, 255))
+            self.window.blit(replay_text, replay_text.get_rect(bottomleft=(10, self.height - 10)))
+            
             pygame.display.update()
+            self.jobs.run()
             self.clock.tick(self.snake_speed)
 
     def show_message(self, msg, color):
@@ -324,8 +802,7 @@ class Game:
         bg_rect.center = (self.width/2, self.height/2)
         
         # Draw semi-transparent background
-        bg_surface = pygame.Surface(bg_rect.size, pygame.SRCALPHA)
-        pygame.draw.rect(bg_surface, (0, 0, 0, 180), bg_surface.get_rect(), border_radius=10)
+        bg_surface = surface_pool.panel(bg_rect.size, (0, 0, 0), 180, border_radius=10)
         self.window.blit(bg_surface, bg_rect)
         
         # Draw each line of text
@@ -411,8 +888,7 @@ class Game:
             # Semi-transparent background for the level text
             padding = 5
             bg_rect = level_rect.inflate(padding * 2, padding * 2)
-            bg_surface = pygame.Surface(bg_rect.size, pygame.SRCALPHA)
-            pygame.draw.rect(bg_surface, (0, 0, 0, self.level_name_alpha // 2), bg_surface.get_rect())
+            bg_surface = surface_pool.filled(bg_rect.size, (0, 0, 0), self.level_name_alpha // 2)
             
             # Apply fade to text
             level_surface.set_alpha(self.level_name_alpha)
@@ -444,8 +920,7 @@ class Game:
             # Add a small dark outline/background for better visibility
             padding = 2
             bg_rect = streak_rect.inflate(padding * 2, padding * 2)
-            bg_surface = pygame.Surface(bg_rect.size, pygame.SRCALPHA)
-            pygame.draw.rect(bg_surface, (0, 0, 0, 160), bg_surface.get_rect())
+            bg_surface = surface_pool.filled(bg_rect.size, (0, 0, 0), 160)
             self.window.blit(bg_surface, bg_rect)
             self.window.blit(streak_surface, streak_rect)
 
@@ -489,7 +964,6 @@ class Game:
             
             # Add dark background for text
             text_bg_rect = health_rect.inflate(4, 4)
-            text_bg_surface = pygame.Surface(text_bg_rect.size, pygame.SRCALPHA)
-            pygame.draw.rect(text_bg_surface, (0, 0, 0, 180), text_bg_surface.get_rect())
+            text_bg_surface = surface_pool.filled(text_bg_rect.size, (0, 0, 0), 180)
             self.window.blit(text_bg_surface, text_bg_rect)
             self.window.blit(health_surface, health_rect) 
@@ -22,6 +22,7 @@ class BaseLevel:
         self.food_count = 0
         self.required_food = level_data.get('required_food', 5)
         self.block_size = 20
+        self.ground_cache = None  # (key, surface) of the pre-drawn ground
         
         # Track building destruction separately for city
         self.buildings_destroyed = 0
@@ -37,11 +38,6 @@ class BaseLevel:
         # For space level, use a special time of day
         if biome == 'space':
             self.current_time = 'space'
-            # Add is_space flag to sky_theme
-            sky_theme = {
-                'sky_colors': level_data['background_colors']['sky_colors'],
-                'is_space': True
-            }
         else:
             # Normal time of day handling for other biomes
             # Allow per-level override of times of day via config
@@ -51,16 +47,8 @@ class BaseLevel:
                 self.current_time = random.choice(time_options) if time_options else 'day'
             else:
                 self.current_time = time_of_day
-            
-            sky_theme = times_map.get(self.current_time, next(iter(times_map.values()), {'sky_colors': [(0,0,0),(0,0,0)], 'is_night': False}))
         
-        self.sky_manager = SkyManager(
-            game.width, 
-            game.height, 
-            0,  # sky starts at top
-            sky_theme,
-            full_sky=level_data.get('full_sky', False)  # Pass the full_sky flag
-        )
+        self.sky_manager = self.create_sky_manager()
         
         # Calculate play area
         if self.level_data.get('full_sky', False):
@@ -130,6 +118,27 @@ class BaseLevel:
             # Don't spawn enemy snakes here - they'll be created by the cutscene
             pass
     
+    def create_sky_manager(self):
+        """Build the sky for the level's biome and time of day."""
+        level_data = self.level_data
+        if level_data['biome'] == 'space':
+            # Add is_space flag to sky_theme
+            sky_theme = {
+                'sky_colors': level_data['background_colors']['sky_colors'],
+                'is_space': True
+            }
+        else:
+            times_map = level_data.get('times_of_day', TIMES_OF_DAY.get(level_data['biome'], {}))
+            sky_theme = times_map.get(self.current_time, next(iter(times_map.values()), {'sky_colors': [(0,0,0),(0,0,0)], 'is_night': False}))
+        
+        return SkyManager(
+            self.game.width, 
+            self.game.height, 
+            0,  # sky starts at top
+            sky_theme,
+            full_sky=level_data.get('full_sky', False)  # Pass the full_sky flag
+        )
+    
     def initialize_obstacles(self):
         if 'obstacle_type' in self.level_data:
             # Handle old-style single obstacle type (for desert level compatibility)
@@ -461,6 +470,8 @@ class BaseLevel:
             if snake_rect.colliderect(food_item.get_hitbox()):
                 self.food.remove(food_item)
                 snake.handle_food_eaten()
+                if snake is self.game.snake:
+                    self.game.sfx.play('eat', snake.x)
                 
                 if self.level_data.get('has_target_mountain', False):
                     if food_item.is_eagle:
@@ -903,28 +914,56 @@ class BaseLevel:
                                        [x, y, size, size])
             return
         
-        # Special handling for different biomes
-        if self.level_data['biome'] == 'sky':
-            # Sky level doesn't need additional background drawing
+        # Sky level doesn't need any ground
+        if self.level_data['biome'] != 'sky':
+            self.blit_ground(surface)
+
+    def blit_ground(self, surface):
+        top = self.play_area['top']
+        width, height = surface.get_size()
+        surface.blit(self.ground_layer(width, height), (0, top), (0, top, width, height - top))
+
+    def ground_layer(self, width, height):
+        """The ground drawn onto a width x height layer, drawn on first use.
+
+        The ground never changes during a level, so it is drawn once and
+        blitted every frame.
+        """
+        for _ in self.bake_ground(width, height):
             pass
-        else:
-            # Original background drawing for desert/forest
-            ground_colors = self.level_data['background_colors']['ground']
-            ground_height = self.play_area['bottom'] - self.play_area['top']
-            
-            pygame.draw.rect(surface, ground_colors[-1],
-                           [0, self.play_area['top'], 
-                            self.game.width, ground_height])
-            
-            # Draw pixelated ground pattern
-            block_size = 8
-            for y in range(self.play_area['top'], self.play_area['bottom'], block_size):
-                for x in range(0, self.game.width, block_size):
-                    offset = int(10 * math.sin(x * 0.02))
-                    if y + offset > self.play_area['top']:
-                        color_index = int((y + offset - self.play_area['top']) / 50) % len(ground_colors)
-                        pygame.draw.rect(surface, ground_colors[color_index],
-                                       [x, y + offset, block_size, block_size])
+        return self.ground_cache[1]
+
+    def bake_ground(self, width, height):
+        """Draw the ground layer a slice at a time (a generator, see scheduler)."""
+        key = (self.play_area['top'], width, height)
+        if self.ground_cache is None or self.ground_cache[0] != key:
+            layer = pygame.Surface((width, height))
+            yield from self.draw_ground_steps(layer)
+            self.ground_cache = (key, layer)
+
+    def draw_ground_steps(self, surface):
+        """Draw the static ground below the sky (desert/forest pattern).
+
+        Yields after each row of blocks; levels with their own ground
+        override this.
+        """
+        ground_colors = self.level_data['background_colors']['ground']
+        ground_height = self.play_area['bottom'] - self.play_area['top']
+        
+        pygame.draw.rect(surface, ground_colors[-1],
+                       [0, self.play_area['top'], 
+                        self.game.width, ground_height])
+        
+        # Draw pixelated ground pattern
+        block_size = 8
+        for y in range(self.play_area['top'], self.play_area['bottom'], block_size):
+            for x in range(0, self.game.width, block_size):
+                offset = int(10 * math.sin(x * 0.02))
+                if y + offset > self.play_area['top']:
+                    color_index = int((y + offset - self.play_area['top']) / 50) % len(ground_colors)
+                    pygame.draw.rect(surface, ground_colors[color_index],
+                                   [x, y + offset, block_size, block_size])
+            yield
 
     # City and mountain background helpers moved to subclasses
     
@@ -978,6 +1017,7 @@ class BaseLevel:
                 destruction_complete = obstacle.update_destruction()
                 if destruction_complete:
                     # Allow subclasses to handle special effects before removal
+                    self.game.sfx.play('destroy', getattr(obstacle, 'x', None))
                     self.on_obstacle_destroyed(obstacle)
                     
                     # Remove the destroyed obstacle
@@ -991,29 +1031,7 @@ class BaseLevel:
                     self.obstacles.remove(obs)
         
         # Update snake projectiles
-        if self.game.snake.projectiles:
-            for proj in self.game.snake.projectiles[:]:
-                # Update position
-                proj['x'] += proj['dx']
-                proj['y'] += proj['dy']
-                proj['lifetime'] -= 1
-                
-                if proj['lifetime'] <= 0:
-                    self.game.snake.projectiles.remove(proj)
-                    continue
-                
-                # Check collision with boss
-                if self.boss:
-                    proj_rect = pygame.Rect(proj['x'] - 4, proj['y'] - 4, 8, 8)
-                    boss_rect = pygame.Rect(
-                        self.boss.x, self.boss.y,
-                        self.boss.width, self.boss.height
-                    )
-                    
-                    if proj_rect.colliderect(boss_rect):
-                        self.game.snake.projectiles.remove(proj)
-                        damage = self.boss.take_damage()
-                        self.boss_health = max(0, self.boss_health - damage // 5)  # 1/5th of normal damage
+        self.update_snake_projectiles(self.game.snake)
         
         # Update enemy snakes if present
         if self.enemy_snakes:
@@ -1070,6 +1088,31 @@ class BaseLevel:
                 # Check projectile collisions
                 self._check_projectile_collisions(enemy_snake)
     
+    def update_snake_projectiles(self, snake):
+        """Move a snake's venom projectiles and apply their boss hits."""
+        for proj in snake.projectiles[:]:
+            # Update position
+            proj['x'] += proj['dx']
+            proj['y'] += proj['dy']
+            proj['lifetime'] -= 1
+            
+            if proj['lifetime'] <= 0:
+                snake.projectiles.remove(proj)
+                continue
+            
+            # Check collision with boss
+            if self.boss:
+                proj_rect = pygame.Rect(proj['x'] - 4, proj['y'] - 4, 8, 8)
+                boss_rect = pygame.Rect(
+                    self.boss.x, self.boss.y,
+                    self.boss.width, self.boss.height
+                )
+                
+                if proj_rect.colliderect(boss_rect):
+                    snake.projectiles.remove(proj)
+                    damage = self.boss.take_damage()
+                    self.boss_health = max(0, self.boss_health - damage // 5)  # 1/5th of normal damage
+    
     def find_safe_spawn_for_snake(self, snake):
         """Locate a collision-free spot for the snake to start."""
         max_attempts = 300
@@ -5,7 +5,7 @@ Each level lives in its own module exporting `CONFIG`.
 Order is defined here to match the previous progression.
 """
 
-from importlib import import_module
+from startup_profile import import_module
 
 MODULES_IN_ORDER = [
     'desert',
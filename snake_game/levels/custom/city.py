@@ -149,10 +149,10 @@ class CityLevel(BaseLevel):
         # City completion: all required buildings destroyed
         return self.buildings_destroyed >= self.required_buildings
 
-    def draw_background(self, surface):
-        # Draw sky then city-specific ground/roads
-        self.sky_manager.draw(surface)
+    def draw_ground_steps(self, surface):
+        # City-specific ground/roads (cached by BaseLevel.blit_ground)
         self._draw_city_background(surface)
+        yield
 
     def draw_scene(self, surface):
         # 1) Draw all non-building obstacles first
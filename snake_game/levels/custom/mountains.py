@@ -186,10 +186,9 @@ class MountainsLevel(BaseLevel):
             return False
         return super().is_complete()
 
-    def draw_background(self, surface):
-        # Keep existing sky behavior then draw mountain ground
-        self.sky_manager.draw(surface)
-        self._draw_mountain_background(surface)
+    def draw_ground_steps(self, surface):
+        # Mountain ground (cached by BaseLevel.blit_ground)
+        yield from self._draw_mountain_background(surface)
 
     def draw_scene(self, surface):
         # 1) Draw all non-mountain-peak obstacles
@@ -221,7 +220,7 @@ class MountainsLevel(BaseLevel):
                 obs.draw_top(surface)
 
     def _draw_mountain_background(self, surface):
-        """Draw mountain terrain similar to forest but with rolling hills"""
+        """Draw mountain terrain similar to forest but with rolling hills, a row at a time"""
         ground_colors = self.level_data['background_colors']['ground']
         ground_height = self.play_area['bottom'] - self.play_area['top']
         
@@ -240,3 +239,4 @@ class MountainsLevel(BaseLevel):
                     color_index = int((y + offset - self.play_area['top']) / 60) % len(ground_colors)
                     pygame.draw.rect(surface, ground_colors[color_index],
                                    [x, y + offset, block_size, block_size])
+            yield
@@ -192,6 +192,7 @@ class SpaceLevel(BaseLevel):
             rock = Asteroid(jx, jy, vx, vy, size, block_size=self.block_size)
             self.asteroids.append(rock)
             self.obstacles.append(rock)
+        self.game.sfx.play('asteroids', cx)
 
     def update(self):
         # Update orbital positions for planets before running base update
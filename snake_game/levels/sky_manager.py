@@ -211,17 +211,16 @@ class SkyManager:
         """Create a gradient surface using the theme colors"""
         if self.full_sky:
             gradient_height = self.height
-            surface = pygame.Surface((self.width, gradient_height), pygame.SRCALPHA)
         else:
             gradient_height = self.height // 3 - self.top
-            surface = pygame.Surface((self.width, gradient_height), pygame.SRCALPHA)
         
+        # Fill a one pixel wide column and stretch it; every row is one color
+        column = pygame.Surface((1, gradient_height), pygame.SRCALPHA)
         for y in range(gradient_height):
             progress = y / gradient_height
-            color = self._interpolate_colors(colors[0], colors[1], progress)
-            pygame.draw.line(surface, color, (0, y), (self.width, y))
+            column.set_at((0, y), self._interpolate_colors(colors[0], colors[1], progress))
         
-        return surface
+        return pygame.transform.scale(column, (self.width, gradient_height))
     
     def _interpolate_colors(self, color1, color2, progress):
         """Interpolate between two colors"""
@@ -1,10 +1,69 @@
-import pygame
+import sys
+import startup_profile
+startup_profile.start_from_argv(sys.argv)  # Before the imports it should time
+
+import argparse
 from game import Game
+from net.protocol import DEFAULT_PORT
 
 def main():
-    pygame.init()
-    game = Game()
-    game.run()
+    parser = argparse.ArgumentParser(description="Snake Game")
+    parser.add_argument('--record-replays', metavar='DIR',
+                        help="record a replay of every level played into DIR")
+    parser.add_argument('--replay', metavar='FILE',
+                        help="play back a recorded replay instead of the game")
+    parser.add_argument('--save-file', metavar='FILE',
+                        help="autosave the running level to FILE and offer to continue it "
+                             "(saves are pickles: only use files this game wrote)")
+    parser.add_argument('--serve', action='store_true',
+                        help="host a head-to-head sky arena match (no window)")
+    parser.add_argument('--net-stats', action='store_true',
+                        help="with --serve, also report what full snapshots would have cost")
+    parser.add_argument('--connect', metavar='HOST',
+                        help="join an arena match hosted on HOST")
+    parser.add_argument('--arena', action='store_true',
+                        help="play an arena match against a bot on this machine")
+    parser.add_argument('--p2p-host', action='store_true',
+                        help="host a peer-to-peer arena match (rollback netplay)")
+    parser.add_argument('--p2p-join', metavar='HOST',
+                        help="join a peer-to-peer arena match hosted on HOST")
+    parser.add_argument(startup_profile.FLAG, metavar='FILE',
+                        help="write a JSON startup timing report to FILE and quit at the menu")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--players', type=int, default=2)
+    args = parser.parse_args()
+
+    # Networking modules are only imported by the modes that use them
+    if args.serve:
+        from net.server import serve_arena
+        serve_arena('0.0.0.0', args.port, args.players, stats=args.net_stats)
+        return
+    if args.p2p_host or args.p2p_join:
+        from net.rollback import run_p2p
+        run_p2p(args.p2p_join, args.port)
+        return
+    if args.arena:
+        import multiprocessing
+        from net.server import serve_arena
+        from net.client import run_client
+        # Loopback match: server and bot opponent in their own processes
+        ctx = multiprocessing.get_context('spawn')
+        server = ctx.Process(target=serve_arena, args=('127.0.0.1', args.port, 2), daemon=True)
+        server.start()
+        opponent = ctx.Process(target=run_client, args=('127.0.0.1', args.port, 'bot', 'greedy', True),
+                               daemon=True)
+        opponent.start()
+        args.connect = '127.0.0.1'
+    if args.connect:
+        from net.client import run_client
+        run_client(args.connect, args.port)
+        return
+
+    game = Game(record_dir=args.record_replays, save_path=args.save_file)
+    if args.replay:
+        game.run_replay(args.replay)
+    else:
+        game.run()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main() 
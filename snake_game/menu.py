@@ -2,6 +2,75 @@ import pygame
 import random
 import math
 from sprites.snake import Snake
+import surface_pool
+from startup_profile import phase
+
+MENU_FPS = 60
+IDLE_AFTER_MS = 30000  # The menu stops animating after this long without input
+ATTRACT_INTERVAL_MS = 60000  # While idle, the demo snake plays again once every interval,
+ATTRACT_MS = 10000  # for this long,
+ATTRACT_FPS = 30  # at this frame rate
+IDLE_JOB_FPS = 10  # Rate background jobs still run at while nothing is drawn
+
+# Events that mean someone is at the menu; anything else (music, window
+# events) leaves it idle
+INPUT_EVENTS = (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.FINGERDOWN,
+                pygame.JOYBUTTONDOWN)
+HIDDEN_EVENTS = (pygame.WINDOWMINIMIZED, pygame.WINDOWHIDDEN, pygame.WINDOWFOCUSLOST)
+SHOWN_EVENTS = (pygame.WINDOWRESTORED, pygame.WINDOWSHOWN, pygame.WINDOWFOCUSGAINED,
+                pygame.WINDOWEXPOSED)
+
+
+class MenuPacer:
+    """Decides when the menu loop draws and how long it may sleep.
+
+    The menu animates at MENU_FPS while someone is using it. After
+    IDLE_AFTER_MS without input it keeps its last frame and only wakes for
+    events, apart from an ATTRACT_MS burst of animation at the end of every
+    ATTRACT_INTERVAL_MS. Nothing is drawn while the window is minimised or
+    unfocused.
+    """
+
+    def __init__(self):
+        self.last_input = pygame.time.get_ticks()
+        self.visible = True
+        self.dirty = True  # A frame is owed: the first one, after input, or once shown again
+
+    def handle_event(self, event):
+        if event.type in INPUT_EVENTS:
+            self.last_input = pygame.time.get_ticks()
+            self.dirty = True
+        elif event.type in HIDDEN_EVENTS:
+            self.visible = False
+        elif event.type in SHOWN_EVENTS:
+            self.visible = True
+            self.dirty = True
+
+    def fps(self, now):
+        """The frame rate to animate at, or None while the menu holds still."""
+        idle_ms = now - self.last_input
+        if idle_ms < IDLE_AFTER_MS:
+            return MENU_FPS
+        if (idle_ms - IDLE_AFTER_MS) % ATTRACT_INTERVAL_MS >= ATTRACT_INTERVAL_MS - ATTRACT_MS:
+            return ATTRACT_FPS
+        return None
+
+    def should_draw(self, now):
+        return self.visible and (self.dirty or self.fps(now) is not None)
+
+    def drew(self):
+        self.dirty = False
+
+    def sleep_ms(self, now, jobs_pending):
+        """How long the loop may wait for an event when it isn't animating."""
+        if jobs_pending:
+            return 1000 // IDLE_JOB_FPS
+        if not self.visible:
+            return 0  # Wait for as long as it takes an event to come
+        idle_ms = now - self.last_input
+        until_attract = ATTRACT_INTERVAL_MS - ATTRACT_MS - (idle_ms - IDLE_AFTER_MS) % ATTRACT_INTERVAL_MS
+        return max(1, until_attract)
+
 
 class MenuItem:
     def __init__(self, text, action, font, position, selected=False, alignment='center'):
@@ -33,9 +102,7 @@ class MenuItem:
         if self.selected:
             padding = 10
             bg_rect = self.rect.inflate(padding * 2, padding * 2)
-            bg_surface = pygame.Surface(bg_rect.size, pygame.SRCALPHA)
-            pygame.draw.rect(bg_surface, (255, 255, 255, 30), 
-                           bg_surface.get_rect(), border_radius=5)
+            bg_surface = surface_pool.panel(bg_rect.size, (255, 255, 255), 30, border_radius=5)
             surface.blit(bg_surface, bg_rect)
         
         surface.blit(self.surface, self.rect)
@@ -49,19 +116,22 @@ class Menu:
         self.title_color = (0, 255, 0)  # Base green color
         
         # Create larger font for title
-        try:
-            self.title_font = pygame.font.Font("assets/PressStart2P-Regular.ttf", 32)
-        except:
-            self.title_font = pygame.font.SysFont(None, 64)
+        with phase('Menu font'):
+            try:
+                self.title_font = pygame.font.Font("assets/PressStart2P-Regular.ttf", 32)
+            except:
+                self.title_font = pygame.font.SysFont(None, 64)
         
         self.title_text = "SNAKE GAME"
-        self.title_surface = self._create_gradient_title()
+        with phase('Menu._create_gradient_title'):
+            self.title_surface = self._create_gradient_title()
         self.title_rect = self.title_surface.get_rect(
             center=(game.width // 2, game.height // 4)
         )
         
         # Create demo snake for animation
-        self.demo_snake = Snake(0, game.height // 2)
+        with phase('Menu demo snake'):
+            self.demo_snake = Snake(0, game.height // 2)
         self.demo_snake.is_powered_up = True
         self.demo_snake.length = 10  # Set initial length
         for _ in range(self.demo_snake.length):
@@ -231,9 +301,7 @@ class Menu:
             menu_height
         )
         
-        menu_bg = pygame.Surface((menu_width, menu_height), pygame.SRCALPHA)
-        pygame.draw.rect(menu_bg, (0, 0, 0, 160), menu_bg.get_rect(), 
-                        border_radius=15)
+        menu_bg = surface_pool.panel((menu_width, menu_height), (0, 0, 0), 160, border_radius=15)
         surface.blit(menu_bg, menu_rect)
         
         # Draw menu items
@@ -241,19 +309,23 @@ class Menu:
             if item.selected:
                 padding = 10
                 highlight_rect = item.rect.inflate(padding * 2, padding * 2)
-                highlight_surface = pygame.Surface(highlight_rect.size, pygame.SRCALPHA)
-                pygame.draw.rect(highlight_surface, (255, 255, 255, 30), 
-                               highlight_surface.get_rect(), border_radius=5)
+                highlight_surface = surface_pool.panel(highlight_rect.size, (255, 255, 255), 30,
+                                                       border_radius=5)
                 surface.blit(highlight_surface, highlight_rect)
             item.draw(surface)
 
 class MainMenu(Menu):
     def __init__(self, game):
         super().__init__(game)
+        if game.has_saved_game():
+            self.add_item("Continue", self.continue_game)
         self.add_item("Start Game", self.start_game)
         self.add_item("Level Select", self.level_select)
         self.add_item("Quit", self.quit_game)
     
+    def continue_game(self):
+        return "continue"
+    
     def start_game(self):
         return "start_game"
     
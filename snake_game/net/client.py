@@ -0,0 +1,270 @@
+"""
+Arena client.
+
+NetClient talks to an ArenaServer: it sends inputs, rebuilds full
+snapshots from the deltas it receives and acknowledges each one so the
+server can delta against it. ArenaView copies a snapshot onto a local,
+never-simulated level so the normal drawing code renders it.
+"""
+
+import random
+import selectors
+import socket
+import time
+import pygame
+from game import Game
+from sprites.enemy_snake import EnemySnake
+from sprites.food import Food
+from replay.actions import KEY_TO_ACTION
+from replay.state import RandomStream
+from net.protocol import (
+    MSG_HELLO, MSG_WELCOME, MSG_INPUT, MSG_ACK, MSG_SNAPSHOT, MSG_END,
+    MessageReader, encode_message, apply_delta, number_obstacles,
+)
+
+SNAPSHOT_HISTORY = 32
+OPPONENT_THEMES = ('fire', 'water', 'earth')
+
+
+class NetClient:
+    def __init__(self, host, port, name='player', connect_timeout=10.0):
+        self.sock = self._connect(host, port, connect_timeout)
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.sock, selectors.EVENT_READ)
+        self.reader = MessageReader()
+        self.welcome = None
+        self.snapshots = {}  # tick -> full snapshot, kept as delta bases
+        self.latest = None
+        self.latest_tick = -1
+        self.ended = False
+        self.winner = None
+        self.send(MSG_HELLO, {'name': name})
+
+    @staticmethod
+    def _connect(host, port, timeout):
+        # The server may still be starting (e.g. a loopback match)
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return socket.create_connection((host, port))
+            except ConnectionRefusedError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.1)
+
+    @property
+    def player_id(self):
+        return self.welcome['player_id'] if self.welcome else None
+
+    def send(self, msg_type, payload):
+        try:
+            self.sock.sendall(encode_message(msg_type, payload))
+        except OSError:
+            self.ended = True
+
+    def send_actions(self, actions):
+        if actions:
+            self.send(MSG_INPUT, {'actions': list(actions)})
+
+    def wait_for_welcome(self):
+        while self.welcome is None and not self.ended:
+            self.poll(timeout=1.0)
+        return self.welcome
+
+    def poll(self, timeout=0):
+        """Handle incoming messages. Returns True if a new snapshot arrived."""
+        got_snapshot = False
+        while self.selector.select(timeout):
+            timeout = 0
+            try:
+                data = self.sock.recv(65536)
+            except OSError:
+                data = b''
+            if not data:
+                self.ended = True
+                break
+            for msg_type, payload in self.reader.feed(data):
+                if msg_type == MSG_WELCOME:
+                    self.welcome = payload
+                elif msg_type == MSG_SNAPSHOT:
+                    got_snapshot |= self._on_snapshot(payload)
+                elif msg_type == MSG_END:
+                    self.ended = True
+                    self.winner = payload.get('winner')
+        return got_snapshot
+
+    def _on_snapshot(self, payload):
+        tick = payload['tick']
+        base = None
+        if payload['base'] >= 0:
+            base = self.snapshots.get(payload['base'])
+            if base is None:
+                return False  # We no longer hold that base; wait for the next one
+        snap = apply_delta(base, payload['set'], payload['del'])
+        self.snapshots[tick] = snap
+        for old in [t for t in self.snapshots if t <= tick - SNAPSHOT_HISTORY]:
+            del self.snapshots[old]
+        if tick > self.latest_tick:
+            self.latest, self.latest_tick = snap, tick
+        self.send(MSG_ACK, {'tick': tick})
+        return True
+
+    def close(self):
+        self.selector.close()
+        self.sock.close()
+
+
+def snapshot_observation(snap, pid):
+    """A sim.env-style observation for bots playing over the network."""
+    x, y, dx, dy, length, powered = snap[f's{pid}'][:6]
+    food = []
+    i = 0
+    while f'f{i}' in snap:
+        food.append(tuple(snap[f'f{i}'][:2]))
+        i += 1
+    enemies = [(s[0], s[1], len(snap[f'b{key[1:]}']))
+               for key, s in snap.items() if key[0] == 's' and key != f's{pid}']
+    return {
+        'head': (x, y),
+        'direction': (dx, dy),
+        'body': [tuple(segment) for segment in snap[f'b{pid}']],
+        'powered_up': powered,
+        'food': food,
+        'enemies': enemies,
+        'boss': None,
+    }
+
+
+def _apply_snake(snake, fields, body, projectiles):
+    (snake.x, snake.y, snake.dx, snake.dy, snake.length,
+     snake.is_powered_up, snake.is_dead, snake.is_flashing) = fields
+    snake.body = [list(segment) for segment in body]
+    snake.projectiles = [{'x': x, 'y': y, 'dx': dx, 'dy': dy, 'lifetime': 60}
+                         for x, y, dx, dy in projectiles]
+
+
+class ArenaView:
+    """Mirrors snapshots onto a local copy of the arena level for drawing."""
+
+    def __init__(self, game, welcome):
+        self.game = game
+        self.player_id = welcome['player_id']
+        with RandomStream(welcome['seed']):
+            game.load_level(welcome['level_idx'], seed=welcome['seed'])
+            level = game.current_level
+            level.start_gameplay()
+        number_obstacles(level)
+        level.enemy_snakes = []
+        game.snake.enable_idle_animation = False
+        self.opponents = {}
+        for i, pid in enumerate(p for p in welcome['players'] if p != self.player_id):
+            opponent = EnemySnake(0, 0, game)
+            opponent.set_theme(OPPONENT_THEMES[i % len(OPPONENT_THEMES)])
+            self.opponents[pid] = opponent
+        self.enemies = []  # Server-side AI snakes, if the match has any
+
+    def apply(self, snap):
+        game = self.game
+        level = game.current_level
+        level.food_count, level.defeated_snakes, level.boss_health = snap['lvl']
+
+        critters = level.level_data.get('critters', [])
+        level.food = []
+        i = 0
+        while f'f{i}' in snap:
+            x, y, kind = snap[f'f{i}']
+            level.food.append(Food(x, y, critters[kind], level.block_size))
+            i += 1
+
+        # Obstacles missing from the snapshot were destroyed on the server
+        level.obstacles = [obstacle for obstacle in level.obstacles if f'o{obstacle.net_id}' in snap]
+        for obstacle in level.obstacles:
+            obstacle.x, obstacle.y, _ = snap[f'o{obstacle.net_id}']
+
+        for key, fields in snap.items():
+            if key[0] != 's':
+                continue
+            pid = int(key[1:])
+            snake = game.snake if pid == self.player_id else self.opponents.get(pid)
+            if snake is not None:
+                _apply_snake(snake, fields, snap[f'b{pid}'], snap[f'p{pid}'])
+
+        i = 0
+        while f'e{i}' in snap:
+            if i >= len(self.enemies):
+                self.enemies.append(EnemySnake(0, 0, game))
+            _apply_snake(self.enemies[i], snap[f'e{i}'], snap[f'c{i}'], snap[f'q{i}'])
+            i += 1
+        del self.enemies[i:]
+        level.enemy_snakes = list(self.opponents.values()) + self.enemies
+
+        if level.boss and 'boss' in snap:
+            boss = level.boss
+            boss.x, boss.y, boss.angle, boss.turret_angle, _ = snap['boss']
+            boss.projectiles = [{'x': x, 'y': y, 'dx': dx, 'dy': dy, 'lifetime': 60}
+                                for x, y, dx, dy in snap['bp']]
+
+    def draw(self):
+        game = self.game
+        with game.render_random:
+            game.current_level.draw(game.window)
+            label = f"Player {self.player_id + 1}"
+            if game.snake.is_powered_up:
+                label += " - POWERED UP"
+            game.window.blit(game.font.render(label, True, (255, 255, 255)), (10, 10))
+
+
+def run_client(host, port, name='player', bot=None, headless=False):
+    """Join an arena match and play it; returns the winner's player id.
+
+    A `bot` name (see sim.bots) plays instead of the keyboard.
+    """
+    client = NetClient(host, port, name)
+    welcome = client.wait_for_welcome()
+    if welcome is None:
+        client.close()
+        return None
+    game = Game(headless=headless)
+    view = ArenaView(game, welcome)
+    if bot:
+        from sim.bots import get_bot
+        bot = get_bot(bot)
+    rng = random.Random()
+
+    quit_requested = False
+    while not client.ended and not quit_requested:
+        actions = []
+        if not headless:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    quit_requested = True
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        quit_requested = True
+                    elif event.key in KEY_TO_ACTION and not bot:
+                        actions.append(KEY_TO_ACTION[event.key])
+        client.send_actions(actions)
+
+        if client.poll(timeout=0 if not headless else 0.05):
+            view.apply(client.latest)
+            if bot:
+                action = bot(snapshot_observation(client.latest, client.player_id), rng)
+                if isinstance(action, int):
+                    action = [action] if action else []
+                client.send_actions(action)
+        if not headless:
+            view.draw()
+            pygame.display.update()
+            game.clock.tick(60)
+
+    if not headless and client.ended:
+        if client.winner == client.player_id:
+            game.show_message("YOU WIN!", (255, 255, 0))
+        elif client.winner is None:
+            game.show_message("DRAW", (255, 255, 255))
+        else:
+            game.show_message("YOU LOSE", (255, 80, 80))
+        pygame.display.update()
+        pygame.time.wait(2000)
+    client.close()
+    return client.winner
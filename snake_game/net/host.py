@@ -0,0 +1,394 @@
+"""
+Asyncio host for many headless game sessions in one process.
+
+Each HostedSession owns a headless Game and its own RNG stream and runs as
+a coroutine ticking at its own rate. A tick never awaits, so while it runs
+the global `random` module belongs to that session alone; the Game itself
+is built inside the session's stream too, so its star field and level
+layout depend only on the session seed.
+
+Clients connect over TCP with the net.protocol framing. HELLO picks the
+session and the role: {"name", "session", "spectate"}. Players take the
+session's open seats in order; spectators only receive snapshots. A
+session starts once its seats are filled, straight away when every seat is
+a bot. Snapshots are sent as deltas against the last one each client
+acknowledged, as ArenaServer does.
+
+LocalClient is an asyncio stand-in client for tests and load runs.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from sim.bots import get_bot
+from sim.env import SnakeEnv
+from replay.actions import SNAKE_KEYS
+from net.server import ArenaMatch
+from net.client import snapshot_observation
+from net.protocol import (
+    DEFAULT_PORT, MSG_HELLO, MSG_WELCOME, MSG_INPUT, MSG_ACK, MSG_SNAPSHOT, MSG_END,
+    MessageReader, encode_message, build_snapshot, diff_snapshots, apply_delta,
+    number_obstacles,
+)
+
+SNAPSHOT_HISTORY = 32
+MAX_WRITE_BUFFER = 1 << 20  # Clients further behind than this are dropped
+
+
+class SoloMatch:
+    """One snake on a campaign level, driven like an ArenaMatch."""
+
+    def __init__(self, seed=None, level_idx=0, max_steps=5000):
+        self.env = SnakeEnv(max_steps=max_steps)
+        self.env.reset(seed, level_idx)
+        self.game = self.env.game
+        self.random = self.env.random
+        self.level_idx = level_idx
+        self.snakes = {0: self.game.snake}
+        number_obstacles(self.game.current_level)
+        self.pending = []
+        self.tick_count = 0
+        self.over = False
+        self.winner = None
+        self.outcome = None
+
+    def queue_actions(self, pid, actions):
+        if pid == 0:
+            self.pending.extend(a for a in actions if a in SNAKE_KEYS)
+
+    def tick(self):
+        if self.over:
+            return
+        _, _, done, info = self.env.step(self.pending)
+        self.pending = []
+        self.tick_count += 1
+        if done:
+            self.over = True
+            self.outcome = info['outcome'] or 'timeout'
+            self.winner = 0 if info['outcome'] == 'complete' else None
+
+    def snapshot(self):
+        return build_snapshot(self.game.current_level, self.snakes)
+
+
+class _Subscriber:
+    def __init__(self, writer, pid):
+        self.writer = writer
+        self.pid = pid  # None for spectators
+        self.acked_tick = -1
+        self.welcomed = False
+        self.connected = True
+
+
+class HostedSession:
+    """One match inside a SessionHost.
+
+    `bots` maps player ids to sim.bots names; the other seats are for
+    remote players. `tick_rate` is in ticks per second (None: as fast as
+    the host allows).
+    """
+
+    def __init__(self, session_id, seed, players=2, bots=None, level_idx=None,
+                 tick_rate=None, max_ticks=None):
+        self.session_id = session_id
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.max_ticks = max_ticks
+        if players == 1:
+            self.match = SoloMatch(seed, level_idx or 0)
+        else:
+            self.match = ArenaMatch(list(range(players)), seed=seed, level_idx=level_idx)
+        self.bots = {pid: get_bot(name) for pid, name in (bots or {}).items()}
+        self.bot_random = random.Random(seed)
+        self.open_seats = [pid for pid in range(players) if pid not in self.bots]
+        self.subscribers = []
+        self.history = {}  # tick -> snapshot
+        self.ready = asyncio.Event()
+        if not self.open_seats:
+            self.ready.set()
+        self.started = False
+        self.finished = False
+        self.wall_time = 0.0
+
+    def join(self, writer, spectate):
+        """Add a connection; returns its _Subscriber, or None if no seat is free."""
+        if spectate:
+            pid = None
+        elif self.open_seats and not self.started:
+            pid = self.open_seats.pop(0)
+        else:
+            return None
+        subscriber = _Subscriber(writer, pid)
+        self.subscribers.append(subscriber)
+        if not self.open_seats:
+            self.ready.set()
+        if self.started:
+            self._welcome(subscriber)
+        return subscriber
+
+    def leave(self, subscriber):
+        subscriber.connected = False
+        if subscriber in self.subscribers:
+            self.subscribers.remove(subscriber)
+        snake = self.match.snakes.get(subscriber.pid)
+        if snake is not None and not snake.is_dead and not self.finished:
+            with self.match.random:
+                snake.die()  # A player who leaves forfeits
+
+    def queue_input(self, subscriber, actions):
+        if subscriber.pid is not None:
+            self.match.queue_actions(subscriber.pid, actions)
+
+    async def run(self):
+        """Wait for the players, then tick until the match ends."""
+        await self.ready.wait()
+        self.started = True
+        for subscriber in self.subscribers:
+            self._welcome(subscriber)
+
+        match = self.match
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.tick_rate if self.tick_rate else 0
+        start = next_tick = loop.time()
+        while not match.over:
+            if self.max_ticks is not None and match.tick_count >= self.max_ticks:
+                break
+            snap = match.snapshot() if self.bots else None
+            for pid, bot in self.bots.items():
+                action = bot(snapshot_observation(snap, pid), self.bot_random)
+                match.queue_actions(pid, [action] if isinstance(action, int) else action)
+            match.tick()
+            if self.subscribers:
+                self._broadcast(match.tick_count, match.snapshot())
+            if interval:
+                next_tick += interval
+                await asyncio.sleep(max(0, next_tick - loop.time()))
+            else:
+                await asyncio.sleep(0)  # Let the other sessions tick
+
+        self.wall_time = loop.time() - start
+        self.finished = True
+        for subscriber in list(self.subscribers):
+            self._send(subscriber, MSG_END, {'winner': match.winner})
+        return match.winner
+
+    def _welcome(self, subscriber):
+        match = self.match
+        self._send(subscriber, MSG_WELCOME, {
+            'session': self.session_id,
+            'player_id': subscriber.pid,
+            'players': list(match.snakes),
+            'level_idx': match.level_idx,
+            'seed': self.seed,
+            'tick_ms': 1000 // self.tick_rate if self.tick_rate else 0,
+        })
+        subscriber.welcomed = True
+
+    def _broadcast(self, tick, snap):
+        self.history[tick] = snap
+        self.history.pop(tick - SNAPSHOT_HISTORY, None)
+        for subscriber in list(self.subscribers):
+            if not subscriber.welcomed:
+                continue
+            base = self.history.get(subscriber.acked_tick)
+            changed, removed = diff_snapshots(base, snap)
+            self._send(subscriber, MSG_SNAPSHOT, {
+                'tick': tick,
+                'base': subscriber.acked_tick if base is not None else -1,
+                'set': changed,
+                'del': removed,
+            })
+
+    def _send(self, subscriber, msg_type, payload):
+        writer = subscriber.writer
+        if writer.is_closing() or writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+            self.leave(subscriber)
+            writer.close()
+            return
+        writer.write(encode_message(msg_type, payload))
+
+
+class SessionHost:
+    """Runs HostedSessions as tasks on one event loop and serves their clients."""
+
+    def __init__(self, host='127.0.0.1', port=DEFAULT_PORT, seed=None):
+        self.host = host
+        self.port = port
+        self.sessions = {}
+        self.tasks = {}
+        self.server = None
+        self._seeds = random.Random(seed)
+
+    def add_session(self, seed=None, **session_kwargs):
+        """Create a session; see HostedSession for the options. Returns its id."""
+        session_id = len(self.sessions)
+        if seed is None:
+            seed = self._seeds.randrange(1, 2 ** 31)
+        session = HostedSession(session_id, seed, **session_kwargs)
+        self.sessions[session_id] = session
+        if self.server is not None:
+            self.tasks[session_id] = asyncio.create_task(session.run())
+        return session_id
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        for session_id, session in self.sessions.items():
+            if session_id not in self.tasks:
+                self.tasks[session_id] = asyncio.create_task(session.run())
+
+    async def wait(self):
+        """Wait for every session to finish; returns {session id: winner}."""
+        winners = await asyncio.gather(*self.tasks.values())
+        return dict(zip(self.tasks, winners))
+
+    async def close(self):
+        for task in self.tasks.values():
+            task.cancel()
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def _handle_client(self, reader, writer):
+        messages = MessageReader()
+        session = subscriber = None
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                for msg_type, payload in messages.feed(data):
+                    if subscriber is None:
+                        if msg_type != MSG_HELLO:
+                            continue
+                        session = self.sessions.get(payload.get('session', 0))
+                        if session is not None and not session.finished:
+                            subscriber = session.join(writer, payload.get('spectate', False))
+                        if subscriber is None:
+                            writer.write(encode_message(MSG_END, {'winner': None, 'error': 'no free seat'}))
+                            await writer.drain()
+                            return
+                    elif msg_type == MSG_INPUT:
+                        session.queue_input(subscriber, payload.get('actions', []))
+                    elif msg_type == MSG_ACK:
+                        subscriber.acked_tick = max(subscriber.acked_tick, payload.get('tick', -1))
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            if subscriber is not None:
+                session.leave(subscriber)
+            writer.close()
+
+
+class LocalClient:
+    """Asyncio stand-in client: joins a session and plays it with a bot or watches."""
+
+    def __init__(self, host, port, session=0, name='client', bot=None, spectate=False):
+        self.host = host
+        self.port = port
+        self.session = session
+        self.name = name
+        self.bot = get_bot(bot) if bot else None
+        self.spectate = spectate
+        self.random = random.Random()
+        self.welcome = None
+        self.latest = None
+        self.snapshots = {}
+        self.ticks = 0
+        self.bytes_received = 0
+        self.winner = None
+
+    async def run(self):
+        """Play or watch until the session ends; returns the winner's id."""
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        writer.write(encode_message(MSG_HELLO, {
+            'name': self.name, 'session': self.session, 'spectate': self.spectate,
+        }))
+        messages = MessageReader()
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    return self.winner
+                self.bytes_received += len(data)
+                for msg_type, payload in messages.feed(data):
+                    if msg_type == MSG_WELCOME:
+                        self.welcome = payload
+                    elif msg_type == MSG_SNAPSHOT:
+                        self._on_snapshot(writer, payload)
+                    elif msg_type == MSG_END:
+                        self.winner = payload.get('winner')
+                        return self.winner
+        finally:
+            writer.close()
+
+    def _on_snapshot(self, writer, payload):
+        tick = payload['tick']
+        base = None
+        if payload['base'] >= 0:
+            base = self.snapshots.get(payload['base'])
+            if base is None:
+                return
+        snap = apply_delta(base, payload['set'], payload['del'])
+        self.snapshots[tick] = snap
+        self.snapshots.pop(tick - SNAPSHOT_HISTORY, None)
+        self.latest = snap
+        self.ticks += 1
+        writer.write(encode_message(MSG_ACK, {'tick': tick}))
+        pid = self.welcome and self.welcome['player_id']
+        if self.bot and pid is not None:
+            action = self.bot(snapshot_observation(snap, pid), self.random)
+            actions = [action] if isinstance(action, int) else list(action)
+            if any(actions):
+                writer.write(encode_message(MSG_INPUT, {'actions': [a for a in actions if a]}))
+
+
+async def _run_load(args):
+    host = SessionHost('127.0.0.1', args.port, seed=args.seed)
+    remote = min(args.remote, args.players)
+    for _ in range(args.sessions):
+        bots = {pid: args.bot for pid in range(remote, args.players)}
+        host.add_session(players=args.players, bots=bots, level_idx=args.level,
+                         tick_rate=args.tick_rate, max_ticks=args.max_ticks)
+    start = time.perf_counter()
+    await host.start()
+    clients = []
+    for session_id in host.sessions:
+        clients += [LocalClient('127.0.0.1', host.port, session_id, bot=args.bot) for _ in range(remote)]
+        clients += [LocalClient('127.0.0.1', host.port, session_id, spectate=True)
+                    for _ in range(args.spectators)]
+    client_tasks = [asyncio.create_task(client.run()) for client in clients]
+    winners = await host.wait()
+    await asyncio.gather(*client_tasks, return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    await host.close()
+
+    ticks = sum(session.match.tick_count for session in host.sessions.values())
+    received = sum(client.bytes_received for client in clients)
+    print(f"{len(winners)} sessions, {len(clients)} clients: {ticks} ticks in {elapsed:.2f}s "
+          f"({ticks / elapsed:.0f} ticks/s), {received} bytes to clients")
+    for session_id, winner in winners.items():
+        session = host.sessions[session_id]
+        print(f"  session {session_id}: seed {session.seed}, {session.match.tick_count} ticks, winner {winner}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host many headless sessions in one process")
+    parser.add_argument('--sessions', type=int, default=16)
+    parser.add_argument('--players', type=int, default=2)
+    parser.add_argument('--remote', type=int, default=0,
+                        help="seats per session played by local stand-in clients")
+    parser.add_argument('--spectators', type=int, default=0, help="spectators per session")
+    parser.add_argument('--bot', default='greedy')
+    parser.add_argument('--level', type=int, default=None)
+    parser.add_argument('--tick-rate', type=float, default=None,
+                        help="ticks per second per session (default: unthrottled)")
+    parser.add_argument('--max-ticks', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--port', type=int, default=0)
+    asyncio.run(_run_load(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+"""
+Wire protocol and snapshot deltas for networked matches.
+
+Messages are framed as a type byte and a u32 payload length followed by a
+compact JSON payload:
+
+    HELLO     client -> server  {"name"}, plus {"session", "spectate"} for a SessionHost
+    WELCOME   server -> client  {"player_id", "players", "level_idx", "seed", "tick_ms"}
+    INPUT     client -> server  {"actions"}, applied on the server's next tick
+    ACK       client -> server  {"tick"}, the newest snapshot the client holds
+    SNAPSHOT  server -> client  {"tick", "base", "set", "del"}
+    END       server -> client  {"winner"}
+
+A snapshot is a flat dict of entity keys (see build_snapshot) to small
+lists. The server sends each client only the keys that changed since the
+last snapshot that client acknowledged ("base", -1 for a full snapshot).
+Snake bodies are sent as a shift of the acknowledged body plus the new
+segments, so a moving snake costs one segment per tick whatever its length.
+"""
+
+import json
+import struct
+
+DEFAULT_PORT = 5757
+
+MSG_HELLO = 1
+MSG_WELCOME = 2
+MSG_INPUT = 3
+MSG_ACK = 4
+MSG_SNAPSHOT = 5
+MSG_END = 6
+
+_FRAME = struct.Struct('<BI')
+
+BODY_PREFIXES = ('b', 'c')  # Player and enemy snake bodies
+MAX_BODY_SHIFT = 4          # Largest tail shift tried before sending a full body
+
+
+def encode_message(msg_type, payload):
+    data = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return _FRAME.pack(msg_type, len(data)) + data
+
+
+class MessageReader:
+    """Splits a byte stream back into (type, payload) messages."""
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def feed(self, data):
+        self.buffer.extend(data)
+        messages = []
+        while len(self.buffer) >= _FRAME.size:
+            msg_type, length = _FRAME.unpack_from(self.buffer, 0)
+            end = _FRAME.size + length
+            if len(self.buffer) < end:
+                break
+            messages.append((msg_type, json.loads(self.buffer[_FRAME.size:end])))
+            del self.buffer[:end]
+        return messages
+
+
+def _round(value):
+    return round(value, 1) if isinstance(value, float) else value
+
+
+def snake_fields(snake):
+    return [_round(snake.x), _round(snake.y), snake.dx, snake.dy, snake.length,
+            snake.is_powered_up, snake.is_dead, snake.is_flashing]
+
+
+def body_fields(snake):
+    return [[_round(x), _round(y)] for x, y in snake.body]
+
+
+def projectile_fields(projectiles):
+    return [[_round(p['x']), _round(p['y']), _round(p['dx']), _round(p['dy'])] for p in projectiles]
+
+
+def number_obstacles(level):
+    """Give each obstacle that has none a `net_id`, in list order.
+
+    Obstacles are keyed by it in snapshots, so destroying one doesn't shift
+    the keys of the rest. Both ends call this on the freshly loaded level so
+    their ids match.
+    """
+    next_id = getattr(level, 'next_obstacle_id', 0)
+    for obstacle in level.obstacles:
+        if getattr(obstacle, 'net_id', None) is None:
+            obstacle.net_id = next_id
+            next_id += 1
+    level.next_obstacle_id = next_id
+
+
+def build_snapshot(level, players):
+    """Encode the level and `players` ({player_id: Snake}) as a flat dict."""
+    number_obstacles(level)  # Obstacles spawned since the last snapshot
+    critters = level.level_data.get('critters', [])
+    snap = {'lvl': [level.food_count, level.defeated_snakes, level.boss_health]}
+    for i, food in enumerate(level.food):
+        kind = critters.index(food.critter_data) if food.critter_data in critters else 0
+        snap[f'f{i}'] = [food.x, food.y, kind]
+    for obstacle in level.obstacles:
+        snap[f'o{obstacle.net_id}'] = [_round(obstacle.x), _round(obstacle.y),
+                         getattr(obstacle, 'is_being_destroyed', False)]
+    for pid, snake in players.items():
+        snap[f's{pid}'] = snake_fields(snake)
+        snap[f'b{pid}'] = body_fields(snake)
+        snap[f'p{pid}'] = projectile_fields(snake.projectiles)
+    for i, enemy in enumerate(level.enemy_snakes):
+        snap[f'e{i}'] = snake_fields(enemy)
+        snap[f'c{i}'] = body_fields(enemy)
+        snap[f'q{i}'] = projectile_fields(enemy.projectiles)
+    boss = level.boss
+    if boss:
+        snap['boss'] = [_round(boss.x), _round(boss.y), _round(boss.angle),
+                        _round(boss.turret_angle), getattr(boss, 'is_dying', False)]
+        snap['bp'] = projectile_fields(boss.projectiles)
+    return snap
+
+
+def _body_delta(old, new):
+    """Describe `new` as `old` minus its first k segments plus new ones."""
+    for k in range(min(len(old), MAX_BODY_SHIFT) + 1):
+        kept = len(old) - k
+        if new[:kept] == old[k:]:
+            added = new[kept:]
+            if len(added) < len(new):
+                return {'k': k, 'a': added}
+            return None
+    return None
+
+
+def diff_snapshots(base, snap):
+    """Return (changed, removed) turning `base` (or nothing) into `snap`."""
+    base = base or {}
+    changed = {}
+    for key, value in snap.items():
+        old = base.get(key)
+        if old == value:
+            continue
+        if old is not None and key.startswith(BODY_PREFIXES):
+            value = _body_delta(old, value) or value
+        changed[key] = value
+    removed = [key for key in base if key not in snap]
+    return changed, removed
+
+
+def apply_delta(base, changed, removed):
+    """Rebuild a full snapshot from a base snapshot and a delta."""
+    snap = dict(base or {})
+    for key in removed:
+        snap.pop(key, None)
+    for key, value in changed.items():
+        if isinstance(value, dict):
+            value = snap[key][value['k']:] + value['a']
+        snap[key] = value
+    return snap
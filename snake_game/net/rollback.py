@@ -0,0 +1,331 @@
+"""
+Peer-to-peer lockstep with rollback for two-player arena matches.
+
+Both peers run the same ArenaMatch from the same seed and exchange only
+inputs. Local inputs are scheduled a couple of ticks ahead (input delay);
+when the remote input for a tick hasn't arrived the simulation predicts
+"no new input", which is usually right because snakes keep moving the way
+they face. When a remote input turns out different from the prediction the
+session restores the snapshot taken at the start of that tick and
+re-simulates up to the present, so late packets never stall play unless
+the peer falls more than MAX_ROLLBACK ticks behind.
+
+Packets are UDP datagrams of compact JSON. Each one repeats the recent
+local inputs the peer hasn't acknowledged, so a lost packet is covered by
+the next one.
+"""
+
+import json
+import random
+import socket
+import time
+import zlib
+import pygame
+from game import Game
+from replay.actions import KEY_TO_ACTION
+from net.server import ArenaMatch
+from net.client import snapshot_observation
+from net.protocol import DEFAULT_PORT
+
+INPUT_DELAY = 2       # Ticks between reading a key and simulating it
+MAX_ROLLBACK = 8      # Ticks we run ahead of the peer's confirmed inputs
+CHECK_INTERVAL = 30   # Ticks between desync checksums
+HANDSHAKE_TIMEOUT = 30.0
+
+
+class RollbackSession:
+    """Input bookkeeping, prediction and rollback for one peer; no networking."""
+
+    def __init__(self, match, local_pid, remote_pid, input_delay=INPUT_DELAY,
+                 max_rollback=MAX_ROLLBACK):
+        self.match = match
+        self.local_pid = local_pid
+        self.remote_pid = remote_pid
+        self.input_delay = input_delay
+        self.max_rollback = max_rollback
+        self.tick = 0  # Next tick to simulate
+        # Nobody can send input for the first input_delay ticks
+        self.local_inputs = {t: () for t in range(input_delay)}
+        self.remote_inputs = {t: () for t in range(input_delay)}
+        self.confirmed_remote = input_delay - 1  # Remote inputs known up to here
+        self.remote_acked = input_delay - 1      # Local inputs the peer has
+        self.used_remote = {}   # tick -> remote actions the simulation assumed
+        self.snapshots = {}     # tick -> match.save() from the start of that tick
+        self.rollback_from = None
+        self.local_sums = {}
+        self.remote_sums = {}
+        self.desync_tick = None
+        self.rollbacks = 0
+        self.resimulated = 0
+
+    def add_local_input(self, actions):
+        """Schedule local actions, at most once per tick before advance().
+
+        Returns the tick they apply to.
+        """
+        tick = self.tick + self.input_delay
+        self.local_inputs[tick] = tuple(actions)
+        return tick
+
+    def add_remote_input(self, tick, actions):
+        if tick <= self.confirmed_remote or tick in self.remote_inputs:
+            return  # Repeated in a later packet
+        actions = tuple(actions)
+        self.remote_inputs[tick] = actions
+        while self.confirmed_remote + 1 in self.remote_inputs:
+            self.confirmed_remote += 1
+        if tick < self.tick and self.used_remote.get(tick) != actions:
+            self.rollback_from = tick if self.rollback_from is None else min(self.rollback_from, tick)
+
+    def ack_local_inputs(self, tick):
+        """The peer has all our inputs up to `tick`."""
+        self.remote_acked = max(self.remote_acked, tick)
+
+    def add_remote_checksum(self, tick, checksum):
+        self.remote_sums[tick] = checksum
+        self._compare_checksums()
+
+    @property
+    def stalled(self):
+        return self.tick - self.confirmed_remote > self.max_rollback
+
+    def advance(self):
+        """Simulate the next tick, rolling back first if a prediction missed.
+
+        Returns False when waiting for the peer, or when the match is over;
+        a late remote input can still roll back into it and reopen it.
+        """
+        if self.rollback_from is not None:
+            self._rollback()
+        if self.match.over:
+            return False  # Wait for the inputs up to the final tick to be confirmed
+        if self.stalled:
+            return False
+        # A tick without local input still needs an (empty) entry to send
+        self.local_inputs.setdefault(self.tick + self.input_delay, ())
+        self._simulate(self.tick)
+        self.tick += 1
+        self._prune()
+        return True
+
+    def _simulate(self, tick):
+        self.snapshots[tick] = self.match.save()
+        remote = self.remote_inputs.get(tick, ())  # Predict no new input
+        self.used_remote[tick] = remote
+        self.match.queue_actions(self.local_pid, self.local_inputs.get(tick, ()))
+        self.match.queue_actions(self.remote_pid, remote)
+        self.match.tick()
+
+    def _rollback(self):
+        start, self.rollback_from = self.rollback_from, None
+        self.match.load(self.snapshots[start])
+        with self.match.game.sfx.muted():  # These ticks already played their sounds
+            for tick in range(start, self.tick):
+                if self.match.over:
+                    # The corrected inputs end the match sooner; forget the ticks after
+                    self.tick = tick
+                    for t in [t for t in self.snapshots if t >= tick]:
+                        del self.snapshots[t]
+                        self.used_remote.pop(t, None)
+                    break
+                self._simulate(tick)
+        self.rollbacks += 1
+        self.resimulated += self.tick - start
+
+    def _prune(self):
+        # Snapshots at or before the confirmed tick can never be rolled back to
+        for tick in [t for t in self.snapshots if t <= self.confirmed_remote]:
+            data = self.snapshots.pop(tick)
+            if tick % CHECK_INTERVAL == 0:
+                self.local_sums[tick] = zlib.crc32(data)
+            self.used_remote.pop(tick, None)
+            self.remote_inputs.pop(tick, None)
+        # Local inputs are also kept until the peer has acknowledged them
+        done = min(self.confirmed_remote, self.remote_acked, self.tick - 1)
+        for tick in [t for t in self.local_inputs if t <= done]:
+            del self.local_inputs[tick]
+        self._compare_checksums()
+
+    def _compare_checksums(self):
+        for tick in [t for t in self.remote_sums if t in self.local_sums]:
+            if self.remote_sums.pop(tick) != self.local_sums[tick] and self.desync_tick is None:
+                self.desync_tick = tick
+                print(f"Warning: netplay desync detected at tick {tick}")
+
+    @property
+    def settled(self):
+        """True when every simulated tick used confirmed remote inputs."""
+        return self.confirmed_remote >= self.tick - 1 and self.rollback_from is None
+
+
+class RollbackPeer:
+    """UDP transport for a RollbackSession."""
+
+    def __init__(self, sock, remote_addr, session, welcome=None):
+        self.sock = sock
+        self.remote_addr = remote_addr
+        self.session = session
+        self.welcome = welcome  # Resent if the joiner missed it
+        self.sent_sums = set()
+        self.last_heard = time.monotonic()
+        sock.setblocking(False)
+
+    def send(self):
+        session = self.session
+        inputs = [[t, list(session.local_inputs[t])]
+                  for t in sorted(session.local_inputs) if t > session.remote_acked]
+        sums = [[t, s] for t, s in session.local_sums.items() if t not in self.sent_sums]
+        self.sent_sums.update(t for t, _ in sums)
+        packet = {'i': inputs, 'a': session.confirmed_remote, 's': sums}
+        try:
+            self.sock.sendto(json.dumps(packet, separators=(',', ':')).encode('utf-8'),
+                             self.remote_addr)
+        except OSError:
+            pass
+
+    def poll(self):
+        while True:
+            try:
+                data, addr = self.sock.recvfrom(65536)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return  # e.g. ICMP port unreachable while the peer restarts
+            if addr != self.remote_addr:
+                continue
+            packet = json.loads(data)
+            if 'hello' in packet:
+                if self.welcome:
+                    self.sock.sendto(self.welcome, addr)
+                continue
+            self.last_heard = time.monotonic()
+            self.session.ack_local_inputs(packet.get('a', -1))
+            for tick, actions in packet.get('i', []):
+                self.session.add_remote_input(tick, actions)
+            for tick, checksum in packet.get('s', []):
+                self.session.add_remote_checksum(tick, checksum)
+
+
+def host_match(port=DEFAULT_PORT, seed=None, timeout=HANDSHAKE_TIMEOUT):
+    """Wait for a peer.
+
+    Returns (socket, peer address, seed, local player id, welcome datagram).
+    """
+    seed = random.randrange(1, 2 ** 31) if seed is None else seed
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(('0.0.0.0', port))
+    sock.settimeout(timeout)
+    while True:
+        data, addr = sock.recvfrom(65536)
+        if 'hello' in json.loads(data):
+            welcome = json.dumps({'welcome': True, 'seed': seed}).encode('utf-8')
+            sock.sendto(welcome, addr)
+            return sock, addr, seed, 0, welcome
+
+
+def join_match(host, port=DEFAULT_PORT, timeout=HANDSHAKE_TIMEOUT):
+    """Say hello until the host answers; returns the same tuple as host_match."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    addr = (socket.gethostbyname(host), port)
+    sock.settimeout(0.2)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        sock.sendto(b'{"hello":true}', addr)
+        try:
+            data, sender = sock.recvfrom(65536)
+        except (socket.timeout, ConnectionRefusedError):
+            continue
+        packet = json.loads(data)
+        if sender == addr and packet.get('welcome'):
+            return sock, addr, packet['seed'], 1, None
+    raise TimeoutError(f"No answer from {host}:{port}")
+
+
+def run_p2p(host=None, port=DEFAULT_PORT, seed=None, bot=None, headless=False, max_ticks=None):
+    """Play a two-player rollback match; host when `host` is None, else join.
+
+    Returns (winner, session).
+    """
+    if host is None:
+        sock, addr, seed, local_pid, welcome = host_match(port, seed)
+    else:
+        sock, addr, seed, local_pid, welcome = join_match(host, port)
+    remote_pid = 1 - local_pid
+
+    game = Game(headless=headless)
+    match = ArenaMatch([0, 1], seed=seed, game=game)
+    session = RollbackSession(match, local_pid, remote_pid)
+    peer = RollbackPeer(sock, addr, session, welcome)
+    if bot:
+        from sim.bots import get_bot
+        bot = get_bot(bot)
+    rng = random.Random(seed + local_pid)
+
+    tick_seconds = (1000 // game.snake_speed) / 1000
+    next_tick = time.perf_counter()
+    keys = []
+    quit_requested = False
+    try:
+        while not quit_requested:
+            peer.poll()
+            if not headless:
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        quit_requested = True
+                    elif event.type == pygame.KEYDOWN:
+                        if event.key == pygame.K_ESCAPE:
+                            quit_requested = True
+                        elif event.key in KEY_TO_ACTION and not bot:
+                            keys.append(KEY_TO_ACTION[event.key])
+
+            if time.perf_counter() >= next_tick:
+                if not session.stalled:
+                    if bot:
+                        action = bot(snapshot_observation(match.snapshot(), local_pid), rng)
+                        keys = [action] if isinstance(action, int) and action else list(action or [])
+                    session.add_local_input(keys)
+                    keys = []
+                    next_tick += tick_seconds
+                else:
+                    next_tick = time.perf_counter() + tick_seconds / 4  # Wait for the peer
+                peer.send()
+                session.advance()
+
+            if match.over and session.settled:
+                break  # Both peers stop at the same final tick
+            if max_ticks is not None and session.tick >= max_ticks and session.settled:
+                break
+            if time.monotonic() - peer.last_heard > HANDSHAKE_TIMEOUT:
+                print("Warning: netplay peer stopped responding")
+                break
+
+            if not headless:
+                _draw_match(game, match)
+                pygame.display.update()
+                game.clock.tick(60)
+            else:
+                time.sleep(0.001)
+
+        # Let the peer confirm our last inputs
+        for _ in range(5):
+            peer.send()
+            time.sleep(tick_seconds / 2)
+    finally:
+        sock.close()
+
+    if not headless and match.over:
+        if match.winner == local_pid:
+            game.show_message("YOU WIN!", (255, 255, 0))
+        else:
+            game.show_message("YOU LOSE" if match.winner is not None else "DRAW", (255, 80, 80))
+        pygame.display.update()
+        pygame.time.wait(2000)
+    return match.winner, session
+
+
+def _draw_match(game, match):
+    with game.render_random:
+        game.current_level.draw(game.window)
+        for snake in match.snakes.values():
+            if snake is not game.snake:
+                snake.draw(game.window)
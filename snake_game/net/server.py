@@ -0,0 +1,357 @@
+"""
+Authoritative arena server.
+
+ArenaMatch runs the simulation for several player snakes in one level at
+the game's fixed tick. The level code is written around a single
+`game.snake`, so each player's snake is seated as `game.snake` while its
+inputs, movement and collisions are processed; head-to-head hits reuse the
+level's player-vs-enemy checks with one player seated and the other as the
+enemy.
+
+ArenaServer accepts players over TCP, applies their inputs each tick and
+sends each of them a snapshot delta against the last snapshot they
+acknowledged (see net.protocol). Sends never block the tick loop: each
+peer has an outgoing buffer that is flushed as its socket accepts data, and
+a peer whose buffer grows past MAX_OUTBOX is dropped (and forfeits).
+"""
+
+import selectors
+import socket
+import time
+from game import Game
+from levels.config import LEVELS
+from sprites.snake import Snake
+from replay.actions import SNAKE_KEYS
+from replay.state import RandomStream, dump_state, load_state
+from net.protocol import (
+    DEFAULT_PORT, MSG_HELLO, MSG_WELCOME, MSG_INPUT, MSG_ACK, MSG_SNAPSHOT, MSG_END,
+    MessageReader, encode_message, build_snapshot, diff_snapshots, number_obstacles,
+)
+
+SNAPSHOT_HISTORY = 32  # Snapshots kept as possible delta bases
+MATCH_FIELDS = ('snakes', 'alive', 'pending', 'tick_count', 'over', 'winner')
+MAX_OUTBOX = 1 << 20  # Bytes queued for one peer before it is dropped as too slow
+DRAIN_SECONDS = 1.0   # How long the server waits for queued bytes to go out at the end
+
+
+def arena_level_index():
+    """The sky level (full sky, not space) is the head-to-head arena."""
+    for idx, level_data in enumerate(LEVELS):
+        if level_data.get('full_sky', False) and not level_data.get('is_space', False):
+            return idx
+    return 0
+
+
+class ArenaMatch:
+    """Simulation of one match; no networking."""
+
+    def __init__(self, player_ids, seed=None, level_idx=None, enemies=False, game=None):
+        self.random = RandomStream(seed)
+        if game is None:
+            with self.random:
+                game = Game(headless=True)
+        self.game = game
+        self.seed = seed
+        self.level_idx = arena_level_index() if level_idx is None else level_idx
+        self.tick_count = 0
+        self.winner = None
+        self.over = False
+
+        game = self.game
+        with self.random:
+            game.load_level(self.level_idx)
+            level = game.current_level
+            level.start_gameplay()
+            number_obstacles(level)  # Before the first tick can destroy any
+            if not enemies:
+                level.enemy_snakes = []  # Players only fight each other
+
+            # Spread the players across the arena, facing the middle
+            self.snakes = {}
+            bs = level.block_size
+            y = (level.play_area['top'] + level.play_area['bottom']) // 2
+            for i, pid in enumerate(player_ids):
+                snake = game.snake if i == 0 else Snake(0, 0, game)
+                x = game.width * (i + 1) // (len(player_ids) + 1)
+                snake.reset(x, y)
+                snake.dx = bs if x < game.width // 2 else -bs
+                snake.is_angry = True
+                snake.enable_idle_animation = False
+                self.snakes[pid] = snake
+        self.main_snake = game.snake
+        self.alive = set(self.snakes)
+        self.pending = {pid: [] for pid in self.snakes}
+
+    def queue_actions(self, pid, actions):
+        """Queue a player's actions for the next tick (snake controls only)."""
+        if pid in self.pending:
+            self.pending[pid].extend(a for a in actions if a in SNAKE_KEYS)
+
+    def tick(self):
+        """Advance the match by one tick."""
+        if self.over:
+            return
+        game = self.game
+        level = game.current_level
+        with self.random:
+            try:
+                for pid, snake in self.snakes.items():
+                    game.snake = snake
+                    if pid in self.alive:
+                        for action in self.pending[pid]:
+                            game.apply_action(action)
+                    self.pending[pid] = []
+
+                # Level, food and power-ups run with the first player seated;
+                # the other players' projectiles and power-ups are updated after
+                game.snake = self.main_snake
+                game.update_game_state()
+                for snake in self.snakes.values():
+                    if snake is not self.main_snake:
+                        game.snake = snake
+                        level.update_snake_projectiles(snake)
+                        snake.update_power_up()
+
+                for pid, snake in self.snakes.items():
+                    if pid not in self.alive:
+                        continue
+                    game.snake = snake
+                    if not level.check_collision(snake) and level.check_food_collision(snake):
+                        snake.grow()
+
+                # Head-to-head: each pair once, first player seated
+                alive = [self.snakes[pid] for pid in self.snakes if pid in self.alive]
+                for i, snake in enumerate(alive):
+                    game.snake = snake
+                    for other in alive[i + 1:]:
+                        if snake.is_powered_up or other.is_powered_up:
+                            level._check_snake_collision(other)
+                        level._check_projectile_collisions(other)
+            finally:
+                game.snake = self.main_snake
+
+        self.alive = {pid for pid in self.alive if not self.snakes[pid].is_dead}
+        self.tick_count += 1
+        if len(self.alive) <= 1:
+            self.over = True
+            self.winner = next(iter(self.alive), None)
+
+    def snapshot(self):
+        return build_snapshot(self.game.current_level, self.snakes)
+
+    def save(self):
+        """Uncompressed snapshot of the whole match, cheap enough for rollback."""
+        fields = {name: getattr(self, name) for name in MATCH_FIELDS}
+        with self.random:
+            return dump_state(self.game, compress=False, extra=fields)
+
+    def load(self, data):
+        """Restore a snapshot taken by save()."""
+        with self.random:
+            fields = load_state(self.game, data, compressed=False)
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+
+class _Peer:
+    def __init__(self, sock, pid):
+        self.sock = sock
+        self.pid = pid
+        self.name = None
+        self.reader = MessageReader()
+        self.acked_tick = -1
+        self.connected = True
+        self.outbox = bytearray()  # Encoded messages the socket hasn't taken yet
+        self.events = selectors.EVENT_READ
+
+
+class ArenaServer:
+    """Hosts one head-to-head match for `players` clients.
+
+    With `stats`, full_bytes also counts what sending every snapshot in
+    full would have cost (encoding it each tick, so only for measuring).
+    """
+
+    def __init__(self, host='127.0.0.1', port=DEFAULT_PORT, players=2, seed=None, stats=False):
+        self.host = host
+        self.port = port
+        self.player_count = players
+        self.seed = seed
+        self.stats = stats
+        self.match = None
+        self.peers = []
+        self.history = {}  # tick -> snapshot
+        self.bytes_sent = 0
+        self.full_bytes = 0
+        self.selector = selectors.DefaultSelector()
+        self.listener = socket.create_server((host, port))
+        self.port = self.listener.getsockname()[1]
+
+    def serve(self):
+        """Wait for the players, run the match and return the winner's id."""
+        try:
+            self._wait_for_players()
+            match = self.match = ArenaMatch([peer.pid for peer in self.peers], seed=self.seed)
+            welcome = {
+                'players': [peer.pid for peer in self.peers],
+                'level_idx': match.level_idx,
+                'seed': match.game.level_seed,
+                'tick_ms': 1000 // match.game.snake_speed,
+            }
+            for peer in self.peers:
+                self._send(peer, MSG_WELCOME, dict(welcome, player_id=peer.pid))
+            self._run_match(match)
+            for peer in self.peers:
+                self._send(peer, MSG_END, {'winner': match.winner})
+            self._drain()
+            return match.winner
+        finally:
+            self.close()
+
+    def close(self):
+        for peer in self.peers:
+            peer.sock.close()
+        self.listener.close()
+        self.selector.close()
+
+    def _wait_for_players(self):
+        while len(self.peers) < self.player_count:
+            sock, _ = self.listener.accept()
+            peer = _Peer(sock, len(self.peers))
+            while peer.name is None:
+                try:
+                    data = sock.recv(4096)
+                except OSError:
+                    data = b''
+                if not data:
+                    break
+                for msg_type, payload in peer.reader.feed(data):
+                    if msg_type == MSG_HELLO:
+                        peer.name = payload.get('name', f'player{peer.pid}')
+            if peer.name is None:
+                # Left before saying hello; its seat goes to the next client
+                print("Warning: A client disconnected before saying hello")
+                sock.close()
+                continue
+            self.peers.append(peer)
+        for peer in self.peers:
+            peer.sock.setblocking(False)
+            self.selector.register(peer.sock, peer.events, peer)
+
+    def _run_match(self, match):
+        tick_seconds = (1000 // match.game.snake_speed) / 1000
+        next_tick = time.perf_counter()
+        while not match.over and any(peer.connected for peer in self.peers):
+            self._read_inputs(match)
+            match.tick()
+            self._broadcast(match.tick_count, match.snapshot())
+            next_tick += tick_seconds
+            # Keep reading inputs until the next tick is due
+            while True:
+                remaining = next_tick - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._read_inputs(match, timeout=remaining)
+
+    def _drain(self):
+        """Give the peers' queued bytes (the END messages) a moment to go out."""
+        deadline = time.perf_counter() + DRAIN_SECONDS
+        while any(peer.connected and peer.outbox for peer in self.peers):
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            self._read_inputs(self.match, timeout=remaining)
+
+    def _read_inputs(self, match, timeout=0):
+        for key, events in self.selector.select(timeout):
+            peer = key.data
+            if not peer.connected:
+                continue  # Dropped earlier in this batch
+            if events & selectors.EVENT_WRITE:
+                self._flush(peer)
+            if not peer.connected or not events & selectors.EVENT_READ:
+                continue
+            try:
+                data = peer.sock.recv(65536)
+            except BlockingIOError:
+                continue
+            except OSError:
+                data = b''
+            if not data:
+                self._disconnect(peer)
+                continue
+            for msg_type, payload in peer.reader.feed(data):
+                if msg_type == MSG_INPUT:
+                    match.queue_actions(peer.pid, payload.get('actions', []))
+                elif msg_type == MSG_ACK:
+                    peer.acked_tick = max(peer.acked_tick, payload.get('tick', -1))
+
+    def _disconnect(self, peer):
+        if not peer.connected:
+            return
+        peer.connected = False
+        peer.outbox.clear()
+        self.selector.unregister(peer.sock)
+        # A player who leaves, or can't be reached, forfeits
+        match = self.match
+        if match is not None and not match.over and peer.pid in match.alive:
+            match.snakes[peer.pid].die()
+
+    def _broadcast(self, tick, snap):
+        self.history[tick] = snap
+        self.history.pop(tick - SNAPSHOT_HISTORY, None)
+        full_size = None
+        for peer in self.peers:
+            if not peer.connected:
+                continue
+            base = self.history.get(peer.acked_tick)
+            changed, removed = diff_snapshots(base, snap)
+            self._send(peer, MSG_SNAPSHOT, {
+                'tick': tick,
+                'base': peer.acked_tick if base is not None else -1,
+                'set': changed,
+                'del': removed,
+            })
+            if self.stats:
+                if full_size is None:
+                    full_size = len(encode_message(MSG_SNAPSHOT, {'tick': tick, 'base': -1, 'set': snap, 'del': []}))
+                self.full_bytes += full_size
+
+    def _send(self, peer, msg_type, payload):
+        """Queue a message for a peer and send as much as its socket takes now."""
+        if not peer.connected:
+            return
+        peer.outbox += encode_message(msg_type, payload)
+        if len(peer.outbox) > MAX_OUTBOX:
+            print(f"Warning: Dropping {peer.name}, who is not keeping up")
+            self._disconnect(peer)
+            return
+        self._flush(peer)
+
+    def _flush(self, peer):
+        try:
+            sent = peer.sock.send(peer.outbox)
+        except BlockingIOError:
+            sent = 0
+        except OSError:
+            self._disconnect(peer)
+            return
+        self.bytes_sent += sent
+        del peer.outbox[:sent]
+        # Only ask to hear about writability while something is queued
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if peer.outbox else 0)
+        if events != peer.events:
+            peer.events = events
+            self.selector.modify(peer.sock, events, peer)
+
+
+def serve_arena(host='127.0.0.1', port=DEFAULT_PORT, players=2, seed=None, stats=False):
+    """Run one match and print the result (used as a process target)."""
+    server = ArenaServer(host, port, players, seed, stats=stats)
+    print(f"Arena server waiting for {players} players on {server.host}:{server.port}")
+    winner = server.serve()
+    print(f"Match over, winner: {winner}. Sent {server.bytes_sent} bytes")
+    if stats:
+        saved = 100 * (1 - server.bytes_sent / max(1, server.full_bytes))
+        print(f"That is {saved:.0f}% less than full snapshots")
+    return winner
@@ -0,0 +1,30 @@
+"""
+Gameplay actions.
+
+Every key press that changes the simulation is turned into a small integer
+action before it is applied, so the same code path serves live play, replay
+recording and headless playback.
+"""
+
+import pygame
+
+ACTION_LEFT = 1
+ACTION_RIGHT = 2
+ACTION_UP = 3
+ACTION_DOWN = 4
+ACTION_SPIT = 5
+ACTION_SKIP_CUTSCENE = 6
+ACTION_ADVANCE_CUTSCENE = 7
+ACTION_RETRY = 8
+ACTION_DEV_POWER_UP = 9
+ACTION_DEV_KILL_BOSS = 10
+
+# Keys consumed by Snake.handle_key, and the action each one maps to
+SNAKE_KEYS = {
+    ACTION_LEFT: pygame.K_LEFT,
+    ACTION_RIGHT: pygame.K_RIGHT,
+    ACTION_UP: pygame.K_UP,
+    ACTION_DOWN: pygame.K_DOWN,
+    ACTION_SPIT: pygame.K_SPACE,
+}
+KEY_TO_ACTION = {key: action for action, key in SNAKE_KEYS.items()}
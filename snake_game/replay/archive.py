@@ -0,0 +1,205 @@
+"""
+Append-only archive of many replays.
+
+Layout (little endian):
+    header   ARCHIVE_MAGIC, version, 3 padding bytes
+    entries  complete replay files (see replay.replay_file), back to back
+    index    one _INDEX_ENTRY per replay
+    footer   index offset, entry count, FOOTER_MAGIC
+
+Appending writes the new replays and a fresh index + footer after the end
+of the file; nothing already written is touched. The last footer in the
+file is the live one, so when an interrupted append leaves a torn tail,
+readers scan back to the previous footer and every replay it indexes.
+
+Readers memory-map the file, so iterating the ticks of thousands of runs
+only touches the pages actually read.
+"""
+
+import mmap
+import os
+import struct
+from collections import namedtuple
+from replay.replay_file import (
+    ReplayReader, read_header, iter_records, decode_inputs,
+    TAG_INPUTS, TAG_KEYFRAME, TAG_END,
+)
+from replay.state import read_state
+
+ARCHIVE_MAGIC = b'SNKA'
+FOOTER_MAGIC = b'SNKX'
+ARCHIVE_VERSION = 1
+
+_ARCHIVE_HEADER = struct.Struct('<4sB3x')
+_INDEX_ENTRY = struct.Struct('<QQ?QIB15s')  # offset, length, has seed, seed, ticks, level, outcome
+_FOOTER = struct.Struct('<QI4s')
+
+ArchiveEntry = namedtuple(
+    'ArchiveEntry', ['offset', 'length', 'seed', 'ticks', 'level_idx', 'outcome'])
+
+
+def _describe_replay(data):
+    """Return (seed, ticks, level_idx, outcome) for a replay buffer."""
+    header, pos = read_header(data)
+    ticks = 0
+    outcome = None
+    for tag, tick, payload in iter_records(data, pos):
+        if tag == TAG_END:
+            ticks = tick
+            outcome = bytes(payload).decode('utf-8') or None
+        elif tag == TAG_INPUTS:
+            ticks = max(ticks, tick + len(decode_inputs(payload)))
+    return header['seed'], ticks, header['level_idx'], outcome
+
+
+class ReplayArchive:
+    """Read-only, memory-mapped view of an archive."""
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.map)
+        self.entries = _read_index(self.map)
+
+    def close(self):
+        try:
+            self.view.release()
+            self.map.close()
+        except BufferError:
+            pass  # Slices handed out are still alive; the map closes with them
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def replay_buffer(self, entry):
+        """Zero-copy view of one replay's bytes."""
+        return self.view[entry.offset:entry.offset + entry.length]
+
+    def reader(self, entry):
+        """A ReplayReader for one entry (playable with ReplayPlayer)."""
+        return ReplayReader.from_buffer(self.replay_buffer(entry))
+
+    def iter_ticks(self, entry):
+        """Yield (tick, actions) for every recorded tick of an entry."""
+        data = self.replay_buffer(entry)
+        _, pos = read_header(data)
+        for tag, start, payload in iter_records(data, pos):
+            if tag == TAG_INPUTS:
+                for i, actions in enumerate(decode_inputs(payload)):
+                    yield start + i, actions
+
+    def iter_keyframes(self, entry, game=None):
+        """Yield (tick, state dict) for an entry's keyframes.
+
+        States hold the pickled Snake, BaseLevel fields and EnemySnake
+        objects; without a `game` their game references are None.
+        """
+        data = self.replay_buffer(entry)
+        _, pos = read_header(data)
+        for tag, tick, payload in iter_records(data, pos):
+            if tag == TAG_KEYFRAME:
+                yield tick, read_state(payload, game)
+
+
+def _find_footer(buf):
+    """Position of the last complete footer, scanning back past a torn append; None if none."""
+    end = len(buf)
+    while True:
+        pos = buf.rfind(FOOTER_MAGIC, _ARCHIVE_HEADER.size, end)
+        if pos < 0:
+            return None
+        footer = pos + 4 - _FOOTER.size
+        if footer >= _ARCHIVE_HEADER.size:
+            index_offset, count, _ = _FOOTER.unpack_from(buf, footer)
+            # A real footer sits right after its index
+            if index_offset + count * _INDEX_ENTRY.size == footer:
+                return footer
+        end = pos + 3  # Magic bytes inside replay data; keep looking further back
+
+
+def _read_index(buf):
+    """Entries of the last complete index in `buf` (an mmap or bytes)."""
+    magic, version = _ARCHIVE_HEADER.unpack_from(buf, 0)
+    if magic != ARCHIVE_MAGIC or version != ARCHIVE_VERSION:
+        raise ValueError("Not a replay archive (or an unsupported version)")
+    if len(buf) == _ARCHIVE_HEADER.size:
+        return []
+    footer = _find_footer(buf)
+    if footer is None:
+        raise ValueError("Replay archive has no valid footer")
+    if footer + _FOOTER.size != len(buf):
+        print(f"Warning: Replay archive has {len(buf) - footer - _FOOTER.size} bytes "
+              "after its last footer (an interrupted append); they are ignored")
+    index_offset, count, _ = _FOOTER.unpack_from(buf, footer)
+    entries = []
+    for i in range(count):
+        offset, length, has_seed, seed, ticks, level_idx, outcome = _INDEX_ENTRY.unpack_from(
+            buf, index_offset + i * _INDEX_ENTRY.size)
+        outcome = bytes(outcome).rstrip(b'\0').decode('utf-8') or None
+        entries.append(ArchiveEntry(offset, length, seed if has_seed else None, ticks, level_idx, outcome))
+    return entries
+
+
+def append_replays(archive_path, replays):
+    """Append replays (paths or bytes) to an archive, creating it if needed.
+
+    Returns the new index entries.
+    """
+    entries = []
+    if os.path.exists(archive_path) and os.path.getsize(archive_path) > 0:
+        with ReplayArchive(archive_path) as archive:
+            entries = list(archive.entries)
+        mode = 'r+b'
+    else:
+        mode = 'wb'
+
+    added = []
+    with open(archive_path, mode) as f:
+        if mode == 'wb':
+            f.write(_ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION))
+        f.seek(0, os.SEEK_END)
+        for replay in replays:
+            if isinstance(replay, (bytes, bytearray)):
+                data = bytes(replay)
+            else:
+                with open(replay, 'rb') as rf:
+                    data = rf.read()
+            seed, ticks, level_idx, outcome = _describe_replay(data)
+            entry = ArchiveEntry(f.tell(), len(data), seed, ticks, level_idx, outcome)
+            f.write(data)
+            added.append(entry)
+
+        index_offset = f.tell()
+        for entry in entries + added:
+            outcome = (entry.outcome or '').encode('utf-8')[:15]
+            f.write(_INDEX_ENTRY.pack(entry.offset, entry.length, entry.seed is not None,
+                                      entry.seed or 0, entry.ticks, entry.level_idx, outcome))
+        f.write(_FOOTER.pack(index_offset, len(entries) + len(added), FOOTER_MAGIC))
+    return added
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pack or list replay archives")
+    parser.add_argument('archive')
+    parser.add_argument('replays', nargs='*', help="replay files to append")
+    args = parser.parse_args()
+
+    if args.replays:
+        append_replays(args.archive, args.replays)
+    with ReplayArchive(args.archive) as archive:
+        for entry in archive:
+            print(f"level={entry.level_idx} seed={entry.seed} ticks={entry.ticks} "
+                  f"outcome={entry.outcome} offset={entry.offset}")
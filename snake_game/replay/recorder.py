@@ -0,0 +1,53 @@
+import os
+import time
+import zlib
+from replay.replay_file import ReplayWriter
+from replay.state import dump_state
+
+# Ticks between state keyframes (5 seconds at the default snake speed)
+DEFAULT_KEYFRAME_INTERVAL = 70
+
+
+class ReplayRecorder:
+    """Records one run_game session: inputs every tick, state every N ticks."""
+
+    def __init__(self, game, path, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL, seed=None):
+        self.game = game
+        self.path = path
+        self.tick = 0
+        self.actions = []
+        self.outcome = None
+        self.writer = ReplayWriter(
+            path,
+            game.current_level_idx,
+            game.current_level.current_time,
+            keyframe_interval,
+            seed,
+        )
+        retry_state = game.retry_state
+        if retry_state is not None and retry_state[0] == game.current_level_idx:
+            self.writer.write_retry_state(zlib.compress(retry_state[1]))
+
+    @classmethod
+    def for_directory(cls, game, directory):
+        """Create a recorder writing a timestamped file into `directory`."""
+        os.makedirs(directory, exist_ok=True)
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        name = f"{stamp}_level{game.current_level_idx}.snkr"
+        return cls(game, os.path.join(directory, name), seed=game.level_seed)
+
+    def start_tick(self):
+        """Call before any input of the tick is applied."""
+        if self.tick % self.writer.keyframe_interval == 0:
+            self.writer.write_keyframe(self.tick, dump_state(self.game))
+        self.actions = []
+
+    def record_action(self, action):
+        self.actions.append(action)
+
+    def end_tick(self):
+        self.writer.add_tick(self.actions)
+        self.tick += 1
+
+    def close(self, outcome=None):
+        self.writer.close(outcome)
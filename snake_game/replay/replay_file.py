@@ -0,0 +1,173 @@
+"""
+Compact binary replay files.
+
+Layout (little endian):
+    header   MAGIC, version, level index, keyframe interval, seed flag and
+             seed (the flag is 0 when the run wasn't seeded), time of day
+    records  tag (1 byte), tick (u32), payload length (u32), payload
+
+Record tags:
+    K  state keyframe taken at the start of `tick` (see replay.state)
+    I  inputs for consecutive ticks starting at `tick`; each tick is a count
+       byte followed by that many action codes, so idle ticks cost one byte
+    R  the zlib-compressed state a retry restores (Game.retry_state), written
+       once before the first keyframe so keyframes needn't carry it
+    E  end of recording; `tick` is the total tick count, payload the outcome
+
+Records are appended as the game runs, so a recording cut short by a crash
+is still readable up to its last complete record.
+"""
+
+import struct
+
+MAGIC = b'SNKR'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sBBH')
+_SEED = struct.Struct('<?Q')  # Has seed, seed
+_RECORD = struct.Struct('<cII')
+
+TAG_KEYFRAME = b'K'
+TAG_INPUTS = b'I'
+TAG_END = b'E'
+TAG_RETRY = b'R'
+
+
+def encode_inputs(ticks):
+    """Encode a list of per-tick action lists."""
+    out = bytearray()
+    for actions in ticks:
+        actions = actions[:255]
+        out.append(len(actions))
+        out.extend(actions)
+    return bytes(out)
+
+
+def decode_inputs(data):
+    """Inverse of encode_inputs."""
+    ticks = []
+    pos = 0
+    while pos < len(data):
+        count = data[pos]
+        ticks.append(tuple(data[pos + 1:pos + 1 + count]))
+        pos += 1 + count
+    return ticks
+
+
+def read_header(buf):
+    """Parse a replay header. Returns (fields dict, offset of first record)."""
+    magic, version, level_idx, keyframe_interval = _HEADER.unpack_from(buf, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a replay file (or an unsupported version)")
+    has_seed, seed = _SEED.unpack_from(buf, _HEADER.size)
+    seed = seed if has_seed else None
+    pos = _HEADER.size + _SEED.size
+    time_len = buf[pos]
+    time_of_day = bytes(buf[pos + 1:pos + 1 + time_len]).decode('utf-8') or None
+    header = {
+        'level_idx': level_idx,
+        'keyframe_interval': keyframe_interval,
+        'seed': seed,
+        'time_of_day': time_of_day,
+    }
+    return header, pos + 1 + time_len
+
+
+def iter_records(buf, pos, end=None):
+    """Yield (tag, tick, payload) for each complete record in buf[pos:end].
+
+    Payloads are slices of `buf`, so a memoryview over an mmap is never
+    copied as a whole.
+    """
+    end = len(buf) if end is None else end
+    while pos + _RECORD.size <= end:
+        tag, tick, length = _RECORD.unpack_from(buf, pos)
+        pos += _RECORD.size
+        if pos + length > end:
+            return  # Truncated tail of an interrupted recording
+        yield tag, tick, buf[pos:pos + length]
+        pos += length
+
+
+class ReplayWriter:
+    def __init__(self, path, level_idx, time_of_day, keyframe_interval, seed=None):
+        self.file = open(path, 'wb')
+        self.keyframe_interval = keyframe_interval
+        self.pending_start = 0
+        self.pending = []
+        time_bytes = (time_of_day or '').encode('utf-8')
+        self.file.write(_HEADER.pack(MAGIC, VERSION, level_idx, keyframe_interval))
+        self.file.write(_SEED.pack(seed is not None, seed or 0))
+        self.file.write(bytes([len(time_bytes)]) + time_bytes)
+
+    def _write_record(self, tag, tick, payload):
+        self.file.write(_RECORD.pack(tag, tick, len(payload)))
+        self.file.write(payload)
+
+    def write_keyframe(self, tick, data):
+        self.flush_inputs()
+        self._write_record(TAG_KEYFRAME, tick, data)
+        self.file.flush()
+
+    def write_retry_state(self, data):
+        self._write_record(TAG_RETRY, self.pending_start, data)
+
+    def add_tick(self, actions):
+        self.pending.append(actions)
+
+    def flush_inputs(self):
+        if self.pending:
+            self._write_record(TAG_INPUTS, self.pending_start, encode_inputs(self.pending))
+            self.pending_start += len(self.pending)
+            self.pending = []
+
+    def close(self, outcome=None):
+        self.flush_inputs()
+        self._write_record(TAG_END, self.pending_start, (outcome or '').encode('utf-8'))
+        self.file.close()
+
+
+class ReplayReader:
+    """Parses a replay file into its inputs and keyframe blobs."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        self.parse(data)
+
+    @classmethod
+    def from_buffer(cls, data):
+        """Build a reader over bytes or a memoryview (e.g. an archive entry)."""
+        reader = cls.__new__(cls)
+        reader.parse(data)
+        return reader
+
+    def parse(self, data):
+        header, pos = read_header(data)
+        self.level_idx = header['level_idx']
+        self.keyframe_interval = header['keyframe_interval']
+        self.seed = header['seed']
+        self.time_of_day = header['time_of_day']
+
+        self.inputs = []
+        self.keyframes = {}  # tick -> compressed state
+        self.outcome = None
+        self.retry_state = None  # Compressed
+        for tag, tick, payload in iter_records(data, pos):
+            if tag == TAG_KEYFRAME:
+                self.keyframes[tick] = payload
+            elif tag == TAG_INPUTS:
+                del self.inputs[tick:]
+                self.inputs.extend(decode_inputs(payload))
+            elif tag == TAG_END:
+                self.outcome = bytes(payload).decode('utf-8') or None
+            elif tag == TAG_RETRY:
+                self.retry_state = payload
+
+    @property
+    def tick_count(self):
+        return len(self.inputs)
+
+    def keyframe_before(self, tick):
+        """Return the latest keyframe tick at or before `tick`."""
+        return max(t for t in self.keyframes if t <= tick)
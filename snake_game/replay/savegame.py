@@ -0,0 +1,132 @@
+"""
+Suspend/resume save files.
+
+A save file holds one dump_state blob (see replay.state), so everything a
+replay keyframe restores comes back: obstacles and their destruction
+timers, building windows, river drying, food, the snake, enemy snakes,
+the boss, the cutscene position and the RNG.
+
+Layout (little endian):
+    header   SAVE_MAGIC, version, level index, sim_ticks, saved-at time,
+             payload CRC32, payload length, level name, time of day
+    payload  zlib-compressed dump_state blob
+
+Files are written to a temporary name, synced and renamed over the old
+save, so losing power mid-write leaves the previous save intact.
+
+The payload is a pickle of the game's own objects, so SAVE_VERSION stands
+for their fields as much as for the header: bump it whenever a pickled
+class (levels, snakes, enemies, bosses, cutscenes) gains, loses or
+reinterprets an attribute, or replay.state changes what it captures. Saves
+of another version are then ignored instead of restored into objects that
+no longer match.
+
+Unpickling runs code named in the file, so a save file is trusted like the
+game's own code: only point --save-file at saves this game wrote, never
+at ones from elsewhere.
+"""
+
+import os
+import struct
+import time
+import zlib
+from levels.config import LEVELS
+from replay.state import dump_state, load_state
+
+SAVE_MAGIC = b'SNKS'
+SAVE_VERSION = 1
+AUTOSAVE_INTERVAL = 70  # Ticks between autosaves (5 seconds at the default speed)
+
+_HEADER = struct.Struct('<4sBBQdII')
+
+
+def _pack_text(text):
+    data = (text or '').encode('utf-8')[:255]
+    return bytes([len(data)]) + data
+
+
+def _unpack_text(buf, pos):
+    length = buf[pos]
+    return bytes(buf[pos + 1:pos + 1 + length]).decode('utf-8') or None, pos + 1 + length
+
+
+def encode_save(game):
+    """Serialise the running level to save-file bytes."""
+    payload = dump_state(game)
+    level = game.current_level
+    header = _HEADER.pack(SAVE_MAGIC, SAVE_VERSION, game.current_level_idx, game.sim_ticks,
+                          time.time(), zlib.crc32(payload), len(payload))
+    return (header + _pack_text(LEVELS[game.current_level_idx]['name']) +
+            _pack_text(level.current_time) + payload)
+
+
+def decode_header(buf):
+    """Parse a save header. Returns (fields dict, payload offset)."""
+    if len(buf) < _HEADER.size:
+        raise ValueError("Save file is truncated")
+    magic, version, level_idx, sim_ticks, saved_at, crc, length = _HEADER.unpack_from(buf, 0)
+    if magic != SAVE_MAGIC or version != SAVE_VERSION:
+        raise ValueError("Not a save file (or an unsupported version)")
+    level_name, pos = _unpack_text(buf, _HEADER.size)
+    time_of_day, pos = _unpack_text(buf, pos)
+    header = {
+        'level_idx': level_idx,
+        'level_name': level_name,
+        'time_of_day': time_of_day,
+        'sim_ticks': sim_ticks,
+        'saved_at': saved_at,
+        'crc': crc,
+        'length': length,
+    }
+    return header, pos
+
+
+def write_save_file(path, data):
+    """Atomically replace `path` with `data`."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_save_info(path):
+    """Header fields of the save at `path`, or None if there's no usable save."""
+    try:
+        with open(path, 'rb') as f:
+            header, _ = decode_header(f.read(_HEADER.size + 512))
+    except (OSError, ValueError, UnicodeDecodeError):
+        return None
+    if not _matches_config(header):
+        return None
+    return header
+
+
+def load_save(game, path):
+    """Restore the save at `path` into `game`. Returns its header fields.
+
+    Raises ValueError if the file is damaged or was made for other levels.
+    """
+    with open(path, 'rb') as f:
+        buf = f.read()
+    header, pos = decode_header(buf)
+    payload = buf[pos:pos + header['length']]
+    if len(payload) != header['length'] or zlib.crc32(payload) != header['crc']:
+        raise ValueError("Save file is damaged")
+    if not _matches_config(header):
+        raise ValueError("Save file was made for a different level set")
+    load_state(game, payload)
+    return header
+
+
+def delete_save(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _matches_config(header):
+    level_idx = header['level_idx']
+    return level_idx < len(LEVELS) and LEVELS[level_idx]['name'] == header['level_name']
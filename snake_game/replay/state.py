@@ -0,0 +1,165 @@
+"""
+Capture and restore the simulation state of a running level.
+
+A state covers the level (obstacles, food, enemy snakes, boss, cutscene),
+the player snake, the global RNG and the Game fields the simulation reads.
+References back to the Game and its player snake are pickled by name, so
+a state can be restored into any Game instance. The sky manager and the
+cached ground layer are cosmetic and are left alone.
+
+States are pickles, and loading one runs whatever code it names: replays
+and saves are only safe to load from trusted sources.
+"""
+
+import copyreg
+import io
+import pickle
+import random
+import zlib
+from array import array
+
+LEVEL_EXCLUDED = ('game', 'sky_manager', 'ground_cache')
+SNAKE_EXCLUDED = ('game',)
+GAME_FIELDS = ('game_close', 'sim_ticks', 'current_time_of_day', 'level_seed')
+
+
+def _game_ref():
+    # Stand-ins for the Game and its snake in a pickle; _StateUnpickler
+    # resolves them to the Game being restored into
+    raise pickle.UnpicklingError("Game references can only be loaded by _StateUnpickler")
+
+
+def _snake_ref():
+    raise pickle.UnpicklingError("Game references can only be loaded by _StateUnpickler")
+
+
+class _StatePickler(pickle.Pickler):
+    def __init__(self, file, game):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.game = game
+        # Per-type reducers cost nothing for other objects, unlike a
+        # persistent_id hook that runs for every object pickled
+        snake = game.snake
+        protocol = pickle.HIGHEST_PROTOCOL
+        self.dispatch_table = copyreg.dispatch_table.copy()
+        self.dispatch_table[type(game)] = (
+            lambda obj: (_game_ref, ()) if obj is game else obj.__reduce_ex__(protocol))
+        self.dispatch_table[type(snake)] = (
+            lambda obj: (_snake_ref, ()) if obj is snake else obj.__reduce_ex__(protocol))
+
+
+class _StateUnpickler(pickle.Unpickler):
+    def __init__(self, file, game):
+        super().__init__(file)
+        self.game = game
+
+    def find_class(self, module, name):
+        if module == __name__ and name == '_game_ref':
+            return lambda: self.game
+        if module == __name__ and name == '_snake_ref':
+            return lambda: getattr(self.game, 'snake', None)
+        return super().find_class(module, name)
+
+
+def capture_state(game, extra=None):
+    """Return a dict describing the current simulation state (not a copy).
+
+    `extra` is stored alongside for callers with state outside the level,
+    such as additional player snakes.
+    """
+    level = game.current_level
+    return {
+        'level_idx': game.current_level_idx,
+        'level': {k: v for k, v in vars(level).items() if k not in LEVEL_EXCLUDED},
+        'snake': {k: v for k, v in vars(game.snake).items() if k not in SNAKE_EXCLUDED},
+        'game': {name: getattr(game, name) for name in GAME_FIELDS},
+        'random': _pack_random(random.getstate()),
+        'extra': extra,
+    }
+
+
+def restore_state(game, state):
+    """Make the game's simulation match a captured state.
+
+    Returns the state's `extra` value.
+    """
+    game_fields = state['game']
+    level = game.current_level
+    if (level is None or game.current_level_idx != state['level_idx'] or
+            level.current_time != state['level']['current_time']):
+        # Install the captured level as is rather than generating one first
+        game.restore_level(state['level_idx'], dict(state['level']))
+    else:
+        _replace_vars(level, state['level'], LEVEL_EXCLUDED)
+    _replace_vars(game.snake, state['snake'], SNAKE_EXCLUDED)
+    for name, value in game_fields.items():
+        setattr(game, name, value)
+    random.setstate(_unpack_random(state['random']))
+    return state.get('extra')
+
+
+def _pack_random(rng_state):
+    # The Mersenne Twister state is 625 ints; as raw bytes it pickles in one
+    # step instead of one persistent_id call per int
+    version, internal, gauss = rng_state
+    return version, array('I', internal).tobytes(), gauss
+
+
+def _unpack_random(rng_state):
+    version, internal, gauss = rng_state
+    return version, tuple(array('I', internal)), gauss
+
+
+def _replace_vars(obj, values, excluded):
+    # Drop attributes the snapshot doesn't know about (e.g. lazily created lists)
+    kept = {k: v for k, v in vars(obj).items() if k in excluded}
+    vars(obj).clear()
+    vars(obj).update(kept)
+    vars(obj).update(values)
+
+
+def dump_state(game, compress=True, extra=None):
+    """Serialise the current simulation state to bytes."""
+    buffer = io.BytesIO()
+    _StatePickler(buffer, game).dump(capture_state(game, extra))
+    data = buffer.getvalue()
+    return zlib.compress(data, 1) if compress else data
+
+
+def read_state(data, game=None, compressed=True):
+    """Decode a dump_state blob into its state dict without applying it."""
+    if compressed:
+        data = zlib.decompress(data)
+    return _StateUnpickler(io.BytesIO(data), game).load()
+
+
+def load_state(game, data, compressed=True):
+    """Restore a state produced by dump_state. Returns its `extra` value."""
+    return restore_state(game, read_state(data, game, compressed))
+
+
+class RandomStream:
+    """A private stream for the global `random` module.
+
+    Inside `with stream:` the global RNG runs on this stream's state, and the
+    caller's state is put back afterwards. Drawing uses one so sparkles and
+    debris don't consume the simulation's random numbers; headless sessions
+    use one each so several games can share a process reproducibly.
+    """
+
+    def __init__(self, seed=None):
+        self._state = random.Random(seed).getstate()
+        self._outer_state = None
+
+    def seed(self, seed):
+        self._state = random.Random(seed).getstate()
+
+    def __enter__(self):
+        self._outer_state = random.getstate()
+        random.setstate(self._state)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._state = random.getstate()
+        random.setstate(self._outer_state)
+        return False
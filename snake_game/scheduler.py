@@ -0,0 +1,138 @@
+"""
+Cooperative background jobs for the main loop.
+
+A job is a generator that does a slice of work between yields. Each frame
+the main loop calls JobScheduler.run(), which steps the waiting jobs until
+the frame's time budget is spent, so long work (baking surfaces, parsing
+cutscenes) is spread over idle frames on the main thread instead of
+stalling one frame or touching pygame surfaces from another thread.
+
+A step that has started always runs to its next yield, so jobs should
+yield often enough that one step fits in the budget. A job waiting on
+something else (e.g. a worker thread) yields WAIT to sit out the rest of
+the frame instead of spinning.
+"""
+
+import heapq
+import itertools
+import time
+
+FRAME_BUDGET_MS = 4  # Time each frame may spend on background jobs
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+WAIT = 'wait'  # Yielded by a job with nothing to do until the next frame
+
+
+def in_stream(generator, rng):
+    """Wrap a job so each of its steps runs inside the RandomStream `rng`.
+
+    The stream is left between steps, so the main loop never runs on it.
+    """
+    while True:
+        with rng:
+            try:
+                value = next(generator)
+            except StopIteration as stop:
+                return stop.value
+        yield value
+
+
+class Job:
+    """Handle for a scheduled generator."""
+
+    def __init__(self, generator, priority, tag):
+        self.generator = generator
+        self.priority = priority
+        self.tag = tag
+        self.done = False
+        self.cancelled = False
+        self.result = None  # The generator's return value once done
+
+    @property
+    def pending(self):
+        return not (self.done or self.cancelled)
+
+    def step(self):
+        """Run the job to its next yield.
+
+        Returns the yielded value, or None once the job has finished.
+        """
+        try:
+            value = next(self.generator)
+            return True if value is None else value
+        except StopIteration as stop:
+            self.result = stop.value
+        except Exception as e:
+            print(f"Warning: background job failed: {e}")
+        self.done = True
+        return None
+
+    def cancel(self):
+        if self.pending:
+            self.cancelled = True
+            self.generator.close()
+
+
+class JobScheduler:
+    """Runs jobs in priority order (PRIORITY_HIGH first, then oldest first)."""
+
+    def __init__(self):
+        self._queue = []
+        self._order = itertools.count()
+
+    def add(self, generator, priority=PRIORITY_NORMAL, tag=None, rng=None):
+        """Schedule a generator; returns its Job.
+
+        Jobs can be cancelled together by `tag`. When `rng` is given every
+        step runs inside that RandomStream.
+        """
+        if rng is not None:
+            generator = in_stream(generator, rng)
+        job = Job(generator, priority, tag)
+        heapq.heappush(self._queue, (priority, next(self._order), job))
+        return job
+
+    def run(self, budget_ms=FRAME_BUDGET_MS):
+        """Step waiting jobs until `budget_ms` has passed or none are left."""
+        deadline = time.perf_counter() + budget_ms / 1000
+        waiting = []
+        while self._queue:
+            job = self._queue[0][2]
+            value = job.step() if job.pending else None
+            if value is None:
+                heapq.heappop(self._queue)
+            elif value == WAIT:
+                waiting.append(heapq.heappop(self._queue))
+            if time.perf_counter() >= deadline:
+                break
+        for entry in waiting:
+            heapq.heappush(self._queue, entry)
+
+    def finish(self, job):
+        """Run `job` to the end now and return its result (None if cancelled).
+
+        A job that yields WAIT is stepped again at once, so only finish jobs
+        whose waits end on their own.
+        """
+        while job.pending and job.step() is not None:
+            pass
+        return job.result
+
+    def cancel(self, tag):
+        """Cancel every waiting job with `tag`."""
+        for _, _, job in self._queue:
+            if job.tag == tag:
+                job.cancel()
+        self._queue = [entry for entry in self._queue if entry[2].pending]
+        heapq.heapify(self._queue)
+
+    def cancel_all(self):
+        for _, _, job in self._queue:
+            job.cancel()
+        self._queue = []
+
+    def __len__(self):
+        return sum(1 for _, _, job in self._queue if job.pending)
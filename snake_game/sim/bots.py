@@ -0,0 +1,66 @@
+"""
+Simple bots for headless runs.
+
+A bot is a function bot(obs, rng) -> action (or a list of actions) where
+`obs` comes from sim.env.vector_observation and `rng` is a random.Random
+owned by the caller, so bots never touch the simulation's RNG.
+"""
+
+from importlib import import_module
+from replay.actions import ACTION_LEFT, ACTION_RIGHT, ACTION_UP, ACTION_DOWN, ACTION_SPIT
+
+MOVES = {
+    ACTION_LEFT: (-1, 0),
+    ACTION_RIGHT: (1, 0),
+    ACTION_UP: (0, -1),
+    ACTION_DOWN: (0, 1),
+}
+
+
+def random_bot(obs, rng):
+    """Turns at random now and then, occasionally spitting."""
+    if rng.random() < 0.2:
+        return rng.choice([ACTION_LEFT, ACTION_RIGHT, ACTION_UP, ACTION_DOWN, ACTION_SPIT])
+    return 0
+
+
+def greedy_bot(obs, rng):
+    """Heads for the nearest food, never reversing into its own body."""
+    if not obs['food']:
+        return random_bot(obs, rng)
+    hx, hy = obs['head']
+    fx, fy = min(obs['food'], key=lambda f: abs(f[0] - hx) + abs(f[1] - hy))
+    dx, dy = obs['direction']
+    wanted = []
+    if fx != hx:
+        wanted.append(ACTION_RIGHT if fx > hx else ACTION_LEFT)
+    if fy != hy:
+        wanted.append(ACTION_DOWN if fy > hy else ACTION_UP)
+    for action in wanted:
+        mx, my = MOVES[action]
+        if (mx, my) == (-_sign(dx), -_sign(dy)) and len(obs['body']) > 1:
+            continue  # Would turn back on itself
+        if (mx, my) != (_sign(dx), _sign(dy)):
+            return action
+        return 0  # Already heading the right way
+    return 0
+
+
+def _sign(value):
+    return (value > 0) - (value < 0)
+
+
+BOTS = {
+    'random': random_bot,
+    'greedy': greedy_bot,
+}
+
+
+def get_bot(name):
+    """Look up a bot by name, or import one given as 'module:function'."""
+    if name in BOTS:
+        return BOTS[name]
+    module_name, _, func_name = name.partition(':')
+    if not func_name:
+        raise ValueError(f"Unknown bot '{name}' (expected one of {sorted(BOTS)} or module:function)")
+    return getattr(import_module(module_name), func_name)
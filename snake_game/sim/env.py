@@ -0,0 +1,165 @@
+"""
+Gym-style environments for training bots.
+
+SnakeEnv wraps a headless Game: reset() builds a level from a seed and
+step() runs exactly one game tick with no drawing. VectorSnakeEnv steps
+several independent games per call. Every environment keeps its own RNG
+stream, so an episode depends only on its seed and actions, not on what
+the other environments in the process are doing.
+
+Observations default to vector_observation; pass observe=GridObserver()
+(sim.grid) for a NumPy grid instead.
+"""
+
+from game import Game
+from levels.config import LEVELS
+from replay.actions import ACTION_SKIP_CUTSCENE
+from replay.state import RandomStream
+
+REWARD_WEIGHTS = {
+    'food': 1.0,       # Level food_count went up
+    'building': 1.0,   # A city building was destroyed
+    'snake': 5.0,      # An enemy sky snake was defeated
+    'complete': 10.0,  # Level finished
+    'death': -10.0,    # Player died
+}
+
+
+def vector_observation(game):
+    """Plain-Python summary of the state a bot needs to act on."""
+    level = game.current_level
+    snake = game.snake
+    boss = level.boss
+    return {
+        'head': (snake.x, snake.y),
+        'direction': (snake.dx, snake.dy),
+        'body': [tuple(segment) for segment in snake.body],
+        'powered_up': snake.is_powered_up,
+        'food': [(food.x, food.y) for food in level.food],
+        'enemies': [(enemy.x, enemy.y, len(enemy.body)) for enemy in level.enemy_snakes],
+        'boss': (boss.x, boss.y) if boss else None,
+        'play_area': (level.play_area['top'], level.play_area['bottom']),
+    }
+
+
+class SnakeEnv:
+    def __init__(self, max_steps=5000, reward_weights=None, observe=vector_observation):
+        self.random = RandomStream()
+        with self.random:
+            self.game = Game(headless=True)
+        self.max_steps = max_steps
+        self.reward_weights = dict(REWARD_WEIGHTS, **(reward_weights or {}))
+        self.observe = observe
+        self.steps = 0
+        self.done = True
+        self._progress = None
+
+    @property
+    def level_count(self):
+        return len(LEVELS)
+
+    def reset(self, seed=None, level=0):
+        """Start a new episode. Returns (observation, info)."""
+        self.random.seed(seed)
+        with self.random:
+            game = self.game
+            game.sim_ticks = 0
+            game.game_close = False
+            game.load_level(level)
+            # Bots skip intro cutscenes and start playing right away
+            if game.current_level.show_intro:
+                game.current_level.start_gameplay()
+        self.steps = 0
+        self.done = False
+        self._progress = self.read_progress()
+        return self.observe(self.game), {'seed': seed, 'level': level}
+
+    def step(self, actions=()):
+        """Run one tick. `actions` is an action code or a sequence of them.
+
+        Returns (observation, reward, done, info).
+        """
+        if self.done:
+            raise RuntimeError("step() called on a finished episode; call reset()")
+        if isinstance(actions, int):
+            actions = (actions,) if actions else ()
+        level = self.game.current_level
+        if level.current_cutscene:
+            # Ending cutscenes are skipped like intros
+            actions = (ACTION_SKIP_CUTSCENE,) + tuple(actions)
+
+        with self.random:
+            outcome = self.game.simulate_tick(actions)
+        self.steps += 1
+
+        progress = self.read_progress()
+        weights = self.reward_weights
+        reward = sum(weights[key] * (progress[key] - self._progress[key])
+                     for key in ('food', 'building', 'snake'))
+        self._progress = progress
+        if outcome == "complete":
+            reward += weights['complete']
+        elif outcome == "dead":
+            reward += weights['death']
+
+        truncated = self.steps >= self.max_steps
+        self.done = outcome is not None or truncated
+        info = {'outcome': outcome, 'truncated': truncated and outcome is None,
+                'steps': self.steps}
+        return self.observe(self.game), reward, self.done, info
+
+    def read_progress(self):
+        """The level's food, building and defeated-snake counters."""
+        level = self.game.current_level
+        return {
+            'food': level.food_count,
+            'building': level.buildings_destroyed,
+            'snake': level.defeated_snakes,
+        }
+
+
+class VectorSnakeEnv:
+    """N independent SnakeEnvs stepped together.
+
+    Finished environments are reset automatically (to the same level, with
+    the next seed) and report the final observation in info['final_observation'].
+    """
+
+    def __init__(self, num_envs, **env_kwargs):
+        self.envs = [SnakeEnv(**env_kwargs) for _ in range(num_envs)]
+        self.seeds = [None] * num_envs
+        self.levels = [0] * num_envs
+
+    def __len__(self):
+        return len(self.envs)
+
+    def reset(self, seeds=None, levels=0):
+        """Reset every environment. `seeds`/`levels` may be lists or scalars."""
+        count = len(self.envs)
+        if seeds is None or isinstance(seeds, int):
+            seeds = [None if seeds is None else seeds + i for i in range(count)]
+        if isinstance(levels, int):
+            levels = [levels] * count
+        self.seeds = list(seeds)
+        self.levels = list(levels)
+        results = [env.reset(seed, level) for env, seed, level in zip(self.envs, seeds, levels)]
+        return [obs for obs, _ in results], [info for _, info in results]
+
+    def step(self, actions):
+        """Step every environment with its own actions.
+
+        Returns lists (observations, rewards, dones, infos).
+        """
+        observations, rewards, dones, infos = [], [], [], []
+        for i, (env, env_actions) in enumerate(zip(self.envs, actions)):
+            obs, reward, done, info = env.step(env_actions)
+            if done:
+                info['final_observation'] = obs
+                if self.seeds[i] is not None:
+                    self.seeds[i] += len(self.envs)
+                obs, _ = env.reset(self.seeds[i], self.levels[i])
+            observations.append(obs)
+            rewards.append(reward)
+            dones.append(done)
+            infos.append(info)
+        return observations, rewards, dones, infos
@@ -0,0 +1,135 @@
+"""
+Grid observations built straight from level state, without drawing.
+
+The level is encoded as a (channels, rows, cols) uint8 array at block_size
+resolution. Each cell holds how many objects of that channel cover it, so
+overlapping obstacles or body segments add up and `grid > 0` gives plain
+occupancy.
+
+Every tick the observer recomputes which cell rectangles each channel
+covers, walking every obstacle's hitbox and no-spawn rects and every body
+segment, so that work grows with the number of objects. It then compares
+the result with the previous tick and writes to the array only the
+rectangles that appeared or went away: a moving snake costs two cell
+writes per tick and unchanged obstacles none. Obstacle cells aren't
+cached, because hitboxes change with state (destruction, drying rivers,
+orbits) that the observer can't see.
+"""
+
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:  # Only needed for grid observations
+    np = None
+
+CHANNELS = ('obstacles', 'no_spawn', 'snake', 'enemies', 'food', 'projectiles', 'boss')
+CHANNEL_INDEX = {name: i for i, name in enumerate(CHANNELS)}
+
+
+def _as_rects(hitbox):
+    """get_hitbox() may return None, a Rect or a list of Rects/tuples."""
+    if hitbox is None:
+        return []
+    if isinstance(hitbox, list):
+        return hitbox
+    return [hitbox]
+
+
+class GridObserver:
+    """Maintains the grid for one game; call it with the game each tick.
+
+    Usable directly as SnakeEnv's `observe` function. The array returned is
+    the same read-only view every call and is updated in place, so copy it
+    if earlier ticks are needed.
+    """
+
+    def __init__(self):
+        if np is None:
+            raise RuntimeError("GridObserver needs numpy (pip install numpy)")
+        self.level = None
+        self.grid = None
+        self.view = None
+        self.layers = [Counter() for _ in CHANNELS]
+
+    def __call__(self, game):
+        self.update(game)
+        return self.view
+
+    def update(self, game):
+        level = game.current_level
+        if level is not self.level or self.grid is None:
+            self._reset(game)
+            self.level = level
+        bs = level.block_size
+
+        obstacles, no_spawn = Counter(), Counter()
+        for obstacle in level.obstacles:
+            for rect in _as_rects(obstacle.get_hitbox()):
+                self._add(obstacles, rect)
+            for rect in obstacle.get_no_spawn_rects():
+                self._add(no_spawn, rect)
+
+        snake = game.snake
+        snake_cells, projectile_cells = Counter(), Counter()
+        for x, y in snake.body:
+            self._add(snake_cells, (x, y, bs, bs))
+        for proj in snake.projectiles:
+            self._add(projectile_cells, (proj['x'], proj['y'], 1, 1))
+
+        enemy_cells = Counter()
+        for enemy in level.enemy_snakes:
+            for x, y in enemy.body:
+                self._add(enemy_cells, (x, y, bs, bs))
+            for proj in enemy.projectiles:
+                self._add(projectile_cells, (proj['x'], proj['y'], 1, 1))
+
+        food_cells = Counter()
+        for food in level.food:
+            self._add(food_cells, (food.x, food.y, bs, bs))
+
+        boss_cells = Counter()
+        boss = level.boss
+        if boss:
+            self._add(boss_cells, (boss.x, boss.y, boss.width, boss.height))
+            for proj in boss.projectiles:
+                self._add(projectile_cells, (proj['x'], proj['y'], 10, 10))
+
+        for channel, cells in enumerate((obstacles, no_spawn, snake_cells, enemy_cells,
+                                         food_cells, projectile_cells, boss_cells)):
+            self._sync(channel, cells)
+        return self.view
+
+    def _reset(self, game):
+        self.block_size = game.current_level.block_size
+        self.rows = game.height // self.block_size
+        self.cols = game.width // self.block_size
+        if self.grid is None or self.grid.shape != (len(CHANNELS), self.rows, self.cols):
+            self.grid = np.zeros((len(CHANNELS), self.rows, self.cols), dtype=np.uint8)
+            self.view = self.grid.view()
+            self.view.flags.writeable = False
+        else:
+            self.grid.fill(0)
+        self.layers = [Counter() for _ in CHANNELS]
+
+    def _add(self, cells, rect):
+        """Count the cell rectangle (r0, r1, c0, c1) covered by a pixel rect."""
+        x, y, w, h = rect
+        bs = self.block_size
+        c0 = max(0, int(x // bs))
+        r0 = max(0, int(y // bs))
+        c1 = min(self.cols, int(-(-(x + w) // bs)))
+        r1 = min(self.rows, int(-(-(y + h) // bs)))
+        if c0 < c1 and r0 < r1:
+            cells[(r0, r1, c0, c1)] += 1
+
+    def _sync(self, channel, cells):
+        old = self.layers[channel]
+        if cells == old:
+            return
+        plane = self.grid[channel]
+        for (r0, r1, c0, c1), count in (old - cells).items():
+            plane[r0:r1, c0:c1] -= count
+        for (r0, r1, c0, c1), count in (cells - old).items():
+            plane[r0:r1, c0:c1] += count
+        self.layers[channel] = cells
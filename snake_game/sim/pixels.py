@@ -0,0 +1,143 @@
+"""
+Low-resolution pixel observations.
+
+PixelObserver draws a stripped frame straight into a small surface: the
+level's background and ground, scaled down once per level, with flat
+rectangles on top for obstacle hitboxes, snakes, food, projectiles and
+the boss (colors in COLORS). There is no UI text, sprite art or
+animation, which keeps it at thousands of observations per second.
+With full_frame=True it instead draws the real frame with draw_game()
+and scales that down. That is what a player sees, but it runs at tens to
+hundreds of observations per second.
+
+The small surface's pixels are exposed through a pygame.surfarray.pixels3d
+view. Without grayscale or frame stacking the array returned is that view
+itself, so no pixels are copied.
+
+Arrays are (height, width, channels) like most image libraries, which is a
+transposed view of surfarray's (width, height) layout.
+"""
+
+import pygame
+from sim.grid import _as_rects
+
+try:
+    import numpy as np
+except ImportError:  # Only needed for pixel observations
+    np = None
+
+DEFAULT_SIZE = (84, 63)  # 800x600 scaled by roughly 1/9.5
+
+COLORS = {
+    'obstacle': (110, 110, 110),
+    'food': (255, 220, 0),
+    'snake': (0, 255, 0),
+    'enemy': (255, 40, 40),
+    'projectile': (255, 255, 255),
+    'boss': (200, 0, 200),
+}
+
+
+class PixelObserver:
+    """Callable observation function for SnakeEnv (observe=PixelObserver()).
+
+    `stack` > 1 keeps the last N frames, oldest first. The array returned is
+    read-only and reused between calls; copy it to keep a frame.
+    """
+
+    def __init__(self, size=DEFAULT_SIZE, grayscale=False, stack=1, full_frame=False):
+        if np is None:
+            raise RuntimeError("PixelObserver needs numpy (pip install numpy)")
+        self.size = size
+        self.grayscale = grayscale
+        self.stack = stack
+        self.full_frame = full_frame
+        self.background = None  # (level, its scaled-down background)
+        self.surface = pygame.Surface(size, depth=32)
+        # pixels3d keeps the surface locked; scaling into it is still allowed
+        self.rgb = pygame.surfarray.pixels3d(self.surface).transpose(1, 0, 2)
+        width, height = size
+        if grayscale:
+            self._sum = np.zeros((height, width), dtype=np.uint16)
+            self._term = np.zeros((height, width), dtype=np.uint16)
+            self._gray = np.zeros((height, width), dtype=np.uint8)
+        frame_shape = (height, width) if grayscale else (height, width, 3)
+        self.frames = np.zeros((stack,) + frame_shape, dtype=np.uint8) if stack > 1 else None
+        self.level = None
+        self.view = self._read_only(self.frames if stack > 1 else self._frame())
+
+    def __call__(self, game):
+        if self.full_frame:
+            game.draw_game()
+            pygame.transform.scale(game.window, self.size, self.surface)
+        else:
+            self._draw(game)
+        frame = self._frame()
+        if self.frames is not None:
+            if game.current_level is not self.level:
+                self.frames[:] = frame  # New episode: no older frames to show
+            else:
+                self.frames[:-1] = self.frames[1:]
+                self.frames[-1] = frame
+        self.level = game.current_level
+        return self.view
+
+    def _draw(self, game):
+        level = game.current_level
+        if self.background is None or self.background[0] is not level:
+            full = pygame.Surface((game.width, game.height))
+            with game.render_random:
+                level.draw_background(full)
+            small = pygame.transform.scale(full, self.size)
+            self.background = (level, pygame.surfarray.array3d(small).transpose(1, 0, 2).copy())
+        # The surface stays locked by the pixels3d view, so draw through the array
+        rgb = self.rgb
+        rgb[...] = self.background[1]
+        sx = self.size[0] / game.width
+        sy = self.size[1] / game.height
+
+        def fill(color, x, y, w, h):
+            # At least one pixel, so small things don't vanish when scaled down
+            x0 = max(0, int(x * sx))
+            y0 = max(0, int(y * sy))
+            rgb[y0:y0 + max(1, round(h * sy)), x0:x0 + max(1, round(w * sx))] = color
+
+        color = COLORS['obstacle']
+        for obstacle in level.obstacles:
+            for rect in _as_rects(obstacle.get_hitbox()):
+                fill(color, *rect)
+        color = COLORS['food']
+        for food in level.food:
+            fill(color, food.x, food.y, level.block_size, level.block_size)
+        projectile = COLORS['projectile']
+        for snake, color in ([(game.snake, COLORS['snake'])]
+                             + [(enemy, COLORS['enemy']) for enemy in level.enemy_snakes]):
+            bs = snake.block_size
+            for x, y in snake.body:
+                fill(color, x, y, bs, bs)
+            for proj in snake.projectiles:
+                fill(projectile, proj['x'], proj['y'], 1, 1)
+        boss = level.boss
+        if boss:
+            fill(COLORS['boss'], boss.x, boss.y, boss.width, boss.height)
+            for proj in boss.projectiles:
+                fill(projectile, proj['x'], proj['y'], 10, 10)
+
+    def _frame(self):
+        if not self.grayscale:
+            return self.rgb
+        # Integer luma (ITU-R 601 weights scaled to 256) into reused buffers
+        np.multiply(self.rgb[..., 0], 77, out=self._sum, dtype=np.uint16)
+        np.multiply(self.rgb[..., 1], 150, out=self._term, dtype=np.uint16)
+        self._sum += self._term
+        np.multiply(self.rgb[..., 2], 29, out=self._term, dtype=np.uint16)
+        self._sum += self._term
+        self._sum >>= 8
+        self._gray[...] = self._sum
+        return self._gray
+
+    @staticmethod
+    def _read_only(array):
+        view = array.view()
+        view.flags.writeable = False
+        return view
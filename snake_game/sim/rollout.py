@@ -0,0 +1,230 @@
+"""
+Parallel rollouts of headless games across all cores.
+
+Each worker process builds one headless SnakeEnv and plays jobs from a
+shared job table: a level + seed played by a bot, or a replay file played
+back. Results are fixed-size records written straight into a shared memory
+block at the job's index, so the only thing sent back over the pool's pipes
+is a count of finished jobs. Workers are replaced after a number of chunks
+to keep long sweeps from growing without bound.
+
+Run from the snake_game directory:
+    python -m sim.rollout --levels 0-6 --seeds 1000 --bot greedy
+"""
+
+import os
+import random
+import struct
+import time
+import multiprocessing
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+# seed, has seed, level, has level, outcome, ticks, food, buildings, snakes,
+# reward, seconds; the flags keep an unknown seed or level apart from 0
+RESULT = struct.Struct('<Q?B?BIIIIff')
+OUTCOMES = ('timeout', 'dead', 'complete', 'error')
+
+RolloutResult = namedtuple(
+    'RolloutResult',
+    ['seed', 'level', 'outcome', 'ticks', 'food', 'buildings', 'snakes', 'reward', 'seconds'])
+
+DEFAULT_MAX_STEPS = 5000
+DEFAULT_CHUNK_SIZE = 8
+DEFAULT_CHUNKS_PER_WORKER = 50  # Chunks a worker plays before it is replaced
+
+_worker = {}  # Per-process state set up by _init_worker
+
+
+def seed_jobs(levels, seeds):
+    """Jobs playing every level with every seed: [(level, seed, None), ...]."""
+    return [(level, seed, None) for level in levels for seed in seeds]
+
+
+def replay_jobs(paths):
+    """Jobs playing back replay files: [(None, None, path), ...]."""
+    return [(None, None, path) for path in paths]
+
+
+def _init_worker(shm_name, jobs, bot_name, max_steps):
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    # SDL would otherwise swallow the SIGTERM the pool uses to stop workers
+    os.environ['SDL_NO_SIGNAL_HANDLERS'] = '1'
+    _worker['shm'] = shared_memory.SharedMemory(name=shm_name)
+    _worker['jobs'] = jobs
+    _worker['bot_name'] = bot_name
+    _worker['max_steps'] = max_steps
+    _worker['env'] = None
+
+
+def _get_env():
+    # Imported here so the parent process never initialises pygame
+    if _worker['env'] is None:
+        from sim.env import SnakeEnv
+        _worker['env'] = SnakeEnv(max_steps=_worker['max_steps'])
+    return _worker['env']
+
+
+def _run_chunk(bounds):
+    start, stop = bounds
+    env = _get_env()
+    buf = _worker['shm'].buf
+    for index in range(start, stop):
+        level, seed, replay_path = _worker['jobs'][index]
+        started = time.perf_counter()
+        try:
+            if replay_path:
+                record = _play_replay(env, replay_path)
+            else:
+                record = _play_bot(env, level, seed)
+        except Exception as e:
+            print(f"Warning: rollout job {index} failed: {e}")
+            record = (seed, level, OUTCOMES.index('error'), 0, 0, 0, 0, 0.0)
+        seed, level, *rest = record
+        RESULT.pack_into(buf, index * RESULT.size,
+                         0 if seed is None else seed, seed is not None,
+                         0 if level is None else level, level is not None,
+                         *rest, time.perf_counter() - started)
+    return stop - start
+
+
+def _play_bot(env, level, seed):
+    from sim.bots import get_bot
+    bot = get_bot(_worker['bot_name'])
+    rng = random.Random(seed)
+    obs, _ = env.reset(seed=seed, level=level)
+    total = 0.0
+    done = False
+    info = {'outcome': None}
+    while not done:
+        obs, reward, done, info = env.step(bot(obs, rng))
+        total += reward
+    outcome = OUTCOMES.index(info['outcome'] or 'timeout')
+    progress = env.read_progress()
+    return (seed, level, outcome, env.steps,
+            progress['food'], progress['building'], progress['snake'], total)
+
+
+def _play_replay(env, path):
+    from replay.player import ReplayPlayer
+    from sim.env import REWARD_WEIGHTS
+    with env.random:
+        player = ReplayPlayer(env.game, path)
+        outcome = None
+        while not player.at_end and outcome is None:
+            outcome = player.step()
+    progress = env.read_progress()
+    reward = (sum(REWARD_WEIGHTS[key] * progress[key] for key in ('food', 'building', 'snake'))
+              + {'complete': REWARD_WEIGHTS['complete'], 'dead': REWARD_WEIGHTS['death']}.get(outcome, 0.0))
+    replay = player.replay
+    return (replay.seed, replay.level_idx, OUTCOMES.index(outcome or 'timeout'), player.tick,
+            progress['food'], progress['building'], progress['snake'], reward)
+
+
+def run_rollouts(jobs, bot='greedy', workers=None, max_steps=DEFAULT_MAX_STEPS,
+                 chunk_size=DEFAULT_CHUNK_SIZE, chunks_per_worker=DEFAULT_CHUNKS_PER_WORKER,
+                 progress=None):
+    """Play every job in a process pool and return a list of RolloutResults.
+
+    `progress`, if given, is called with (finished, total) as chunks complete.
+    """
+    if not jobs:
+        return []
+    workers = workers or os.cpu_count() or 1
+    shm = shared_memory.SharedMemory(create=True, size=RESULT.size * len(jobs))
+    try:
+        chunks = [(start, min(start + chunk_size, len(jobs)))
+                  for start in range(0, len(jobs), chunk_size)]
+        finished = 0
+        pool = multiprocessing.Pool(
+            workers,
+            initializer=_init_worker,
+            initargs=(shm.name, jobs, bot, max_steps),
+            maxtasksperchild=chunks_per_worker)
+        try:
+            for count in pool.imap_unordered(_run_chunk, chunks):
+                finished += count
+                if progress:
+                    progress(finished, len(jobs))
+            pool.close()
+        except BaseException:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+        results = []
+        for index in range(len(jobs)):
+            seed, has_seed, level, has_level, outcome, *rest = RESULT.unpack_from(
+                shm.buf, index * RESULT.size)
+            results.append(RolloutResult(seed if has_seed else None, level if has_level else None,
+                                         OUTCOMES[outcome], *rest))
+        return results
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def summarize(results):
+    """Per-level outcome counts and averages, as a dict keyed by level."""
+    summary = {}
+    for result in results:
+        entry = summary.setdefault(result.level, {
+            'runs': 0, 'ticks': 0, 'reward': 0.0, 'seconds': 0.0,
+            **{name: 0 for name in OUTCOMES}})
+        entry['runs'] += 1
+        entry[result.outcome] += 1
+        entry['ticks'] += result.ticks
+        entry['reward'] += result.reward
+        entry['seconds'] += result.seconds
+    return summary
+
+
+def _parse_levels(text):
+    levels = []
+    for part in text.split(','):
+        first, _, last = part.partition('-')
+        levels.extend(range(int(first), int(last or first) + 1))
+    return levels
+
+
+if __name__ == '__main__':
+    import argparse
+    import csv
+
+    parser = argparse.ArgumentParser(description="Run headless rollouts in parallel")
+    parser.add_argument('--levels', default='0-6', help="e.g. 0-6 or 0,2,5")
+    parser.add_argument('--seeds', type=int, default=100, help="seeds 1..N per level")
+    parser.add_argument('--bot', default='greedy', help="random, greedy or module:function")
+    parser.add_argument('--replays', nargs='*', help="play these replay files instead of a bot")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--max-steps', type=int, default=DEFAULT_MAX_STEPS)
+    parser.add_argument('--csv', metavar='FILE', help="write one row per run")
+    args = parser.parse_args()
+
+    if args.replays:
+        jobs = replay_jobs(args.replays)
+    else:
+        jobs = seed_jobs(_parse_levels(args.levels), range(1, args.seeds + 1))
+
+    started = time.perf_counter()
+    results = run_rollouts(jobs, bot=args.bot, workers=args.workers, max_steps=args.max_steps)
+    elapsed = time.perf_counter() - started
+
+    if args.csv:
+        with open(args.csv, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(RolloutResult._fields)
+            writer.writerows(results)
+
+    # Replay jobs that failed have no level; they are listed last
+    summary = summarize(results)
+    for level in sorted(summary, key=lambda level: (level is None, level or 0)):
+        entry = summary[level]
+        runs = entry['runs']
+        print(f"level {level}: runs={runs} complete={entry['complete']} dead={entry['dead']} "
+              f"timeout={entry['timeout']} error={entry['error']} "
+              f"avg_ticks={entry['ticks'] / runs:.0f} avg_reward={entry['reward'] / runs:.2f}")
+    total_ticks = sum(r.ticks for r in results)
+    print(f"{len(results)} runs, {total_ticks} ticks in {elapsed:.1f}s "
+          f"({total_ticks / max(elapsed, 1e-9):.0f} ticks/s)")
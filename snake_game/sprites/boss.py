@@ -1,6 +1,7 @@
 import pygame
 import math
 import random
+import surface_pool
 
 class TankBoss:
     def __init__(self, x, y, game):
@@ -240,6 +241,7 @@ class TankBoss:
                 'dy': math.sin(angle) * self.projectile_speed,
                 'lifetime': 90
             })
+        self.game.sfx.play('boss_fire', spawn_x)
 
     def take_damage(self):
         """Handle boss taking damage"""
@@ -270,7 +272,7 @@ class TankBoss:
         # Create an even larger surface to accommodate rotation
         surface_width = self.width + 160  # Increased more for turret rotation
         surface_height = self.height + 160
-        mech_surface = pygame.Surface((surface_width, surface_height), pygame.SRCALPHA)
+        mech_surface = surface_pool.scratch((surface_width, surface_height))
         
         # Center offset
         offset_x = surface_width // 2 - self.width // 2
@@ -403,7 +405,7 @@ class TankBoss:
                          mount_width, mount_height])
         
         # Create and draw the rotating turret (head)
-        turret_surface = pygame.Surface((120, 120), pygame.SRCALPHA)
+        turret_surface = surface_pool.scratch((120, 120))
         
         # Position everything relative to center point
         center_x = turret_surface.get_width() // 2
@@ -464,10 +466,11 @@ class TankBoss:
                 trail_radius = 6 - (i * 1.5)
                 trail_alpha = 255 - (i * 60)
                 
-                trail_surface = pygame.Surface((trail_radius * 2 + 2, trail_radius * 2 + 2),
-                                            pygame.SRCALPHA)
-                pygame.draw.circle(trail_surface, (*colors['glow'], trail_alpha),
-                                 (trail_radius + 1, trail_radius + 1), trail_radius)
+                trail_surface = surface_pool.sprite(
+                    (trail_radius * 2 + 2, trail_radius * 2 + 2), ('dot', colors['glow'], trail_radius),
+                    lambda dot: pygame.draw.circle(dot, colors['glow'],
+                                                   (trail_radius + 1, trail_radius + 1), trail_radius),
+                    trail_alpha)
                 surface.blit(trail_surface,
                            (trail_x - trail_radius, trail_y - trail_radius))
             
@@ -560,9 +563,10 @@ class TankBoss:
         colors = [(255, 200, 50), (255, 150, 50), (255, 100, 50)]
         for i in range(3):
             offset = random.uniform(-5, 5)
-            trail_surface = pygame.Surface((8, 8), pygame.SRCALPHA)
-            color_with_alpha = (*colors[i], int(alpha * 0.7))  # Slightly more transparent than chunks
-            pygame.draw.circle(trail_surface, color_with_alpha,
-                             (4, 4), 4 - i)
+            color = colors[i]
+            trail_surface = surface_pool.sprite(
+                (8, 8), ('dot', color, 4 - i),
+                lambda dot: pygame.draw.circle(dot, color, (4, 4), 4 - i),
+                int(alpha * 0.7))  # Slightly more transparent than chunks
             surface.blit(trail_surface, 
                         (int(x + offset - 4), int(y + offset - 4))) 
\ No newline at end of file
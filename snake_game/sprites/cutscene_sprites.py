@@ -1,6 +1,30 @@
 import pygame
 import math
 
+# Baked sprite images shared by every instance: (sprite, block size, pose) -> Surface.
+# The pixel art is drawn once per pose; each frame is then a single blit,
+# with fading and focus darkening applied as the blit's surface alpha.
+# The art is fully opaque, so a colorkey stands in for per-pixel alpha,
+# which keeps alpha blits on SDL's fast RLE path.
+_baked = {}
+TRANSPARENT = (255, 0, 255)  # Colorkey; no sprite uses magenta
+WING_STEPS = 100  # Bird god wing poses per unit of wing spread
+
+
+def _baked_image(key, size, draw):
+    """The image for `key`, drawn by draw(image) on a transparent `size` surface on first use."""
+    image = _baked.get(key)
+    if image is None:
+        image = pygame.Surface(size)
+        image.fill(TRANSPARENT)
+        draw(image)
+        if pygame.display.get_surface() is not None:
+            image = image.convert()
+        image.set_colorkey(TRANSPARENT, pygame.RLEACCEL)
+        _baked[key] = image
+    return image
+
+
 class Eagle:
     def __init__(self, x, y, block_size=20):
         self.x = x
@@ -13,55 +37,65 @@ class Eagle:
         
         # Increase margin for full exit (from 6 to 10 blocks)
         if -size * 10 < self.x < surface.get_width() + size * 10:
-            # Colors
-            body_color = (101, 67, 33)  # Dark brown
-            wing_color = (139, 69, 19)  # Medium brown
-            head_color = (160, 82, 45)  # Light brown
-            beak_color = (255, 215, 0)  # Gold
+            carrying_eggs = self.carrying_eggs
+            image = _baked_image(('eagle', size, carrying_eggs), (size * 6, size * 3 + 10),
+                                 lambda image: self._draw_pose(image, carrying_eggs))
+            surface.blit(image, (int(self.x) - size * 2, int(self.y) - size * 2))
             
-            # Wings (spread out)
-            wing_positions = [
-                # Left wing (3 blocks wide, angled up)
-                [self.x - size * 2, self.y - size,
-                 size * 3, size],
-                # Right wing (3 blocks wide, angled up)
-                [self.x + size, self.y - size,
-                 size * 3, size]
-            ]
-            for wing in wing_positions:
-                pygame.draw.rect(surface, wing_color, wing)
+    def _draw_pose(self, surface, carrying_eggs):
+        size = self.block_size
+        # The eagle's position is 2 blocks in from the image's top left
+        x = y = size * 2
             
-            # Body (2 blocks)
-            pygame.draw.rect(surface, body_color, 
-                            [self.x, self.y,
-                             size * 2, size])
+        # Colors
+        body_color = (101, 67, 33)  # Dark brown
+        wing_color = (139, 69, 19)  # Medium brown
+        head_color = (160, 82, 45)  # Light brown
+        beak_color = (255, 215, 0)  # Gold
             
-            # Neck (angling up)
-            pygame.draw.rect(surface, head_color,
-                            [self.x - size//2, self.y - size,
-                             size//2, size])
+        # Wings (spread out)
+        wing_positions = [
+            # Left wing (3 blocks wide, angled up)
+            [x - size * 2, y - size,
+             size * 3, size],
+            # Right wing (3 blocks wide, angled up)
+            [x + size, y - size,
+             size * 3, size]
+        ]
+        for wing in wing_positions:
+            pygame.draw.rect(surface, wing_color, wing)
             
-            # Head (positioned higher and angled)
-            pygame.draw.rect(surface, head_color,
-                            [self.x - size * 1.5, self.y - size * 1.5,
-                             size, size])
+        # Body (2 blocks)
+        pygame.draw.rect(surface, body_color,
+                        [x, y,
+                         size * 2, size])
             
-            # Beak (hooked downward)
-            beak_points = [
-                (self.x - size * 1.5, self.y - size * 1.25),  # Top left
-                (self.x - size * 2, self.y - size * 1.25),    # Top point
-                (self.x - size * 1.75, self.y - size),        # Hook point
-                (self.x - size * 1.5, self.y - size * 1.1)    # Bottom right
-            ]
-            pygame.draw.polygon(surface, beak_color, beak_points)
+        # Neck (angling up)
+        pygame.draw.rect(surface, head_color,
+                        [x - size//2, y - size,
+                         size//2, size])
             
-            # Draw eggs if carrying them
-            if self.carrying_eggs:
-                egg_color = (255, 250, 240)  # Off-white
-                for i in range(3):
-                    pygame.draw.rect(surface, egg_color,
-                                   [self.x + (i * 10) - 5, self.y + size,
-                                    8, 10])
+        # Head (positioned higher and angled)
+        pygame.draw.rect(surface, head_color,
+                        [x - size * 1.5, y - size * 1.5,
+                         size, size])
+
+        # Beak (hooked downward)
+        beak_points = [
+            (x - size * 1.5, y - size * 1.25),  # Top left
+            (x - size * 2, y - size * 1.25),    # Top point
+            (x - size * 1.75, y - size),        # Hook point
+            (x - size * 1.5, y - size * 1.1)    # Bottom right
+        ]
+        pygame.draw.polygon(surface, beak_color, beak_points)
+
+        # Draw eggs if carrying them
+        if carrying_eggs:
+            egg_color = (255, 250, 240)  # Off-white
+            for i in range(3):
+                pygame.draw.rect(surface, egg_color,
+                               [x + (i * 10) - 5, y + size,
+                                8, 10])
 
 class SnakeGod:
     def __init__(self, x, y, block_size=30):
@@ -72,41 +106,45 @@ class SnakeGod:
         self.fade_speed = 0  # Add this to track fade direction/speed
     
     def draw(self, surface):
-        if self.alpha <= 0:
+        alpha = int(self.alpha)  # Includes any focus darkening set by the cutscene
+        if alpha <= 0:
             return
             
-        # Create a surface for the snake god with transparency
         size = self.block_size
         width = size * 8
         height = size * 6
-        god_surface = pygame.Surface((width, height + size), pygame.SRCALPHA)
+        god_surface = _baked_image(('snake_god', size), (width, height + size), self._draw_image)
+        god_surface.set_alpha(alpha, pygame.RLEACCEL)
+
+        # Center the sprite at the specified position
+        god_rect = god_surface.get_rect(center=(self.x, self.y))
+        surface.blit(god_surface, god_rect)
+
+    def _draw_image(self, god_surface):
+        size = self.block_size
         
         # Draw the giant snake head
         for i in range(6):
             for j in range(8):
                 color = (0, 200, 0) if (i == 5 or j == 7) else (0, 255, 0)
-                pygame.draw.rect(god_surface, (*color, self.alpha),
+                pygame.draw.rect(god_surface, color,
                                [j * size, i * size, size, size])
         
         # Draw glowing eyes
-        eye_color = (255, 255, 255, self.alpha)
+        eye_color = (255, 255, 255)
         pygame.draw.rect(god_surface, eye_color,
                         [2 * size, 2 * size, size, size])
         pygame.draw.rect(god_surface, eye_color,
                         [5 * size, 2 * size, size, size])
         
         # Draw fangs
-        fang_color = (255, 255, 255, self.alpha)
+        fang_color = (255, 255, 255)
         fang_width = size // 2
         fang_height = size * 1.5
         pygame.draw.rect(god_surface, fang_color,
                         [2 * size, 6 * size, fang_width, fang_height])
         pygame.draw.rect(god_surface, fang_color,
                         [5 * size + size//2, 6 * size, fang_width, fang_height])
-        
-        # Center the sprite at the specified position
-        god_rect = god_surface.get_rect(center=(self.x, self.y))
-        surface.blit(god_surface, god_rect)
     
     def fade_in(self, amount=5):
         self.fade_speed = abs(amount)  # Store positive fade speed
@@ -146,29 +184,42 @@ class BirdGod:
         self.fade_speed = 0  # Add this to track fade direction/speed
     
     def draw(self, surface):
-        if self.alpha <= 0:
+        alpha = int(self.alpha)  # Includes any focus darkening set by the cutscene
+        if alpha <= 0:
             return
             
-        # Create a surface for the bird god with transparency
         size = self.block_size
         width = size * 12  # Wider for wings
         height = size * 6
-        god_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+
+        # Each wing position is baked once; the spread is rounded to 1/WING_STEPS
+        wing_step = round((math.sin(self.wing_angle) * 0.2 + 0.8) * WING_STEPS)
+        god_surface = _baked_image(('bird_god', size, wing_step), (width, height),
+                                   lambda image: self._draw_image(image, wing_step / WING_STEPS))
+        god_surface.set_alpha(alpha, pygame.RLEACCEL)
+
+        # Update wing animation
+        self.wing_angle += self.wing_speed
+
+        # Center the bird god in the sky
+        god_rect = god_surface.get_rect(center=(self.x, self.y))
+        surface.blit(god_surface, god_rect)
+
+    def _draw_image(self, god_surface, wing_spread):
+        size = self.block_size
+        width, height = god_surface.get_size()
         
         # Colors for the bird god
-        body_color = (139, 69, 19, self.alpha)  # Saddle brown
-        wing_color = (101, 67, 33, self.alpha)  # Darker brown
-        eye_color = (255, 255, 255, self.alpha)  # White eyes
-        talon_color = (64, 64, 64, self.alpha)  # Dark gray talons
-        beak_color = (255, 215, 0, self.alpha)  # Golden yellow
+        body_color = (139, 69, 19)  # Saddle brown
+        wing_color = (101, 67, 33)  # Darker brown
+        eye_color = (255, 255, 255)  # White eyes
+        talon_color = (64, 64, 64)  # Dark gray talons
+        beak_color = (255, 215, 0)  # Golden yellow
         
         # Define body rect first since wings need its position
         body_rect = pygame.Rect(width//3, height//3, size * 4, size * 2)
         
-        # Draw animated wings first (so they appear behind body)
-        wing_spread = math.sin(self.wing_angle) * 0.2 + 0.8  # Wing movement
-        
-        # Main wings (brown)
+        # Main wings (brown), drawn first so they appear behind the body
         wing_points_left = [
             (body_rect.left, body_rect.centery),
             (body_rect.left - size * 4 * wing_spread, body_rect.top - size),
@@ -181,7 +232,7 @@ class BirdGod:
         ]
         
         # Wing undersides (white)
-        wing_underside_color = (255, 255, 255, self.alpha)  # White
+        wing_underside_color = (255, 255, 255)  # White
         wing_points_left_under = [
             (body_rect.left + size//2, body_rect.centery),
             (body_rect.left - size * 3.5 * wing_spread, body_rect.top - size//2),
@@ -255,13 +306,6 @@ class BirdGod:
                         [body_rect.right - size - eye_size, body_rect.top + size//2,
                          eye_size, eye_size])
         
-        # Update wing animation
-        self.wing_angle += self.wing_speed
-        
-        # Center the bird god in the sky
-        god_rect = god_surface.get_rect(center=(self.x, self.y))
-        surface.blit(god_surface, god_rect)
-    
     def fade_in(self, amount=5):
         self.fade_speed = abs(amount)  # Store positive fade speed
         self.alpha = min(255, self.alpha + self.fade_speed)
@@ -297,15 +341,25 @@ class Nest:
         self.has_eggs = True
     
     def draw(self, surface):
+        size = self.block_size
+        has_eggs = self.has_eggs
+        image = _baked_image(('nest', size, has_eggs), (max(size * 3, 38), size + 10),
+                             lambda image: self._draw_pose(image, has_eggs))
+        surface.blit(image, (int(self.x), int(self.y) - 10))
+
+    def _draw_pose(self, surface, has_eggs):
+        # The nest's position is 10 px down from the image's top left, above the eggs
+        x, y = 0, 10
+
         # Draw nest
         nest_color = (139, 69, 19)  # Brown
         pygame.draw.rect(surface, nest_color,
-                        [self.x, self.y, self.block_size * 3, self.block_size])
+                        [x, y, self.block_size * 3, self.block_size])
         
         # Draw eggs if they haven't been taken
-        if self.has_eggs:
+        if has_eggs:
             egg_color = (255, 250, 240)  # Off-white
             for i in range(3):
                 pygame.draw.rect(surface, egg_color,
-                               [self.x + (i * 10) + 5, self.y - 10,
-                                8, 10]) 
\ No newline at end of file
+                               [x + (i * 10) + 5, y - 10,
+                                8, 10]) 
@@ -1,6 +1,7 @@
 import pygame
 import math
 import random
+import surface_pool
 from .snake import Snake
 
 class EnemySnake(Snake):
@@ -173,9 +174,7 @@ class EnemySnake(Snake):
                 color = tuple(max(0, min(255, c + brightness_adjust)) for c in base_color)
                 
                 if snake_alpha < 255:
-                    temp_surf = pygame.Surface((8, 8), pygame.SRCALPHA)
-                    temp_color = (*color, snake_alpha)
-                    pygame.draw.rect(temp_surf, temp_color, [0, 0, 8, 8])
+                    temp_surf = surface_pool.filled((8, 8), color, snake_alpha)
                     surface.blit(temp_surf, (proj['x'] - 4, proj['y'] - 4))
                 else:
                     pygame.draw.rect(surface, color,
@@ -197,9 +196,7 @@ class EnemySnake(Snake):
                         color = tuple(max(0, min(255, c + brightness_adjust)) for c in base_color)
                         
                         if snake_alpha < 255:
-                            temp_surf = pygame.Surface((block, block), pygame.SRCALPHA)
-                            temp_color = (*color, snake_alpha)
-                            temp_surf.fill(temp_color)
+                            temp_surf = surface_pool.filled((block, block), color, snake_alpha)
                             surface.blit(temp_surf, (segment[0] + j*block, segment[1] + i*block))
                         else:
                             pygame.draw.rect(surface, color,
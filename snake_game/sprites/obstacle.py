@@ -1,6 +1,7 @@
 import pygame
 import random
 import math
+import surface_pool
 
 class Obstacle:
     def __init__(self, x, y, variations, block_size=20):
@@ -1406,28 +1407,32 @@ class MountainPeak(Obstacle):
         if offset is None:
             offset = (self.x, self.y)
         if not self.is_destroyed:
-            mountain_surface = pygame.Surface((self.width + 2, self.height + 2), pygame.SRCALPHA)
-            
-            # Draw main mountain shape using relative coordinates
-            points = [
-                (self.width/2, 0),  # Peak
-                (self.width * 0.85, self.height - self.base_height * 0.8),  # Right
-                (self.width * 0.15, self.height - self.base_height * 0.8)   # Left
-            ]
-            pygame.draw.polygon(mountain_surface, self.mountain_color, points)
-            
-            # Snow cap
-            snow_height = self.height * 0.2
-            snow_width = snow_height * 0.4
-            snow_points = [
-                (self.width/2, 0),
-                (self.width/2 + snow_width, snow_height),
-                (self.width/2 - snow_width, snow_height)
-            ]
-            pygame.draw.polygon(mountain_surface, self.snow_color, snow_points)
-            
+            # The shape only depends on the size, so it is drawn once and pooled
+            mountain_surface = surface_pool.sprite(
+                (self.width + 2, self.height + 2),
+                ('mountain_top', self.width, self.height, self.mountain_color, self.snow_color),
+                self._draw_top_shape)
             surface.blit(mountain_surface, offset)
 
+    def _draw_top_shape(self, mountain_surface):
+        # Draw main mountain shape using relative coordinates
+        points = [
+            (self.width/2, 0),  # Peak
+            (self.width * 0.85, self.height - self.base_height * 0.8),  # Right
+            (self.width * 0.15, self.height - self.base_height * 0.8)   # Left
+        ]
+        pygame.draw.polygon(mountain_surface, self.mountain_color, points)
+        
+        # Snow cap
+        snow_height = self.height * 0.2
+        snow_width = snow_height * 0.4
+        snow_points = [
+            (self.width/2, 0),
+            (self.width/2 + snow_width, snow_height),
+            (self.width/2 - snow_width, snow_height)
+        ]
+        pygame.draw.polygon(mountain_surface, self.snow_color, snow_points)
+
     def draw_base(self, surface, offset=None):
         """Draw the collidable base portion of the mountain.
         If offset is provided, the mountain is drawn at that position; otherwise, it uses (self.x, self.y).
@@ -1435,19 +1440,22 @@ class MountainPeak(Obstacle):
         if offset is None:
             offset = (self.x, self.y)
         if not self.is_destroyed:
-            base_surface = pygame.Surface((self.width + 2, self.height + 2), pygame.SRCALPHA)
-            
-            # Draw only the base portion using relative coordinates
-            base_points = [
-                (0, self.height),  # Bottom left
-                (self.width, self.height),  # Bottom right
-                (self.width * 0.8, self.height - self.base_height),  # Top right
-                (self.width * 0.2, self.height - self.base_height)   # Top left
-            ]
-            pygame.draw.polygon(base_surface, self.base_color, base_points)
-            
+            base_surface = surface_pool.sprite(
+                (self.width + 2, self.height + 2),
+                ('mountain_base', self.width, self.height, self.base_color),
+                self._draw_base_shape)
             surface.blit(base_surface, offset)
 
+    def _draw_base_shape(self, base_surface):
+        # Draw only the base portion using relative coordinates
+        base_points = [
+            (0, self.height),  # Bottom left
+            (self.width, self.height),  # Bottom right
+            (self.width * 0.8, self.height - self.base_height),  # Top right
+            (self.width * 0.2, self.height - self.base_height)   # Top left
+        ]
+        pygame.draw.polygon(base_surface, self.base_color, base_points)
+
     def get_destruction_pixels(self):
         """
         Returns destruction pixels by sampling the actual drawn mountain shape.
@@ -1457,7 +1465,7 @@ class MountainPeak(Obstacle):
         the mountain's drawn silhouette.
         """
         chunk = 4  # Use the same chunk size as the explosion effect expects.
-        temp_surface = pygame.Surface((self.width + 2, self.height + 2), pygame.SRCALPHA)
+        temp_surface = surface_pool.scratch((self.width + 2, self.height + 2))
         # Draw the mountain shape at (0,0) in the local coordinate space:
         self.draw_top(temp_surface, offset=(0, 0))
         self.draw_base(temp_surface, offset=(0, 0))
@@ -1653,7 +1661,7 @@ class River(Obstacle):
             base_alpha = int(255 * (1 - fade_progress))
             
             # Create a surface for the fading river
-            river_surface = pygame.Surface((self.game.width, self.game.height), pygame.SRCALPHA)
+            river_surface = surface_pool.scratch((self.game.width, self.game.height))
             
             # Draw the river to this surface
             self._draw_river_body(river_surface, base_alpha)
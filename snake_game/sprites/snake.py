@@ -1,6 +1,17 @@
 import pygame
 import math
 import random
+import surface_pool
+
+
+def _draw_slit(slit_surface):
+    """Red vertical slit pupil, fading out towards both ends"""
+    slit_width, slit_height = slit_surface.get_size()
+    for y in range(slit_height):
+        alpha = 255 - abs(y - slit_height//2) * 255 // (slit_height//2)
+        pygame.draw.line(slit_surface, (255, 0, 0, alpha),
+                      (0, y), (slit_width, y))
+
 
 class Snake:
     def __init__(self, x, y, game=None, block_size=20):
@@ -66,6 +77,9 @@ class Snake:
         self.is_flashing = False
         self.power_up_timer = 0
         self.frozen = False  # Unfreeze when resetting the snake
+        # Input timestamps from the previous run would be compared against a fresh clock
+        self.has_input_this_frame = False
+        self.recent_inputs = []
         
     def is_movement_frozen(self):
         """Check if snake movement should be frozen (e.g. during boss death)"""
@@ -82,40 +96,49 @@ class Snake:
         return False
 
     def handle_input(self, event):
+        if event.type == pygame.KEYDOWN:
+            self.handle_key(event.key)
+    
+    def handle_key(self, key):
         # Don't handle input if movement is frozen
         if self.is_movement_frozen():
             return
             
-        if event.type == pygame.KEYDOWN:
-            # Only prevent complete reversal of direction
-            if event.key == pygame.K_LEFT and self.dx != self.block_size:
-                self.dx = -self.block_size
-                self.dy = 0
-                self.wall_bounce_cooldown = 0
-                self.has_input_this_frame = True
-                self.recent_inputs.append(pygame.time.get_ticks())  # Add timestamp
-            elif event.key == pygame.K_RIGHT and self.dx != -self.block_size:
-                self.dx = self.block_size
-                self.dy = 0
-                self.wall_bounce_cooldown = 0
-                self.has_input_this_frame = True
-                self.recent_inputs.append(pygame.time.get_ticks())
-            elif event.key == pygame.K_UP and self.dy != self.block_size:
-                self.dy = -self.block_size
-                self.dx = 0
-                self.wall_bounce_cooldown = 0
-                self.has_input_this_frame = True
-                self.recent_inputs.append(pygame.time.get_ticks())
-            elif event.key == pygame.K_DOWN and self.dy != -self.block_size:
-                self.dy = self.block_size
-                self.dx = 0
-                self.wall_bounce_cooldown = 0
-                self.has_input_this_frame = True
-                self.recent_inputs.append(pygame.time.get_ticks())
-            
-            # Add spit control (space bar)
-            elif event.key == pygame.K_SPACE:
-                self.spit_venom()
+        # Only prevent complete reversal of direction
+        if key == pygame.K_LEFT and self.dx != self.block_size:
+            self.dx = -self.block_size
+            self.dy = 0
+            self.wall_bounce_cooldown = 0
+            self.has_input_this_frame = True
+            self.recent_inputs.append(self._now())  # Add timestamp
+        elif key == pygame.K_RIGHT and self.dx != -self.block_size:
+            self.dx = self.block_size
+            self.dy = 0
+            self.wall_bounce_cooldown = 0
+            self.has_input_this_frame = True
+            self.recent_inputs.append(self._now())
+        elif key == pygame.K_UP and self.dy != self.block_size:
+            self.dy = -self.block_size
+            self.dx = 0
+            self.wall_bounce_cooldown = 0
+            self.has_input_this_frame = True
+            self.recent_inputs.append(self._now())
+        elif key == pygame.K_DOWN and self.dy != -self.block_size:
+            self.dy = self.block_size
+            self.dx = 0
+            self.wall_bounce_cooldown = 0
+            self.has_input_this_frame = True
+            self.recent_inputs.append(self._now())
+        
+        # Add spit control (space bar)
+        elif key == pygame.K_SPACE:
+            self.spit_venom()
+    
+    def _now(self):
+        """Simulation time in ms; the game's tick clock keeps replays deterministic."""
+        if self.game is not None:
+            return self.game.sim_ticks
+        return pygame.time.get_ticks()
     
     def update(self):
         if self.is_ascending:
@@ -154,7 +177,7 @@ class Snake:
             return self.x, self.y
             
         # Clear old inputs from buffer
-        current_time = pygame.time.get_ticks()
+        current_time = self._now()
         frame_duration = 1000 / 60  # Approximate milliseconds per frame
         buffer_duration = frame_duration * self.input_buffer_frames
         
@@ -290,10 +313,8 @@ class Snake:
                         else:
                             color = (0, 200, 0) if (i == 3 or j == 3) else (0, 255, 0)
                         if snake_alpha < 255:
-                            # Create a temporary surface that supports per-pixel alpha
-                            temp_surf = pygame.Surface((block, block), pygame.SRCALPHA)
-                            temp_color = (color[0], color[1], color[2], snake_alpha)
-                            temp_surf.fill(temp_color)
+                            # A pooled block blitted with the snake's alpha
+                            temp_surf = surface_pool.filled((block, block), color, snake_alpha)
                             surface.blit(temp_surf, (segment[0] + (j * block), segment[1] + (i * block)))
                         else:
                             pygame.draw.rect(surface, color,
@@ -319,13 +340,11 @@ class Snake:
             if self.is_sleeping:
                 self.zzz_timer += 1
                 if self.zzz_timer % 60 < 30:  # Animate every half second
-                    zzz_color = (255, 255, 255, snake_alpha)
                     for i in range(3):
                         x = self.x + 30 + (i * 10)
                         y = self.y - 20 - (i * 10)
                         size = 5 + (i * 2)
-                        temp_surf = pygame.Surface((size, size), pygame.SRCALPHA)
-                        temp_surf.fill(zzz_color)
+                        temp_surf = surface_pool.filled((size, size), (255, 255, 255), snake_alpha)
                         surface.blit(temp_surf, (x, y))
             
             # Draw projectiles with enhanced electric effect
@@ -340,11 +359,12 @@ class Snake:
                     
                     # Fade out trail
                     alpha = 255 - (i * 40)
-                    trail_color = (0, 255, 255, alpha)
+                    radius = 3 - i * 0.4
                     
-                    # Create surface for semi-transparent trail
-                    trail_surface = pygame.Surface((8, 8), pygame.SRCALPHA)
-                    pygame.draw.circle(trail_surface, trail_color, (4, 4), 3 - i * 0.4)
+                    # Pooled dot for the semi-transparent trail
+                    trail_surface = surface_pool.sprite(
+                        (8, 8), ('dot', (0, 255, 255), radius),
+                        lambda dot: pygame.draw.circle(dot, (0, 255, 255), (4, 4), radius), alpha)
                     surface.blit(trail_surface, (trail_x - 4, trail_y - 4))
                 
                 # Draw crackling electric effects
@@ -416,14 +436,8 @@ class Snake:
                         slit_width = max(2, eye_radius // 6)  # Make thinner
                         slit_height = int(eye_radius * 1.8)  # Make taller
                         
-                        # Create a surface for the slit with alpha
-                        slit_surface = pygame.Surface((slit_width, slit_height), pygame.SRCALPHA)
-                        
-                        # Draw the slit with a gradient
-                        for y in range(slit_height):
-                            alpha = 255 - abs(y - slit_height//2) * 255 // (slit_height//2)
-                            pygame.draw.line(slit_surface, (255, 0, 0, alpha), 
-                                          (0, y), (slit_width, y))
+                        # The slit with a gradient, drawn once per size
+                        slit_surface = surface_pool.sprite((slit_width, slit_height), 'slit', _draw_slit)
                         
                         # Position the slit (no rotation needed since we want vertical)
                         slit_rect = slit_surface.get_rect(center=(pupil_x, pupil_y))
@@ -444,14 +458,8 @@ class Snake:
                         slit_width = max(2, eye_radius // 6)  # Make thinner
                         slit_height = int(eye_radius * 1.8)  # Make taller
                         
-                        # Create a surface for the slit with alpha
-                        slit_surface = pygame.Surface((slit_width, slit_height), pygame.SRCALPHA)
-                        
-                        # Draw the slit with a gradient
-                        for y in range(slit_height):
-                            alpha = 255 - abs(y - slit_height//2) * 255 // (slit_height//2)
-                            pygame.draw.line(slit_surface, (255, 0, 0, alpha), 
-                                          (0, y), (slit_width, y))
+                        # The slit with a gradient, drawn once per size
+                        slit_surface = surface_pool.sprite((slit_width, slit_height), 'slit', _draw_slit)
                         
                         # Position the slit (no rotation needed)
                         slit_rect = slit_surface.get_rect(
@@ -654,6 +662,7 @@ class Snake:
                 'dy': math.sin(angle) * self.projectile_speed,
                 'lifetime': 60  # 1 second lifetime
             })
+            self.game.sfx.play('spit', self.x)
             
             # Start cooldown
             self.can_spit = False
@@ -0,0 +1,147 @@
+"""
+Startup timing report.
+
+`python main.py --profile-startup FILE` times everything up to the first
+menu frame, then loads the first level, writes a JSON report to FILE and
+quits. CI can run it with SDL_VIDEODRIVER=dummy and compare the numbers
+between builds.
+
+The report holds:
+    first_menu_frame_ms  time from the start of main.py to the first frame
+    phases               named spans (pygame.init, fonts, menus, ...) on the
+                         main thread, with their start, duration and depth
+    modules              every module first imported on the main thread,
+                         with its inclusive and self time and its importer
+    import_groups        self time summed by top-level package
+
+All times are milliseconds since profiling started. This module only
+imports the standard library so it can be loaded before anything else.
+"""
+
+import builtins
+import contextlib
+import json
+import sys
+import threading
+import time
+
+FLAG = '--profile-startup'
+REPORT_VERSION = 1
+
+
+class StartupProfiler:
+    def __init__(self):
+        self.enabled = False
+        self.path = None
+        self.start_time = None
+        self.phases = []
+        self.modules = []
+        self.first_menu_frame_ms = None
+        self._depth = 0
+        self._import_stack = []  # [module name, time spent in nested imports]
+        self._original_import = None
+
+    def start(self, path):
+        """Start timing and recording module imports; the report goes to `path`."""
+        self.enabled = True
+        self.path = path
+        self.start_time = time.perf_counter()
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def stop(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+        self.enabled = False
+
+    def _ms(self, t):
+        return round((t - self.start_time) * 1000, 3)
+
+    def phase(self, name):
+        """Context manager timing one named span.
+
+        Does nothing when disabled or off the main thread, so worker
+        threads can't interleave their spans with the main thread's nesting.
+        """
+        if not self.enabled or threading.current_thread() is not threading.main_thread():
+            return contextlib.nullcontext()
+        return self._timed_phase(name)
+
+    @contextlib.contextmanager
+    def _timed_phase(self, name):
+        start = time.perf_counter()
+        record = {'name': name, 'depth': self._depth, 'start_ms': self._ms(start)}
+        self.phases.append(record)
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            record['duration_ms'] = round((time.perf_counter() - start) * 1000, 3)
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # Only first-time absolute imports on the main thread are timed;
+        # everything else goes straight through
+        if (level or name in sys.modules or
+                threading.current_thread() is not threading.main_thread()):
+            return self._original_import(name, globals, locals, fromlist, level)
+        parent = self._import_stack[-1] if self._import_stack else None
+        entry = [name, 0.0]
+        self._import_stack.append(entry)
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._import_stack.pop()
+            if parent is not None:
+                parent[1] += elapsed
+            self.modules.append({
+                'module': name,
+                'imported_by': parent[0] if parent else None,
+                'start_ms': self._ms(start),
+                'ms': round(elapsed * 1000, 3),
+                'self_ms': round((elapsed - entry[1]) * 1000, 3),
+            })
+
+    def mark_first_menu_frame(self):
+        if self.enabled and self.first_menu_frame_ms is None:
+            self.first_menu_frame_ms = self._ms(time.perf_counter())
+
+    def report(self):
+        groups = {}
+        for module in self.modules:
+            package = module['module'].split('.')[0]
+            groups[package] = round(groups.get(package, 0) + module['self_ms'], 3)
+        return {
+            'version': REPORT_VERSION,
+            'python': sys.version.split()[0],
+            'platform': sys.platform,
+            'first_menu_frame_ms': self.first_menu_frame_ms,
+            'phases': sorted(self.phases, key=lambda p: p['start_ms']),
+            'modules': self.modules,
+            'import_groups': dict(sorted(groups.items(), key=lambda g: -g[1])),
+        }
+
+    def write(self):
+        with open(self.path, 'w') as f:
+            json.dump(self.report(), f, indent=1)
+
+
+profiler = StartupProfiler()
+phase = profiler.phase
+
+
+def import_module(name):
+    """importlib.import_module, but through the import hook, so the profiler times it."""
+    __import__(name)
+    return sys.modules[name]
+
+
+def start_from_argv(argv):
+    """Start the profiler if `argv` has FLAG FILE (call before heavy imports)."""
+    if FLAG in argv:
+        index = argv.index(FLAG)
+        if index + 1 < len(argv):
+            profiler.start(argv[index + 1])
@@ -0,0 +1,115 @@
+"""
+Reusable surfaces for per-frame drawing.
+
+Translucent panels, overlays and small effect sprites used to be new
+pygame.Surfaces every frame. The pool keeps them instead, keyed by size,
+flags and fill, so steady-state drawing allocates next to nothing:
+
+    filled(size, color, alpha)      a solid rectangle; one surface per size,
+                                    refilled when the color changes
+    panel(size, color, alpha, border_radius)
+                                    a rectangle with rounded corners
+    sprite(size, key, draw, alpha)  anything draw(surface) paints on a
+                                    transparent surface; `key` must identify
+                                    what draw() produces
+    scratch(size)                   a cleared SRCALPHA surface to draw on
+
+`alpha` is applied as the surface alpha when the surface is handed out,
+so one surface serves every step of a fade. Everything but scratch
+surfaces is shared: blit it straight away and never draw on it. A scratch
+surface is only valid until the next scratch() of the same size.
+
+The least recently used surfaces are dropped beyond MAX_SURFACES.
+"""
+
+from collections import OrderedDict
+import pygame
+
+MAX_SURFACES = 256
+TRANSPARENT = (255, 0, 255)  # Colorkey for panel corners; nothing draws magenta panels
+
+
+class SurfacePool:
+    def __init__(self, max_surfaces=MAX_SURFACES):
+        self.max_surfaces = max_surfaces
+        self.surfaces = OrderedDict()  # (size, flags, fill) -> Surface
+        self.fills = {}  # Key of a filled() surface -> its current color
+        self.allocations = 0  # Surfaces created so far, to check for reuse
+
+    def filled(self, size, color, alpha=255):
+        size = _size(size)
+        key = (size, 0, 'filled')
+        surface = self._get(key)
+        if surface is None:
+            surface = self._add(key, pygame.Surface(size))
+        color = tuple(color)
+        if self.fills.get(key) != color:
+            # Filling is cheap, so one surface per size serves every color
+            surface.fill(color)
+            self.fills[key] = color
+        # No surface alpha at all when opaque keeps the blit on the plain path
+        surface.set_alpha(alpha if alpha < 255 else None)
+        return surface
+
+    def panel(self, size, color, alpha=255, border_radius=0):
+        size = _size(size)
+        key = (size, 0, ('panel', tuple(color), border_radius))
+        surface = self._get(key)
+        if surface is None:
+            # Opaque with colorkeyed corners, so alpha blits stay on SDL's fast path
+            surface = self._add(key, pygame.Surface(size))
+            surface.fill(TRANSPARENT)
+            pygame.draw.rect(surface, color, surface.get_rect(), border_radius=border_radius)
+            surface.set_colorkey(TRANSPARENT, pygame.RLEACCEL)
+        surface.set_alpha(alpha, pygame.RLEACCEL)
+        return surface
+
+    def sprite(self, size, key, draw, alpha=255):
+        size = _size(size)
+        key = (size, pygame.SRCALPHA, key)
+        surface = self._get(key)
+        if surface is None:
+            surface = self._add(key, pygame.Surface(size, pygame.SRCALPHA))
+            draw(surface)
+        surface.set_alpha(alpha)
+        return surface
+
+    def scratch(self, size):
+        size = _size(size)
+        key = (size, pygame.SRCALPHA, None)
+        surface = self._get(key)
+        if surface is None:
+            surface = self._add(key, pygame.Surface(size, pygame.SRCALPHA))
+        else:
+            surface.fill((0, 0, 0, 0))
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+        self.fills.clear()
+
+    def _get(self, key):
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+        return surface
+
+    def _add(self, key, surface):
+        self.allocations += 1
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_surfaces:
+            old_key, _ = self.surfaces.popitem(last=False)
+            self.fills.pop(old_key, None)
+        return surface
+
+
+def _size(size):
+    # Callers pass Rect sizes and float sizes alike; pygame truncates both
+    return int(size[0]), int(size[1])
+
+
+pool = SurfacePool()
+filled = pool.filled
+panel = pool.panel
+sprite = pool.sprite
+scratch = pool.scratch